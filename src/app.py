@@ -7,9 +7,17 @@ from database import DatabaseHandler
 from signups import add_player_signup,is_already_signed_up
 from helper import validate_name_email,validate_email, validate_name
 from booking_manager import BookingManager
-from whatsapp import WhatsAppNotifier
-from invoice_generator import InvoiceGenerator
-from scraper_service import get_scraper_service, scrape_now
+from whatsapp import WhatsAppNotifier, benchmark_notifications
+from message_queue import get_message_queue
+from invoice_generator import InvoiceGenerator, benchmark_invoice_report, month_range
+from exports import export_to_file, export_file_name, parquet_available
+from invoice_fanout import InvoiceFanout, benchmark_fanout, period_key
+from invoice_documents import benchmark_invoice_documents
+from scraper_service import get_worker_status
+from booking_bot import compare_browser_profiles, measure_driver_startup
+from tracing import load_traces, summarize_phases
+from slot_selection import benchmark_slot_selection
+from simulated_bot import benchmark_booking_pipeline
 
 # Initialize the database handler and services (cached for performance)
 @st.cache_resource
@@ -32,13 +40,14 @@ try:
         db = get_database_handler()
     with st.spinner("Initializing services..."):
         booking_manager, whatsapp_notifier, invoice_generator = get_services(db)
+        message_queue = get_message_queue()
 except Exception as e:
     st.error(f"⚠️ Failed to initialize app: {str(e)}")
     st.info("Please check your database connection and environment variables.")
     st.stop()
 
-# No background scraper - we'll scrape on-demand when admin needs it
-# This is more efficient and works on all platforms
+# No scraper inside the web process - the standalone worker (python -m scraper_service)
+# scrapes and the app only reads the cache and worker status
 scraper_service = None
 
 # Set up page config
@@ -81,10 +90,21 @@ def init_database_schema(_db):
     tables_to_create = [
         'create_player_table.sql',
         'create_signup_table.sql',
+        'create_week_signup_counts.sql',
         'create_booking_table.sql',
         'update_booking_table.sql',
         'create_available_slots_cache.sql',
-        'alter_players_add_guest_host.sql'  # Add guest-host relationship
+        'create_slot_scrape_log.sql',
+        'create_slot_events_table.sql',
+        'create_slot_price_index.sql',
+        'create_scraper_status_table.sql',
+        'create_booking_jobs_table.sql',
+        'create_week_booking_state_table.sql',
+        'create_notification_dispatches_table.sql',
+        'create_invoice_deliveries_table.sql',
+        'alter_players_add_guest_host.sql',  # Add guest-host relationship
+        'alter_players_add_phone.sql',  # WhatsApp numbers for per-player invoices
+        'create_invoice_snapshots.sql'  # After the player columns its triggers watch
     ]
     
     for table_file in tables_to_create:
@@ -125,6 +145,24 @@ def get_current_participants(week):
 def get_current_booking_status(week):
     return booking_manager.get_booking_status(week)
 
+def render_export_download(db, export_name, fmt, params=None):
+    """Stream an export into a temporary file and offer it for download"""
+    if fmt == 'parquet' and not parquet_available():
+        st.warning("Parquet export needs pyarrow - install it or choose CSV")
+        return
+    try:
+        with st.spinner("Preparing export..."):
+            export_file, rows = export_to_file(db, export_name, fmt, params=params)
+    except Exception as e:
+        st.error(f"Export failed: {str(e)}")
+        return
+    st.download_button(
+        label=f"Download {rows} rows as {fmt.upper()}",
+        data=export_file,
+        file_name=export_file_name(export_name, fmt, params),
+        mime="text/csv" if fmt == 'csv' else "application/octet-stream"
+    )
+
 participants_df = get_current_participants(current_week)
 participants = participants_df.values.tolist() if not participants_df.empty else []
 
@@ -234,56 +272,60 @@ if menu == "Player Signup":
             add_player_signup(db, choice, name, current_week, email, host_player_id=host_player_id)
             
             # Refresh participant count
-            participants = db.fetch_signups(current_week)
-            current_count = len(participants)
+            current_count = db.get_signup_count(current_week)
             
-            # Send WhatsApp notification
+            # Queue the WhatsApp roster update (bursts are merged into one message)
             try:
-                whatsapp_notifier.send_signup_update(
-                    name, "signed up", current_week, current_count, 
+                message_queue.enqueue_signup_update(
+                    name, "signed up", current_week,
                     booking_status['threshold_half'], booking_status['threshold_full']
                 )
             except Exception as e:
-                st.warning(f"Could not send WhatsApp notification: {e}")
+                st.warning(f"Could not queue WhatsApp notification: {e}")
             
-            # Check if automatic booking should be triggered
-            try:
-                booking_result = booking_manager.check_and_book(current_week)
-                if booking_result and booking_result.get('status') != 'already_booked':
-                    st.balloons()
-                    
-                    # Handle different booking types
-                    if booking_result.get('status') == 'two_thirds_booked':
-                        st.success("🎉 2 Third Pitches automatically booked!")
-                    else:
-                        st.success("🎉 Pitch automatically booked!")
-                    
-                    # Prepare booking details for WhatsApp
-                    booking_details = {
-                        'date': booking_result['slot']['date'],
-                        'time': booking_result['slot']['time'],
-                        'pitch_type': booking_result['slot']['pitch_type'],
-                        'player_count': booking_result['player_count'],
-                        'cost_per_player': booking_result['cost_per_player'],
-                        'total_cost': booking_result['total_cost'],
-                    }
-                    
-                    # Handle confirmation number (different for single vs 2 thirds)
-                    if booking_result.get('status') == 'two_thirds_booked':
-                        # Multiple confirmations
-                        conf_numbers = [c.get('confirmation', {}).get('confirmation_number', 'N/A') 
-                                      for c in booking_result.get('confirmations', [])]
-                        booking_details['confirmation_number'] = ', '.join(conf_numbers)
-                    else:
-                        # Single confirmation
-                        booking_details['confirmation_number'] = booking_result.get('confirmation', {}).get('confirmation_number', 'N/A')
-                    
-                    whatsapp_notifier.send_booking_confirmation(booking_details)
-            except Exception as e:
-                st.warning(f"Automatic booking check failed: {e}")
+            # Queue automatic booking - the booking worker runs it off this request
+            if current_count >= booking_status['threshold_half'] and not booking_status['is_booked']:
+                try:
+                    job_id = booking_manager.enqueue_booking(current_week, trigger=f"signup: {name}")
+                    if job_id:
+                        st.session_state['booking_job_id'] = job_id
+                except Exception as e:
+                    st.warning(f"Could not queue automatic booking: {e}")
             
             st.rerun()
     
+    # Poll the queued auto-booking job (only reruns this fragment, not the page)
+    @st.fragment(run_every="3s")
+    def show_booking_job_status():
+        job_id = st.session_state.get('booking_job_id')
+        if not job_id:
+            return
+        job = booking_manager.get_booking_job(job_id)
+        if not job:
+            return
+        
+        if job['status'] in ('queued', 'running'):
+            label = "⏳ Auto-booking queued..." if job['status'] == 'queued' else "🤖 Booking the pitch now..."
+            if job['attempts'] > 1:
+                label += f" (attempt {job['attempts']}/{job['max_attempts']})"
+            st.info(label)
+        elif job['status'] == 'done':
+            result = job['result'] or {}
+            if result.get('status') == 'booking_in_progress':
+                st.info("🤖 Another booking for this week is already in progress")
+            elif result.get('status') == 'two_thirds_booked':
+                st.balloons()
+                st.success("🎉 2 Third Pitches automatically booked!")
+            elif result.get('slot'):
+                st.balloons()
+                st.success("🎉 Pitch automatically booked!")
+            del st.session_state['booking_job_id']
+        else:
+            st.warning(f"Automatic booking failed: {job['error']}")
+            del st.session_state['booking_job_id']
+    
+    show_booking_job_status()
+    
     with st.form("removal_form"):
         st.markdown("""
             <style>
@@ -314,16 +356,14 @@ if menu == "Player Signup":
                 
                 db.delete_signups(player_email_to_delete,  current_week)
                 
-                # Send WhatsApp notification
+                # Queue the WhatsApp roster update
                 try:
-                    participants = db.fetch_signups(current_week)
-                    current_count = len(participants)
-                    whatsapp_notifier.send_signup_update(
-                        player_name, "removed themselves", current_week, current_count,
+                    message_queue.enqueue_signup_update(
+                        player_name, "removed themselves", current_week,
                         booking_status['threshold_half'], booking_status['threshold_full']
                     )
                 except Exception as e:
-                    st.warning(f"Could not send WhatsApp notification: {e}")
+                    st.warning(f"Could not queue WhatsApp notification: {e}")
                 
                 st.rerun()
             else:
@@ -460,6 +500,36 @@ if menu == "Admin Dashboard":
                 else:
                     st.metric("Players Needed", booking_status['players_needed_half'])
             
+            # Cost per player estimate from the price index (1 or 2 third pitches)
+            pitches_needed = 2 if booking_status['status'] == 'ready_full' else 1
+            third_pitch_price = booking_manager.price_index.estimate_price('third_pitch')
+            if third_pitch_price:
+                players = max(booking_status['current_count'], booking_status['threshold_half'])
+                st.caption(f"Estimated cost per player: £{third_pitch_price * pitches_needed / players:.2f} "
+                           f"({pitches_needed} × third pitch at ~£{third_pitch_price:.2f})")
+            
+            # Upcoming weeks pipeline
+            st.subheader("Upcoming Weeks")
+            n_weeks = st.slider("Weeks to show", min_value=2, max_value=12, value=6)
+            upcoming = booking_manager.get_booking_status_range(current_week, n_weeks)
+            status_labels = {
+                'booked': '✅ Booked',
+                'ready_full': '🟢 Ready (2 thirds)',
+                'ready_half': '🟡 Ready (1 third)',
+                'waiting': '⏳ Waiting'
+            }
+            pipeline_df = pd.DataFrame([
+                {
+                    'Week': week_status['week'],
+                    'Signups': week_status['current_count'],
+                    'Status': status_labels.get(week_status['status'], week_status['status']),
+                    'Needed (1 third)': week_status['players_needed_half'],
+                    'Needed (2 thirds)': week_status['players_needed_full']
+                }
+                for week_status in upcoming
+            ])
+            st.dataframe(pipeline_df, use_container_width=True, hide_index=True)
+            
             # Recent bookings
             st.subheader("Recent Bookings")
             bookings = db.fetch_bookings()
@@ -487,10 +557,39 @@ if menu == "Admin Dashboard":
                         age = datetime.now() - latest_scrape
                         age_str = f"{int(age.total_seconds() / 60)} min ago"
                         st.metric("Last Scraped", age_str)
-                st.info("💡 Slots are scraped automatically when you open the 'Available Slots' tab")
+                st.info("💡 Slots are kept fresh by the standalone scraper worker")
             else:
-                st.info("No slots cached yet. Open the 'Available Slots' tab to scrape.")
-        
+                st.info("No slots cached yet. Check the scraper worker in the 'Available Slots' tab.")
+
+            # Bot performance from the local trace store
+            st.subheader("Bot Performance")
+            bot_traces = load_traces(limit=200)
+            if bot_traces:
+                st.markdown("**Time per phase (last 200 runs)**")
+                st.dataframe(summarize_phases(bot_traces), use_container_width=True)
+
+                recent_df = pd.DataFrame([
+                    {
+                        'Started': trace['started_at'][:19].replace('T', ' '),
+                        'Operation': trace['operation'],
+                        'Status': trace['status'],
+                        'Seconds': trace['duration_seconds'],
+                        'Slowest Phase': max(trace['spans'], key=lambda span: span['duration_seconds'])['phase'] if trace['spans'] else '-'
+                    }
+                    for trace in reversed(bot_traces[-10:])
+                ])
+                st.markdown("**Recent runs**")
+                st.dataframe(recent_df, use_container_width=True)
+
+                # Show the most recent failure screenshot, if one was captured
+                failed_shots = [span['screenshot'] for trace in reversed(bot_traces)
+                                for span in trace['spans'] if span.get('screenshot')]
+                if failed_shots:
+                    with st.expander("Latest failure screenshot"):
+                        st.image(failed_shots[0])
+            else:
+                st.info("No bot runs traced yet.")
+
         # TAB 2: Bookings Management
         with tab2:
             st.subheader("Booking Management")
@@ -498,7 +597,10 @@ if menu == "Admin Dashboard":
             # Manual booking form
             st.markdown("### 📝 Manual Booking")
             
-            st.warning("⚠️ **Important:** Clicking 'Book Pitch' will ACTUALLY book on Merky FC HQ website. This is NOT a test!")
+            if booking_manager.dry_run:
+                st.info("🧪 **Dry run:** bookings go to the simulated bot (`booking.dry_run`), nothing is booked on Merky FC HQ.")
+            else:
+                st.warning("⚠️ **Important:** Clicking 'Book Pitch' will ACTUALLY book on Merky FC HQ website. This is NOT a test!")
             
             # Get available slots for selection
             booking_pitch_filter = st.selectbox("Select Pitch Type First", ["half_pitch", "full_pitch", "third_pitch"], key="booking_pitch_filter")
@@ -544,11 +646,20 @@ if menu == "Admin Dashboard":
                         booking_date = selected_slot['date']
                         booking_time = selected_slot['time']
                         pitch_type = selected_slot['pitch_type']
+                        booking_price = selected_slot['price']
             else:
                 st.info("No available slots in cache. Click '🔄 Refresh Now' in the 'Available Slots' tab to scrape latest availability.")
                 
                 # Fallback: manual date/time entry
                 st.markdown("### Or Enter Date/Time Manually (Use with caution)")
+                typical_prices = {
+                    pitch: booking_manager.price_index.lookup(pitch)
+                    for pitch in ["half_pitch", "full_pitch", "third_pitch"]
+                }
+                st.caption("Typical prices from scrape history: " + ", ".join(
+                    f"{pitch.replace('_', ' ')} £{entry['price']:.2f}"
+                    for pitch, entry in typical_prices.items() if entry
+                ) if any(typical_prices.values()) else "No price history yet - run a scrape to build the price index.")
                 with st.form("manual_booking_form_fallback"):
                     col1, col2 = st.columns(2)
                     with col1:
@@ -557,12 +668,14 @@ if menu == "Admin Dashboard":
                     with col2:
                         pitch_type = st.selectbox("Pitch Type", ["half_pitch", "full_pitch", "third_pitch"])
                         player_count = st.number_input("Expected Players", min_value=1, value=14)
+                    booking_price = st.number_input("Total Price (£, 0 = typical price)", min_value=0.0, value=0.0, step=5.0)
                     
                     manual_book_button = st.form_submit_button("⚠️ Book Pitch (May fail if not available)")
                     
                     if manual_book_button:
                         booking_date = booking_date.strftime('%Y-%m-%d')
                         booking_time = booking_time.strftime('%H:%M')
+                        booking_price = booking_price or None
             
             # Booking execution (only runs if button was clicked)
             if 'manual_book_button' in locals() and manual_book_button:
@@ -574,7 +687,8 @@ if menu == "Admin Dashboard":
                             booking_time if isinstance(booking_time, str) else booking_time.strftime('%H:%M'),
                             pitch_type,
                             current_week,
-                            player_count
+                            player_count,
+                            price=booking_price
                         )
                             
                         if result:
@@ -604,14 +718,10 @@ if menu == "Admin Dashboard":
                 bookings_df = pd.DataFrame(all_bookings, columns=["Week", "Date", "Amount", "Players"])
                 st.dataframe(bookings_df, use_container_width=True)
                 
-                # Export option
-                csv = bookings_df.to_csv(index=False)
-                st.download_button(
-                    label="Download as CSV",
-                    data=csv,
-                    file_name=f"bookings_{datetime.now().strftime('%Y%m%d')}.csv",
-                    mime="text/csv"
-                )
+                # Export option (streamed from the database in chunks)
+                history_format = st.radio("Export format", ["csv", "parquet"], horizontal=True, key="history_format")
+                if st.button("Prepare Booking History Export"):
+                    render_export_download(db, 'booking_history', history_format)
             else:
                 st.info("No bookings yet")
         
@@ -619,32 +729,33 @@ if menu == "Admin Dashboard":
         with tab3:
             st.subheader("Available Pitch Times")
             
-            # Check if we need to auto-scrape (cache empty or stale)
-            cached_slots_check = db.get_available_slots(None)
-            should_auto_scrape = False
+            # Scraping runs in the standalone worker - this page only reads the cache and status
+            try:
+                worker_status = get_worker_status(db)
+            except Exception as e:
+                worker_status = None
+                st.warning(f"Could not read scraper status: {str(e)}")
             
-            if not cached_slots_check or len(cached_slots_check) == 0:
-                should_auto_scrape = True
-                st.info("🔄 Cache is empty, auto-scraping availability...")
-            else:
-                # Check if cache is stale (older than 30 minutes)
-                latest_scrape = cached_slots_check[0][6] if len(cached_slots_check[0]) > 6 else None
-                if latest_scrape:
-                    age = datetime.now() - latest_scrape
-                    if age.total_seconds() > 1800:  # 30 minutes
-                        should_auto_scrape = True
-                        st.info("🔄 Cache is stale (>30 min), auto-refreshing...")
-            
-            # Auto-scrape if needed
-            if should_auto_scrape:
-                with st.spinner("Scraping Merky FC HQ for available times..."):
-                    try:
-                        results = scrape_now(db, ['half_pitch', 'full_pitch'])
-                        if results:
-                            success_count = sum(1 for r in results.values() if r.get('success'))
-                            st.success(f"✅ Scraped {success_count}/2 pitch types successfully")
-                    except Exception as e:
-                        st.warning(f"Auto-scrape failed: {str(e)}. Use manual refresh below.")
+            if worker_status and worker_status['leader']:
+                leader = worker_status['leader']
+                heartbeat_age = int(leader['heartbeat_age_seconds'])
+                st.success(f"🕷️ Scraper worker `{leader['worker_id']}` is leading (heartbeat {heartbeat_age}s ago)")
+                pitch_status = (leader['details'] or {}).get('pitch_types', {})
+                if pitch_status:
+                    schedule_df = pd.DataFrame([
+                        {
+                            'Pitch Type': pitch_type,
+                            'Urgency': info.get('urgency'),
+                            'Interval (min)': info.get('interval_minutes'),
+                            'Next Scrape': info.get('next_due'),
+                            'Errors in a Row': info.get('consecutive_errors')
+                        }
+                        for pitch_type, info in pitch_status.items()
+                    ])
+                    st.dataframe(schedule_df, use_container_width=True)
+            elif worker_status is not None:
+                st.warning("No active scraper worker. Start one with `PYTHONPATH=src python -m scraper_service` "
+                           "(or `./start.sh scraper`) - the cache will not refresh until then.")
             
             # Manual refresh controls
             col1, col2 = st.columns([3, 1])
@@ -652,18 +763,8 @@ if menu == "Admin Dashboard":
                 filter_pitch_type = st.selectbox("Filter by Pitch Type", ["All", "half_pitch", "full_pitch", "third_pitch"])
             with col2:
                 if st.button("🔄 Manual Refresh"):
-                    with st.spinner("Scraping availability..."):
-                        try:
-                            results = scrape_now(db, ['half_pitch', 'full_pitch'])
-                            if results:
-                                for pitch_type, result in results.items():
-                                    if result['success']:
-                                        st.success(f"{pitch_type}: {result['slot_count']} slots found")
-                                    else:
-                                        st.error(f"{pitch_type}: {result.get('error', 'Unknown error')}")
-                            st.rerun()
-                        except Exception as e:
-                            st.error(f"Scrape failed: {str(e)}")
+                    db.request_scrape()
+                    st.info("Scrape requested - the worker will pick it up on its next heartbeat.")
             
             # Display cached slots
             filter_type = None if filter_pitch_type == "All" else filter_pitch_type
@@ -679,6 +780,18 @@ if menu == "Admin Dashboard":
                 st.caption(f"Total slots: {len(slots_df)}")
             else:
                 st.info("No available slots in cache. Click 'Refresh Now' to scrape.")
+
+            # Slots at the preferred time that appeared or vanished in recent scrapes
+            try:
+                preferred_changes = booking_manager.get_preferred_slot_changes()
+            except Exception as e:
+                preferred_changes = []
+                st.warning(f"Could not read slot changes: {str(e)}")
+            if preferred_changes:
+                st.markdown(f"### 🔔 Changes at {booking_manager.preferred_time}")
+                changes_df = pd.DataFrame(preferred_changes)[["type", "date", "time", "pitch_type", "received_at"]]
+                changes_df.columns = ["Change", "Date", "Time", "Pitch Type", "Seen At"]
+                st.dataframe(changes_df, use_container_width=True)
         
         # TAB 4: Invoices
         with tab4:
@@ -695,7 +808,7 @@ if menu == "Admin Dashboard":
             col1, col2 = st.columns(2)
             with col1:
                 if st.button("📊 Generate Invoice"):
-                    invoice_generator.display_invoice_in_app(invoice_month, invoice_year)
+                    invoice_generator.display_invoice_in_app(invoice_month, invoice_year, invoice_format)
             with col2:
                 if st.button("📱 Send via WhatsApp"):
                     with st.spinner("Sending invoice..."):
@@ -705,18 +818,116 @@ if menu == "Admin Dashboard":
                         if success:
                             st.success("Invoice sent!")
             
+            # Per-player direct messages (sent by ./start.sh notifications)
+            st.markdown("### 📨 Individual Invoices")
+            invoice_fanout = InvoiceFanout(db)
+            invoice_period = period_key(invoice_month, invoice_year)
+            if st.button("📨 Queue Individual Invoices"):
+                try:
+                    queued = invoice_fanout.enqueue(invoice_month, invoice_year)
+                except Exception as e:
+                    st.error(f"Could not queue invoices: {str(e)}")
+                else:
+                    if queued['recipients']:
+                        st.success(f"Queued {queued['with_phone']} of {queued['recipients']} players")
+                        if queued['without_phone']:
+                            st.warning(f"{queued['without_phone']} player(s) have no WhatsApp number - "
+                                       "add one below and queue again")
+                    else:
+                        st.error("No data available for the selected month")
+            
+            delivery_summary = db.get_invoice_delivery_summary(invoice_period)
+            if delivery_summary:
+                d_cols = st.columns(5)
+                for d_col, status in zip(d_cols, ['queued', 'sending', 'sent', 'failed', 'skipped']):
+                    with d_col:
+                        st.metric(status.title(), delivery_summary.get(status, (0, None))[0])
+                if delivery_summary.get('failed') and st.button("Retry Failed"):
+                    st.success(f"Re-queued {db.requeue_failed_invoice_deliveries(invoice_period)} message(s)")
+            
+            with st.expander("Player WhatsApp numbers"):
+                phone_players = db.get_all_players_in_db()
+                phones = db.get_player_phones()
+                if not phone_players.empty:
+                    phone_email = st.selectbox(
+                        "Player", phone_players['email_id'].tolist(),
+                        format_func=lambda email: f"{phone_players.loc[phone_players['email_id'] == email, 'name'].iloc[0]} ({email})"
+                    )
+                    phone_number = st.text_input("WhatsApp number", value=phones.get(phone_email, ''),
+                                                 placeholder="+447700900123")
+                    if st.button("Save Number"):
+                        if phone_number and not phone_number.startswith('+'):
+                            st.error("Use international format, starting with +")
+                        elif db.set_player_phone(phone_email, phone_number.replace(' ', '')):
+                            st.success("Number saved")
+            
             # Export options
             st.markdown("### 📥 Export Options")
             if st.button("Download as CSV"):
-                report = invoice_generator.generate_monthly_report(invoice_month, invoice_year)
-                if report:
-                    csv_data = invoice_generator.generate_csv_export(report)
+                snapshot = invoice_generator.get_report_snapshot(invoice_month, invoice_year, invoice_format)
+                if snapshot:
                     st.download_button(
                         label="Download CSV",
-                        data=csv_data,
+                        data=snapshot['csv'],
                         file_name=f"invoice_{invoice_year}_{invoice_month:02d}.csv",
                         mime="text/csv"
                     )
+            
+            if st.button("Download Player Invoices (zip)"):
+                with st.spinner("Rendering player invoices..."):
+                    invoice_archive, render_stats = invoice_generator.generate_player_invoices_archive(
+                        invoice_month, invoice_year, invoice_format)
+                if invoice_archive:
+                    st.caption(f"{render_stats['invoices']} invoices in {render_stats['seconds']}s "
+                               f"({render_stats['invoices_per_second']}/s, {render_stats['workers']} worker(s))")
+                    st.download_button(
+                        label="Download Invoices",
+                        data=invoice_archive,
+                        file_name=f"player_invoices_{invoice_year}_{invoice_month:02d}.zip",
+                        mime="application/zip"
+                    )
+                else:
+                    st.error("No data available for the selected month")
+            
+            # Several months at once (one query per table for the whole range)
+            st.markdown("### 📅 Yearly Summary")
+            statement_months = st.select_slider(
+                "Months", options=list(range(1, 13)), value=(1, 12),
+                format_func=lambda m: datetime(2000, m, 1).strftime('%B')
+            )
+            statement_start = datetime(invoice_year, statement_months[0], 1).date()
+            statement_end = datetime(invoice_year, statement_months[1], 1).date()
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("📅 Show Summary"):
+                    invoice_generator.display_range_in_app(
+                        invoice_generator.generate_range_report(statement_start, statement_end))
+            with col2:
+                if st.button("Export Summary CSV"):
+                    range_report = invoice_generator.generate_range_report(statement_start, statement_end)
+                    if range_report:
+                        st.download_button(
+                            label="Download Summary CSV",
+                            data=invoice_generator.generate_range_csv_export(range_report),
+                            file_name=f"invoice_statement_{invoice_year}_{statement_months[0]:02d}-{statement_months[1]:02d}.csv",
+                            mime="text/csv"
+                        )
+                    else:
+                        st.warning("No data available for the selected period")
+            
+            lines_format = st.radio("Line items format", ["csv", "parquet"], horizontal=True, key="lines_format")
+            if st.button("Export Invoice Line Items"):
+                render_export_download(db, 'invoice_lines', lines_format,
+                                       params=dict(zip(('start_date', 'end_date'),
+                                                       month_range(statement_start, statement_end))))
+            
+            if st.button("Benchmark Invoice Report (synthetic months)"):
+                with st.spinner("Building synthetic reports..."):
+                    st.dataframe(pd.DataFrame(benchmark_invoice_report()), use_container_width=True)
+            
+            if st.button("Benchmark Player Invoice Rendering (synthetic months)"):
+                with st.spinner("Rendering synthetic invoices..."):
+                    st.dataframe(pd.DataFrame(benchmark_invoice_documents()), use_container_width=True)
         
         # TAB 5: Settings
         with tab5:
@@ -732,7 +943,49 @@ if menu == "Admin Dashboard":
             st.info("Thresholds are configured in `.streamlit/secrets.toml`")
             
             st.markdown("### 📱 WhatsApp Integration")
-            st.metric("Group ID", whatsapp_notifier.group_id)
+            wa_col1, wa_col2 = st.columns(2)
+            with wa_col1:
+                st.metric("Group ID", whatsapp_notifier.group_id)
+            with wa_col2:
+                st.metric("Transport", whatsapp_notifier.transport.name)
+            if st.button("Benchmark Notifications (offline capture)"):
+                st.json(benchmark_notifications())
+            if st.button("Benchmark Invoice Fan-out (60 players, simulated gateway)"):
+                with st.spinner("Sending simulated messages..."):
+                    st.json(benchmark_fanout())
+            
+            # Outbound queue
+            queue_status = message_queue.get_status()
+            q_col1, q_col2, q_col3, q_col4 = st.columns(4)
+            with q_col1:
+                st.metric("Queued Messages", queue_status['queue_depth'])
+            with q_col2:
+                st.metric("Sent / Failed", f"{queue_status['sent']} / {queue_status['failed']}")
+            with q_col3:
+                st.metric("Updates Merged", queue_status['coalesced'])
+            with q_col4:
+                st.metric("Avg Send Time", f"{queue_status['avg_send_seconds']}s" if queue_status['avg_send_seconds'] is not None else "—")
+            if queue_status['next_send']:
+                st.caption(f"Next send at {queue_status['next_send'].strftime('%H:%M:%S')} "
+                           f"({queue_status['pending_changes']} pending changes)")
+            if queue_status['avg_queue_seconds'] is not None:
+                st.caption(f"Average enqueue → delivered: {queue_status['avg_queue_seconds']}s")
+            if queue_status['queue_depth'] and st.button("Send Queued Now"):
+                message_queue.flush()
+                st.success("Queued messages will be sent now")
+            
+            # Scheduled reminders / weekly lists (sent by ./start.sh notifications)
+            st.markdown("#### 🗓️ Scheduled Messages")
+            try:
+                dispatches = db.get_notification_dispatches(limit=20)
+            except Exception:
+                dispatches = []
+            if dispatches:
+                st.dataframe(pd.DataFrame(dispatches, columns=[
+                    "Kind", "Week", "Session", "Time", "Status", "Attempts", "Due", "Sent", "Error"
+                ]), use_container_width=True)
+            else:
+                st.caption("No scheduled messages yet - they are queued once a session is booked")
             
             # Test WhatsApp
             if st.button("Send Test Message"):
@@ -747,6 +1000,58 @@ if menu == "Admin Dashboard":
             st.metric("Status", auto_enabled)
             st.metric("Preferred Time", booking_manager.preferred_time)
             
+            if st.button("Benchmark Slot Selection"):
+                st.dataframe(pd.DataFrame(benchmark_slot_selection()), use_container_width=True)
+            
+            st.markdown("### 🧪 Simulated Booking Pipeline")
+            st.caption("Runs signup → threshold → booking → DB insert → notify against the simulated bot for SIM-xxxx weeks, then deletes them and their players. The slot cache and price index are not touched.")
+            sim_col1, sim_col2, sim_col3 = st.columns(3)
+            with sim_col1:
+                sim_weeks = st.number_input("Weeks", min_value=1, max_value=200, value=10)
+            with sim_col2:
+                sim_book_seconds = st.number_input("Booking latency (s)", min_value=0.0, value=0.0, step=0.5)
+            with sim_col3:
+                sim_failure_rate = st.slider("Failure rate", min_value=0.0, max_value=1.0, value=0.0)
+            if st.button("Run Simulated Pipeline"):
+                with st.spinner("Simulating bookings..."):
+                    summary = benchmark_booking_pipeline(
+                        db, n_weeks=int(sim_weeks),
+                        latency_seconds={'book': sim_book_seconds},
+                        failure_rate=sim_failure_rate
+                    )
+                st.dataframe(pd.DataFrame([summary]).T.rename(columns={0: 'Value'}), use_container_width=True)
+            
+            st.markdown("### 🌐 Browser Profiles")
+            st.caption("Scraping uses the lean profile (no images, fonts or analytics); booking uses the full profile.")
+            if st.button("Measure Browser Profiles"):
+                with st.spinner("Running a scrape with each profile..."):
+                    try:
+                        measurements = compare_browser_profiles()
+                        st.dataframe(pd.DataFrame(measurements), use_container_width=True)
+                    except Exception as e:
+                        st.error(f"Measurement failed: {str(e)}")
+            include_cold_start = st.checkbox("Include a cold start (downloads chromedriver again)", value=False)
+            if st.button("Measure Driver Startup"):
+                with st.spinner("Starting Chrome with the cached driver..."):
+                    try:
+                        st.dataframe(pd.DataFrame(measure_driver_startup(include_cold=include_cold_start)),
+                                     use_container_width=True)
+                    except Exception as e:
+                        st.error(f"Measurement failed: {str(e)}")
+
+            st.markdown("### 🔢 Signup Counters")
+            st.caption("Per-week signup counts are maintained by a trigger on the signups table.")
+            if st.button("Check Signup Counters"):
+                mismatches = db.check_signup_counts()
+                if mismatches:
+                    st.warning(f"{len(mismatches)} week(s) out of step with the signups table")
+                    st.dataframe(pd.DataFrame(mismatches, columns=['Week', 'Counter', 'Actual']), use_container_width=True)
+                else:
+                    st.success("All signup counters match the signups table")
+            if st.button("Repair Signup Counters"):
+                repaired = db.check_signup_counts(repair=True)
+                st.success(f"Repaired {len(repaired)} week(s)")
+
             st.markdown("### 📊 Database Stats")
             all_players = db.get_all_players_in_db()
             st.metric("Total Players", len(all_players))
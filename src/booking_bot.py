@@ -10,48 +10,328 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+from contextlib import nullcontext
 from datetime import datetime, timedelta
+from config import get_browser_config
+from tracing import BotTrace
 import streamlit as st
+import json
+import os
+import re
+import subprocess
 import time
 
 
+# Browser profiles - 'full' renders the site like a real visitor (used for booking),
+# 'lean' strips everything the scraper doesn't need to read slot data
+BROWSER_PROFILES = {
+    'full': {
+        'window_size': '1920,1080',
+        'page_load_strategy': 'normal',
+        'block_resources': False
+    },
+    'lean': {
+        'window_size': '800,600',
+        'page_load_strategy': 'eager',
+        'block_resources': True
+    }
+}
+
+# URL patterns blocked through DevTools when a profile has block_resources enabled
+BLOCKED_URL_PATTERNS = [
+    # Images and media
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico', '*.mp4', '*.webm',
+    # Fonts
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    # Stylesheets stay loaded: the slot waits and filter clicks depend on layout and visibility
+    # Analytics and third-party trackers
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*facebook.net*', '*facebook.com/tr*', '*hotjar.com*', '*clarity.ms*', '*segment.io*'
+]
+
+# Resolved chromedriver path for this process (filled on first browser start)
+_driver_path = None
+DRIVER_PIN_FILE = 'chromedriver_pin.json'
+
+
+def _detect_chrome_version():
+    """
+    Read the installed Chrome version from the local binary (no network)
+    
+    Returns:
+        str: Version like "131.0.6778.85", or None if Chrome can't be found
+    """
+    for binary in ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser'):
+        try:
+            output = subprocess.run(
+                [binary, '--version'], capture_output=True, text=True, timeout=10
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = re.search(r'\d+\.\d+\.\d+\.\d+', output)
+        if match:
+            return match.group(0)
+    return None
+
+
+def _major_version(version):
+    """Major component of a dotted version string"""
+    return version.split('.')[0] if version else None
+
+
+def resolve_driver_path(force_refresh=False):
+    """
+    Resolve the chromedriver binary, downloading it at most once
+    
+    Resolution order: CHROMEDRIVER_PATH, in-process cache, on-disk pin matching
+    the installed Chrome major version, then a one-off webdriver-manager download
+    that is pinned to disk for every later start.
+    
+    Args:
+        force_refresh (bool): Ignore cached pins and download again
+        
+    Returns:
+        tuple: (driver_path, source) where source is 'env', 'memory', 'disk' or 'download'
+    """
+    global _driver_path
+    browser_config = get_browser_config()
+    
+    if browser_config['driver_path'] and os.path.exists(browser_config['driver_path']):
+        return browser_config['driver_path'], 'env'
+    
+    if _driver_path and not force_refresh and os.path.exists(_driver_path):
+        return _driver_path, 'memory'
+    
+    chrome_version = _detect_chrome_version()
+    pin_path = os.path.join(browser_config['driver_cache_dir'], DRIVER_PIN_FILE)
+    
+    if not force_refresh:
+        try:
+            with open(pin_path, 'r') as file:
+                pin = json.load(file)
+            pinned_path = pin.get('driver_path')
+            # An unknown Chrome version (e.g. binary not on PATH) still trusts the pin
+            version_matches = (chrome_version is None or
+                               _major_version(pin.get('chrome_version')) == _major_version(chrome_version))
+            if pinned_path and os.path.exists(pinned_path) and version_matches:
+                _driver_path = pinned_path
+                return _driver_path, 'disk'
+        except (OSError, ValueError):
+            pass
+    
+    # Cold path - the only place that touches the network
+    if chrome_version:
+        driver_path = ChromeDriverManager(driver_version=chrome_version).install()
+    else:
+        driver_path = ChromeDriverManager().install()
+    
+    try:
+        os.makedirs(browser_config['driver_cache_dir'], exist_ok=True)
+        with open(pin_path, 'w') as file:
+            json.dump({
+                'driver_path': driver_path,
+                'chrome_version': chrome_version,
+                'resolved_at': datetime.now().isoformat()
+            }, file)
+    except OSError as e:
+        st.warning(f"Could not write chromedriver pin: {str(e)}")
+    
+    _driver_path = driver_path
+    return _driver_path, 'download'
+
+
 class MerkyFCBookingBot:
     """Bot for automating Merky FC HQ pitch bookings"""
     
-    def __init__(self, headless=True):
+    def __init__(self, headless=True, profile='full'):
         """
         Initialize the Selenium WebDriver
         
         Args:
             headless (bool): Run browser in headless mode
+            profile (str): 'full' for booking, 'lean' for scraping (see BROWSER_PROFILES)
         """
         self.headless = headless
+        self.profile = profile if profile in BROWSER_PROFILES else 'full'
         self.driver = None
         self.wait_timeout = 20
+        self.startup_stats = {}
+        self.trace = None
+        self.last_trace = None
+        self.prepared = None  # Set by prepare_booking while a warm session is ready
         
     def _init_driver(self):
         """Initialize Chrome WebDriver with appropriate options"""
         if self.driver is not None:
             return
             
+        profile = BROWSER_PROFILES[self.profile]
+        
         chrome_options = Options()
         if self.headless:
             chrome_options.add_argument('--headless')
         chrome_options.add_argument('--no-sandbox')
         chrome_options.add_argument('--disable-dev-shm-usage')
         chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--window-size=1920,1080')
+        chrome_options.add_argument(f"--window-size={profile['window_size']}")
         chrome_options.add_argument('--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
+        chrome_options.page_load_strategy = profile['page_load_strategy']
+        
+        if profile['block_resources']:
+            # Don't even decode images, and skip background work we never need
+            chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+            chrome_options.add_argument('--disable-extensions')
+            chrome_options.add_argument('--disable-background-networking')
+            chrome_options.add_experimental_option('prefs', {
+                'profile.managed_default_content_settings.images': 2
+            })
         
         try:
-            service = Service(ChromeDriverManager().install())
+            started = time.perf_counter()
+            driver_path, driver_source = resolve_driver_path()
+            resolved = time.perf_counter()
+            
+            service = Service(driver_path)
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            self.startup_stats = {
+                'driver_source': driver_source,
+                'resolve_seconds': round(resolved - started, 3),
+                'launch_seconds': round(time.perf_counter() - resolved, 3)
+            }
             self.wait = WebDriverWait(self.driver, self.wait_timeout)
+            
+            if profile['block_resources']:
+                self._block_resources()
         except Exception as e:
             st.error(f"Failed to initialize browser: {str(e)}")
             raise
     
+    def _block_resources(self):
+        """Block non-essential resource types and analytics domains via DevTools"""
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+        except Exception as e:
+            # Blocking is an optimisation only - scraping still works without it
+            st.warning(f"Could not enable resource blocking: {str(e)}")
+    
+    def get_performance_metrics(self):
+        """
+        Sample memory and network usage of the current page
+        
+        Returns:
+            dict: js_heap_mb, dom_nodes, resource_count, transferred_kb
+        """
+        if self.driver is None:
+            return {}
+        
+        metrics = {}
+        try:
+            self.driver.execute_cdp_cmd('Performance.enable', {})
+            raw = self.driver.execute_cdp_cmd('Performance.getMetrics', {})
+            values = {m['name']: m['value'] for m in raw.get('metrics', [])}
+            metrics['js_heap_mb'] = round(values.get('JSHeapUsedSize', 0) / (1024 * 1024), 2)
+            metrics['dom_nodes'] = int(values.get('Nodes', 0))
+        except Exception:
+            pass
+        
+        try:
+            resources = self.driver.execute_script(
+                "return performance.getEntriesByType('resource')"
+                ".map(e => e.transferSize || 0);"
+            ) or []
+            metrics['resource_count'] = len(resources)
+            metrics['transferred_kb'] = round(sum(resources) / 1024, 1)
+        except Exception:
+            pass
+        
+        return metrics
+    
+    def _phase(self, name):
+        """Time a phase on the active trace (no-op outside a traced operation)"""
+        if self.trace is None:
+            return nullcontext({'retries': 0, 'status': 'ok'})
+        return self.trace.phase(name)
+    
+    def _start_trace(self, operation, **context):
+        """Begin tracing a scrape or booking"""
+        context['profile'] = self.profile
+        self.trace = BotTrace(operation, context, capture_screenshot=self._save_screenshot)
+    
+    def _finish_trace(self, status):
+        """Store the active trace"""
+        if self.trace is not None:
+            self.last_trace = self.trace.finish(status)
+            self.trace = None
+    
+    def _save_screenshot(self, path):
+        """Save a screenshot of the current page if a browser is open"""
+        if self.driver is None:
+            return False
+        return self.driver.save_screenshot(path)
+    
+    def _start_browser(self):
+        """Start the browser, timed as the driver_start phase"""
+        if self.driver is not None:
+            return
+        with self._phase('driver_start'):
+            self._init_driver()
+    
+    def _load_page(self, url, settle_seconds=3, attempts=2):
+        """
+        Navigate to a page, retrying transient WebDriver failures
+        
+        Args:
+            url (str): Page to load
+            settle_seconds (int): Time to let React components render
+            attempts (int): Total navigation attempts
+        """
+        with self._phase('page_load') as span:
+            for attempt in range(attempts):
+                try:
+                    self.driver.get(url)
+                    break
+                except WebDriverException:
+                    if attempt == attempts - 1:
+                        raise
+                    span['retries'] += 1
+                    time.sleep(2)
+            time.sleep(settle_seconds)
+    
+    def _apply_pitch_filter(self, pitch_type, wait_for_filters=False):
+        """
+        Click the pitch type filter on the booking page
+        
+        Args:
+            pitch_type (str): 'half_pitch', 'full_pitch', or 'third_pitch'
+            wait_for_filters (bool): Wait for the filter section before clicking
+        """
+        # Map pitch_type to website filter
+        pitch_filter_map = {
+            'half_pitch': 'half pitch',
+            'full_pitch': 'full pitch',
+            'third_pitch': 'third pitch'
+        }
+        filter_text = pitch_filter_map.get(pitch_type, 'half pitch')
+        
+        with self._phase('filter_apply') as span:
+            try:
+                if wait_for_filters:
+                    self.wait.until(EC.presence_of_element_located((By.XPATH, "//h4[contains(text(), 'filter pitch by:')]")))
+                
+                # Find and click the appropriate pitch type checkbox/button
+                pitch_checkboxes = self.driver.find_elements(By.XPATH, f"//h4[contains(text(), '{filter_text}')]")
+                if pitch_checkboxes:
+                    pitch_checkboxes[0].click()
+                    time.sleep(2)  # Wait for filter to apply
+                else:
+                    span['status'] = 'failed'
+            except Exception as e:
+                span['status'] = 'failed'
+                span['error'] = str(e)[:500]
+                st.warning(f"Could not apply pitch filter: {str(e)}")
+    
     def scrape_available_times(self, pitch_type='half_pitch'):
         """
         Scrape available booking slots from Merky FC HQ website
@@ -62,64 +342,56 @@ class MerkyFCBookingBot:
         Returns:
             list: List of dicts with date, time, price, pitch_type, available
         """
-        self._init_driver()
+        self._start_trace('scrape', pitch_type=pitch_type)
         available_slots = []
+        status = 'failed'
+        
+        try:
+            self._start_browser()
+        except Exception:
+            self._finish_trace(status)
+            raise
         
         try:
             # Navigate to booking page
-            self.driver.get('https://merkyfchq.com/booking')
-            time.sleep(3)  # Let React components load
-            
-            # Map pitch_type to website filter
-            pitch_filter_map = {
-                'half_pitch': 'half pitch',
-                'full_pitch': 'full pitch',
-                'third_pitch': 'third pitch'
-            }
-            
-            filter_text = pitch_filter_map.get(pitch_type, 'half pitch')
+            self._load_page('https://merkyfchq.com/booking')
             
             # Click on the pitch type filter
-            try:
-                # Wait for filter section to load
-                self.wait.until(EC.presence_of_element_located((By.XPATH, "//h4[contains(text(), 'filter pitch by:')]")))
-                
-                # Find and click the appropriate pitch type checkbox/button
-                pitch_checkboxes = self.driver.find_elements(By.XPATH, f"//h4[contains(text(), '{filter_text}')]")
-                if pitch_checkboxes:
-                    pitch_checkboxes[0].click()
-                    time.sleep(2)  # Wait for filter to apply
-            except Exception as e:
-                st.warning(f"Could not apply pitch filter: {str(e)}")
+            self._apply_pitch_filter(pitch_type, wait_for_filters=True)
             
             # Scrape available time slots
             # This is a placeholder - actual implementation depends on website structure
             # The website likely uses a calendar or time slot picker
-            try:
-                # Look for time slot elements (adjust selectors based on actual site structure)
-                time_slots = self.driver.find_elements(By.CLASS_NAME, 'time-slot')
+            with self._phase('slot_scan') as span:
+                try:
+                    # Look for time slot elements (adjust selectors based on actual site structure)
+                    time_slots = self.driver.find_elements(By.CLASS_NAME, 'time-slot')
+                    
+                    for slot in time_slots:
+                        try:
+                            # Extract slot details (adjust based on actual HTML structure)
+                            date_element = slot.find_element(By.CLASS_NAME, 'slot-date')
+                            time_element = slot.find_element(By.CLASS_NAME, 'slot-time')
+                            price_element = slot.find_element(By.CLASS_NAME, 'slot-price')
+                            
+                            slot_data = {
+                                'date': date_element.text,
+                                'time': time_element.text,
+                                'price': self._parse_price(price_element.text),
+                                'pitch_type': pitch_type,
+                                'available': True
+                            }
+                            available_slots.append(slot_data)
+                        except NoSuchElementException:
+                            continue
+                            
+                except NoSuchElementException:
+                    # If no time slots found with that class, try alternative approach
+                    st.info("No time slots found with standard selectors. Site may require manual inspection.")
                 
-                for slot in time_slots:
-                    try:
-                        # Extract slot details (adjust based on actual HTML structure)
-                        date_element = slot.find_element(By.CLASS_NAME, 'slot-date')
-                        time_element = slot.find_element(By.CLASS_NAME, 'slot-time')
-                        price_element = slot.find_element(By.CLASS_NAME, 'slot-price')
-                        
-                        slot_data = {
-                            'date': date_element.text,
-                            'time': time_element.text,
-                            'price': self._parse_price(price_element.text),
-                            'pitch_type': pitch_type,
-                            'available': True
-                        }
-                        available_slots.append(slot_data)
-                    except NoSuchElementException:
-                        continue
-                        
-            except NoSuchElementException:
-                # If no time slots found with that class, try alternative approach
-                st.info("No time slots found with standard selectors. Site may require manual inspection.")
+                span['slot_count'] = len(available_slots)
+                if not available_slots:
+                    span['status'] = 'failed'
             
             # If no slots found, return mock data for testing (remove in production)
             if not available_slots:
@@ -138,6 +410,7 @@ class MerkyFCBookingBot:
                             'available': True
                         })
             
+            status = 'ok'
             return available_slots
             
         except TimeoutException:
@@ -146,83 +419,150 @@ class MerkyFCBookingBot:
         except Exception as e:
             st.error(f"Error scraping available times: {str(e)}")
             return []
+        finally:
+            self._finish_trace(status)
     
-    def book_pitch(self, date, time, pitch_type, user_credentials=None):
+    def prepare_booking(self, pitch_type, user_credentials=None):
         """
-        Book a pitch at the specified date and time
+        Warm a booking session ahead of time
+        
+        Starts the browser, logs in and leaves the booking page filtered to
+        pitch_type, so a later book_pitch can go straight to the slot.
         
         Args:
-            date (str): Booking date (YYYY-MM-DD)
-            time (str): Booking time (HH:MM)
-            pitch_type (str): Type of pitch to book
+            pitch_type (str): Type of pitch that will be booked
             user_credentials (dict): Optional credentials for login
             
         Returns:
-            dict: Booking confirmation details or None if failed
+            bool: True if the session is ready
         """
-        self._init_driver()
+        self._start_trace('prepare', pitch_type=pitch_type)
+        self.prepared = None
+        status = 'failed'
+        
+        try:
+            self._start_browser()
+        except Exception:
+            self._finish_trace(status)
+            raise
         
         try:
-            # Navigate to booking page
-            self.driver.get('https://merkyfchq.com/booking')
-            time.sleep(3)
-            
-            # If credentials provided, login first
             if user_credentials:
                 if not self._login(user_credentials):
-                    return None
+                    return False
+            
+            self._load_page('https://merkyfchq.com/booking')
+            self._apply_pitch_filter(pitch_type, wait_for_filters=True)
             
-            # Apply pitch type filter
-            pitch_filter_map = {
-                'half_pitch': 'half pitch',
-                'full_pitch': 'full pitch',
-                'third_pitch': 'third pitch'
+            self.prepared = {
+                'pitch_type': pitch_type,
+                'logged_in': bool(user_credentials),
+                'prepared_at': datetime.now()
             }
-            filter_text = pitch_filter_map.get(pitch_type, 'half pitch')
+            status = 'ok'
+            return True
             
-            try:
-                pitch_checkboxes = self.driver.find_elements(By.XPATH, f"//h4[contains(text(), '{filter_text}')]")
-                if pitch_checkboxes:
-                    pitch_checkboxes[0].click()
-                    time.sleep(2)
-            except Exception as e:
-                st.warning(f"Could not apply pitch filter during booking: {str(e)}")
+        except Exception as e:
+            st.warning(f"Could not prepare booking session: {str(e)}")
+            return False
+        finally:
+            self._finish_trace(status)
+    
+    def is_prepared_for(self, pitch_type):
+        """
+        Check a warm session from prepare_booking is still usable for pitch_type
+        
+        Returns:
+            bool: True if book_pitch can skip navigation, login and filtering
+        """
+        if self.prepared is None or self.driver is None or self.prepared['pitch_type'] != pitch_type:
+            return False
+        try:
+            self.driver.current_url  # Raises if the browser has gone away
+            return True
+        except WebDriverException:
+            self.prepared = None
+            return False
+    
+    def book_pitch(self, date, slot_time, pitch_type, user_credentials=None):
+        """
+        Book a pitch at the specified date and time
+        
+        Args:
+            date (str): Booking date (YYYY-MM-DD)
+            slot_time (str): Booking time (HH:MM)
+            pitch_type (str): Type of pitch to book
+            user_credentials (dict): Optional credentials for login
+            
+        Returns:
+            dict: Booking confirmation details or None if failed
+        """
+        warm = self.is_prepared_for(pitch_type)
+        self._start_trace('book', date=date, time=slot_time, pitch_type=pitch_type, warm=warm)
+        self.prepared = None  # A prepared session is good for one booking
+        status = 'failed'
+        
+        try:
+            self._start_browser()
+        except Exception:
+            self._finish_trace(status)
+            raise
+        
+        try:
+            # A warm session is already logged in on the filtered booking page
+            if not warm:
+                # Navigate to booking page
+                self._load_page('https://merkyfchq.com/booking')
+                
+                # If credentials provided, login first
+                if user_credentials:
+                    if not self._login(user_credentials):
+                        return None
+                
+                # Apply pitch type filter
+                self._apply_pitch_filter(pitch_type)
             
             # Find and click the specific time slot
             # This is a placeholder - actual implementation depends on site structure
             try:
                 # Look for the slot matching our date and time
-                slot_xpath = f"//div[contains(@class, 'time-slot') and contains(text(), '{time}')]"
-                slot_element = self.wait.until(EC.element_to_be_clickable((By.XPATH, slot_xpath)))
-                slot_element.click()
-                time.sleep(2)
+                with self._phase('slot_scan'):
+                    slot_xpath = f"//div[contains(@class, 'time-slot') and contains(text(), '{slot_time}')]"
+                    slot_element = self.wait.until(EC.element_to_be_clickable((By.XPATH, slot_xpath)))
+                    slot_element.click()
+                    time.sleep(2)
                 
                 # Proceed through booking flow (adjust based on actual site)
                 # 1. Confirm selection
-                confirm_button = self.wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Confirm')]")))
-                confirm_button.click()
-                time.sleep(2)
+                with self._phase('confirm'):
+                    confirm_button = self.wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Confirm')]")))
+                    confirm_button.click()
+                    time.sleep(2)
                 
                 # 2. Fill in booking details if needed
                 # (Add form filling logic based on site requirements)
                 
                 # 3. Complete booking
-                book_button = self.wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Book')]")))
-                book_button.click()
-                time.sleep(3)
+                with self._phase('book'):
+                    book_button = self.wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Book')]")))
+                    book_button.click()
+                    time.sleep(3)
                 
                 # Extract booking confirmation
                 confirmation = self._get_booking_confirmation()
                 
+                status = 'ok'
                 return confirmation
                 
             except TimeoutException:
-                st.error(f"Could not find or book time slot for {date} at {time}")
+                st.error(f"Could not find or book time slot for {date} at {slot_time}")
                 return None
                 
         except Exception as e:
             st.error(f"Error during booking process: {str(e)}")
             return None
+        finally:
+            self._finish_trace(status)
     
     def _login(self, credentials):
         """
@@ -234,30 +574,33 @@ class MerkyFCBookingBot:
         Returns:
             bool: True if login successful
         """
-        try:
-            # Navigate to account page
-            self.driver.get('https://merkyfchq.com/account-sign-up-in')
-            time.sleep(2)
-            
-            # Fill in login form
-            username_field = self.wait.until(EC.presence_of_element_located((By.NAME, 'username')))
-            password_field = self.driver.find_element(By.NAME, 'password')
-            
-            username_field.send_keys(credentials.get('username', ''))
-            password_field.send_keys(credentials.get('password', ''))
-            
-            # Submit login
-            login_button = self.driver.find_element(By.XPATH, "//button[contains(text(), 'Sign In')]")
-            login_button.click()
-            time.sleep(3)
-            
-            # Verify login successful
-            # (Check for presence of user account element or absence of login form)
-            return True
-            
-        except Exception as e:
-            st.error(f"Login failed: {str(e)}")
-            return False
+        with self._phase('login') as span:
+            try:
+                # Navigate to account page
+                self.driver.get('https://merkyfchq.com/account-sign-up-in')
+                time.sleep(2)
+                
+                # Fill in login form
+                username_field = self.wait.until(EC.presence_of_element_located((By.NAME, 'username')))
+                password_field = self.driver.find_element(By.NAME, 'password')
+                
+                username_field.send_keys(credentials.get('username', ''))
+                password_field.send_keys(credentials.get('password', ''))
+                
+                # Submit login
+                login_button = self.driver.find_element(By.XPATH, "//button[contains(text(), 'Sign In')]")
+                login_button.click()
+                time.sleep(3)
+                
+                # Verify login successful
+                # (Check for presence of user account element or absence of login form)
+                return True
+                
+            except Exception as e:
+                span['status'] = 'failed'
+                span['error'] = str(e)[:500]
+                st.error(f"Login failed: {str(e)}")
+                return False
     
     def _get_booking_confirmation(self):
         """
@@ -266,29 +609,32 @@ class MerkyFCBookingBot:
         Returns:
             dict: Confirmation details
         """
-        try:
-            # Look for confirmation number/reference
-            # Adjust selectors based on actual site
-            confirmation_element = self.wait.until(
-                EC.presence_of_element_located((By.CLASS_NAME, 'confirmation-number'))
-            )
-            confirmation_number = confirmation_element.text
-            
-            # Extract other details
-            return {
-                'confirmation_number': confirmation_number,
-                'status': 'confirmed',
-                'timestamp': datetime.now().isoformat()
-            }
-            
-        except Exception as e:
-            st.warning(f"Could not extract confirmation details: {str(e)}")
-            # Return generic confirmation
-            return {
-                'confirmation_number': f"MERKY-{datetime.now().strftime('%Y%m%d%H%M%S')}",
-                'status': 'pending_confirmation',
-                'timestamp': datetime.now().isoformat()
-            }
+        with self._phase('confirmation_extract') as span:
+            try:
+                # Look for confirmation number/reference
+                # Adjust selectors based on actual site
+                confirmation_element = self.wait.until(
+                    EC.presence_of_element_located((By.CLASS_NAME, 'confirmation-number'))
+                )
+                confirmation_number = confirmation_element.text
+                
+                # Extract other details
+                return {
+                    'confirmation_number': confirmation_number,
+                    'status': 'confirmed',
+                    'timestamp': datetime.now().isoformat()
+                }
+                
+            except Exception as e:
+                span['status'] = 'failed'
+                span['error'] = str(e)[:500]
+                st.warning(f"Could not extract confirmation details: {str(e)}")
+                # Return generic confirmation
+                return {
+                    'confirmation_number': f"MERKY-{datetime.now().strftime('%Y%m%d%H%M%S')}",
+                    'status': 'pending_confirmation',
+                    'timestamp': datetime.now().isoformat()
+                }
     
     def _parse_price(self, price_text):
         """
@@ -309,6 +655,7 @@ class MerkyFCBookingBot:
     
     def close(self):
         """Close the browser and clean up"""
+        self.prepared = None
         if self.driver:
             self.driver.quit()
             self.driver = None
@@ -323,6 +670,102 @@ class MerkyFCBookingBot:
 
 
 # Convenience functions for use in the app
+def warm_driver_cache():
+    """Resolve and pin chromedriver ahead of time (image build or container start)"""
+    driver_path, source = resolve_driver_path()
+    print(f"chromedriver ready ({source}): {driver_path}")
+    return driver_path
+
+
+def measure_browser_profile(profile, pitch_type='half_pitch'):
+    """
+    Time a scrape with the given browser profile and sample its resource usage
+    
+    Args:
+        profile (str): 'full' or 'lean'
+        pitch_type (str): Pitch type to scrape
+        
+    Returns:
+        dict: Startup/scrape durations plus memory and network metrics
+    """
+    bot = MerkyFCBookingBot(headless=True, profile=profile)
+    try:
+        started = time.perf_counter()
+        bot._init_driver()
+        startup_seconds = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        slots = bot.scrape_available_times(pitch_type)
+        scrape_seconds = time.perf_counter() - started
+        
+        result = {
+            'profile': profile,
+            'startup_seconds': round(startup_seconds, 2),
+            'scrape_seconds': round(scrape_seconds, 2),
+            'slot_count': len(slots),
+            'driver_source': bot.startup_stats.get('driver_source')
+        }
+        result.update(bot.get_performance_metrics())
+        return result
+    finally:
+        bot.close()
+
+
+def compare_browser_profiles(pitch_type='half_pitch'):
+    """
+    Measure the full and lean browser profiles back to back
+    
+    Args:
+        pitch_type (str): Pitch type to scrape
+        
+    Returns:
+        list: One measurement dict per profile
+    """
+    return [measure_browser_profile(profile, pitch_type) for profile in BROWSER_PROFILES]
+
+
+def measure_driver_startup(include_cold=False):
+    """
+    Time browser starts through the cached driver paths (pinned on disk, then in memory)
+    
+    A cold run forces a fresh webdriver-manager download, so it only happens
+    when asked for.
+    
+    Args:
+        include_cold (bool): Also measure a forced download (network, rewrites the pin)
+        
+    Returns:
+        list: Startup stats per run
+    """
+    global _driver_path
+    runs = [('cold', True, True)] if include_cold else []
+    # warm: in-process cache dropped so the disk pin is read; hot: in-process cache reused
+    runs += [('warm', False, True), ('hot', False, False)]
+    results = []
+    
+    for label, force_refresh, drop_memory in runs:
+        if drop_memory:
+            _driver_path = None
+        started = time.perf_counter()
+        _, source = resolve_driver_path(force_refresh=force_refresh)
+        resolve_seconds = time.perf_counter() - started
+        
+        bot = MerkyFCBookingBot(headless=True, profile='lean')
+        try:
+            bot._init_driver()
+            results.append({
+                'run': label,
+                'driver_source': source,
+                'resolve_seconds': round(resolve_seconds, 3),
+                'launch_seconds': bot.startup_stats.get('launch_seconds'),
+                'total_seconds': round(time.perf_counter() - started, 3)
+            })
+        finally:
+            bot.close()
+    
+    return results
+
+
 def get_credentials_from_secrets():
     """Get Merky FC credentials from Streamlit secrets or environment"""
     from config import get_merky_fc_credentials
@@ -332,3 +775,7 @@ def get_credentials_from_secrets():
     if credentials['username'] and credentials['password']:
         return credentials
     return None
+
+
+if __name__ == '__main__':
+    warm_driver_cache()
@@ -2,34 +2,88 @@
 Booking Manager - Monitors signups and triggers automatic bookings
 """
 
+import uuid
 from datetime import datetime, time, timedelta
 from booking_bot import MerkyFCBookingBot, get_credentials_from_secrets
 from config import get_booking_config
+from helper import get_next_week_range, get_week_range
+from price_index import SlotPriceIndex
+from simulated_bot import make_simulated_bot_factory
+from slot_selection import SlotIndex, SlotSelector
+from scraper_service import sync_slot_cache
 import streamlit as st
 
 
+# Advisory lock class for per-week booking claims (lock key is (class, hashtext(week)))
+WEEK_BOOKING_LOCK_CLASS = 7201150
+
+
 class BookingManager:
     """Manages the automatic booking process based on player signups"""
     
-    def __init__(self, db, auto_book_enabled=None):
+    def __init__(self, db, auto_book_enabled=None, bot_factory=None, use_slot_cache=True):
         """
         Initialize the booking manager
         
         Args:
             db: DatabaseHandler instance
             auto_book_enabled (bool): Enable/disable automatic booking
+            bot_factory (callable): factory(headless, profile) returning a booking bot;
+                                    defaults to get_bot_factory()
+            use_slot_cache (bool): Read and write the shared slot cache (False scrapes the
+                                   bot every time and leaves the cache and price index alone)
         """
         self.db = db
+        self.use_slot_cache = use_slot_cache
         
         # Load configuration from secrets or environment
         booking_config = get_booking_config()
         
+        self.bot_factory = bot_factory or get_bot_factory()
+        self.price_index = SlotPriceIndex(db)
+        self.dry_run = bot_factory is None and booking_config['dry_run']
         self.auto_book_enabled = auto_book_enabled if auto_book_enabled is not None else booking_config['auto_book_enabled']
         self.thresholds = {
             'half_pitch': booking_config['half_pitch_threshold'],
             'full_pitch': booking_config['full_pitch_threshold']
         }
         self.preferred_time = booking_config['preferred_time']
+        self.prebook_margin = booking_config['prebook_margin']
+        self.prebook_max_age_minutes = booking_config['prebook_max_age_minutes']
+        
+        # Speculative warm booking session (only driven by the booking worker)
+        self.warm_session = None
+        self.prebook_retry_at = None
+        self.slot_selector = SlotSelector(
+            preferred_time=self.preferred_time,
+            preferred_days=booking_config['preferred_days'],
+            weights=booking_config['slot_weights']
+        )
+    
+    def get_preferred_slot_changes(self, limit=50):
+        """
+        Get recent slot added/removed events at the preferred time
+        
+        Events are written by the scraper worker (see sync_slot_cache).
+        
+        Args:
+            limit (int): Max events returned
+            
+        Returns:
+            list: Event dicts (type, pitch_type, date, time, price, received_at), newest first
+        """
+        return [
+            {
+                'type': event_type,
+                'pitch_type': pitch_type,
+                'date': slot_date.strftime('%Y-%m-%d'),
+                'time': slot_time.strftime('%H:%M'),
+                'price': float(price) if price is not None else None,
+                'received_at': recorded_at
+            }
+            for event_type, pitch_type, slot_date, slot_time, price, recorded_at
+            in self.db.get_slot_events(slot_time=self.preferred_time, limit=limit)
+        ]
     
     def check_and_book(self, week):
         """
@@ -41,14 +95,14 @@ class BookingManager:
             week (str): Week identifier (e.g., "2026-W05")
             
         Returns:
-            dict: Booking confirmation details or None
+            dict: Booking confirmation details, {'status': 'booking_in_progress'}
+                  if another attempt holds the week, or None
         """
         if not self.auto_book_enabled:
             return None
         
         # Get current signup count
-        signups = self.db.fetch_signups(week)
-        count = len(signups)
+        count = self.db.get_signup_count(week)
         
         # Determine booking strategy based on count
         booking_strategy = None
@@ -66,13 +120,63 @@ class BookingManager:
         if self.is_already_booked(week):
             return {'status': 'already_booked', 'week': week}
         
+        # Claim the week so concurrent triggers collapse into this one attempt
+        owner = uuid.uuid4().hex
+        claimed, state = self.db.claim_week_booking(
+            week, owner, WEEK_BOOKING_LOCK_CLASS,
+            get_booking_config()['in_progress_stale_minutes'])
+        if not claimed:
+            if state and state[1] == 'booked':
+                return {'status': 'already_booked', 'week': week}
+            return {
+                'status': 'booking_in_progress',
+                'week': week,
+                'started_at': state[3] if state else None
+            }
+        
         # Execute booking strategy
-        if booking_strategy == 'two_thirds':
-            return self._book_two_third_pitches(week, count)
-        elif booking_strategy == 'one_third':
-            return self._book_single_pitch('third_pitch', week, count)
+        result = None
+        try:
+            if booking_strategy == 'two_thirds':
+                result = self._book_two_third_pitches(week, count)
+            elif booking_strategy == 'one_third':
+                result = self._book_single_pitch('third_pitch', week, count)
+        finally:
+            self.db.finish_week_booking(week, owner, 'booked' if result else 'failed', result)
+        
+        return result
+    
+    def enqueue_booking(self, week, trigger='signup'):
+        """
+        Queue check_and_book for the booking worker instead of running it inline
         
-        return None
+        Args:
+            week (str): Week identifier
+            trigger (str): What caused the job (shown in job status)
+            
+        Returns:
+            int: job_id, or None if auto-booking is disabled or queueing failed
+        """
+        if not self.auto_book_enabled:
+            return None
+        return self.db.enqueue_booking_job(week, trigger, get_booking_config()['job_max_attempts'])
+    
+    def get_booking_job(self, job_id):
+        """
+        Get the status of a queued booking job
+        
+        Args:
+            job_id (int): Job id from enqueue_booking
+            
+        Returns:
+            dict: Job fields, or None if not found
+        """
+        row = self.db.get_booking_job(job_id)
+        if not row:
+            return None
+        columns = ['job_id', 'week', 'status', 'trigger', 'attempts', 'max_attempts',
+                   'result', 'error', 'created_at', 'started_at', 'finished_at']
+        return dict(zip(columns, row))
     
     def _book_single_pitch(self, pitch_type, week, count):
         """
@@ -93,8 +197,9 @@ class BookingManager:
             st.warning(f"No available slots found for {pitch_type}")
             return None
         
-        # Select best slot
-        best_slot = self.select_best_slot(available_slots)
+        # Use the pre-selected target if it is still free, else select best slot
+        warm_target = self._warm_target(week, available_slots, 1)
+        best_slot = warm_target[0] if warm_target else self.select_best_slot(available_slots)
         
         if not best_slot:
             st.warning("Could not select a suitable time slot")
@@ -123,25 +228,13 @@ class BookingManager:
             st.warning("Not enough third pitch slots available. Need at least 2 slots at the same time.")
             return None
         
-        # Find 2 slots at the same date/time
-        slots_by_datetime = {}
-        for slot in available_slots:
-            key = f"{slot['date']}_{slot['time']}"
-            if key not in slots_by_datetime:
-                slots_by_datetime[key] = []
-            slots_by_datetime[key].append(slot)
-        
-        # Filter to only datetime slots with at least 2 pitches available
-        valid_datetimes = {k: v for k, v in slots_by_datetime.items() if len(v) >= 2}
+        # Best 2 pitches at the same date/time (next week preferred), unless a warm target is still free
+        two_slots = self._warm_target(week, available_slots, 2) or self.select_best_pair(available_slots)
         
-        if not valid_datetimes:
+        if not two_slots:
             st.warning("Could not find 2 third pitches available at the same time.")
             return None
         
-        # Select best datetime
-        best_datetime_key = list(valid_datetimes.keys())[0]  # TODO: Smart selection
-        two_slots = valid_datetimes[best_datetime_key][:2]
-        
         # Book both pitches
         confirmations = []
         booking_ids = []
@@ -177,6 +270,128 @@ class BookingManager:
             'player_count': count
         }
     
+    def update_prebooking(self, week):
+        """
+        Warm or release the speculative booking session for a week
+        
+        Once signups are within prebook_margin of the half pitch threshold, this
+        pre-fetches availability, picks the target slot(s) and leaves a logged-in
+        browser on the booking page, so check_and_book starts from a warm session.
+        The session is released if signups fall back or the week gets booked.
+        
+        Args:
+            week (str): Week identifier
+            
+        Returns:
+            str: 'idle', 'warm', 'no_slots' or 'failed'
+        """
+        if not self.auto_book_enabled:
+            self.release_warm_session()
+            return 'idle'
+        
+        status = self.get_booking_status(week)
+        if status['is_booked'] or status['current_count'] < status['threshold_half'] - self.prebook_margin:
+            self.release_warm_session()
+            return 'idle'
+        
+        session = self.warm_session
+        if session and session['week'] == week and session['bot'].is_prepared_for('third_pitch'):
+            age = datetime.now() - session['prepared_at']
+            pair_needed = status['current_count'] >= status['threshold_full'] - self.prebook_margin
+            if age.total_seconds() < self.prebook_max_age_minutes * 60 and pair_needed == (len(session['target_slots']) == 2):
+                return 'warm'
+        self.release_warm_session()
+        
+        # Don't rescrape / relaunch on every poll after a failed warm-up
+        if self.prebook_retry_at and datetime.now() < self.prebook_retry_at:
+            return 'failed'
+        self.prebook_retry_at = datetime.now() + timedelta(minutes=1)
+        
+        # Pre-fetch availability (refreshes the slot cache) and pick the target
+        available_slots = self._get_available_slots('third_pitch')
+        if status['current_count'] >= status['threshold_full'] - self.prebook_margin:
+            target_slots = self.select_best_pair(available_slots)
+        else:
+            best_slot = self.select_best_slot(available_slots)
+            target_slots = [best_slot] if best_slot else None
+        if not target_slots:
+            return 'no_slots'
+        
+        bot = self.bot_factory(headless=True, profile='full')
+        try:
+            prepared = bot.prepare_booking('third_pitch', get_credentials_from_secrets())
+        except Exception:
+            prepared = False
+        if not prepared:
+            bot.close()
+            return 'failed'
+        
+        self.warm_session = {
+            'week': week,
+            'bot': bot,
+            'target_slots': target_slots,
+            'prepared_at': datetime.now()
+        }
+        self.prebook_retry_at = None
+        return 'warm'
+    
+    def release_warm_session(self):
+        """Close the speculative booking browser, if any"""
+        session, self.warm_session = self.warm_session, None
+        if session:
+            session['bot'].close()
+    
+    def get_warm_session_status(self):
+        """
+        Describe the current warm session
+        
+        Returns:
+            dict: week, targets and age in seconds, or None when idle
+        """
+        session = self.warm_session
+        if not session:
+            return None
+        return {
+            'week': session['week'],
+            'targets': [f"{slot['date']} {slot['time']}" for slot in session['target_slots']],
+            'age_seconds': round((datetime.now() - session['prepared_at']).total_seconds())
+        }
+    
+    def _warm_target(self, week, available_slots, needed):
+        """
+        Target slots chosen during pre-booking, if still available
+        
+        Args:
+            week (str): Week being booked
+            available_slots (list): Current availability
+            needed (int): Pitches being booked (1 or 2)
+            
+        Returns:
+            list: Target slots, or None to fall back to normal selection
+        """
+        session = self.warm_session
+        if not session or session['week'] != week or len(session['target_slots']) != needed:
+            return None
+        
+        available_keys = {(slot['date'], slot['time'], slot['pitch_type']) for slot in available_slots}
+        if all((slot['date'], slot['time'], slot['pitch_type']) in available_keys
+               for slot in session['target_slots']):
+            return session['target_slots']
+        return None
+    
+    def _take_warm_bot(self, pitch_type):
+        """
+        Hand over the warm browser for a booking (it is closed by the caller)
+        
+        Returns:
+            object: Prepared bot from bot_factory, or None if no usable session
+        """
+        session = self.warm_session
+        if not session or not session['bot'].is_prepared_for(pitch_type):
+            return None
+        self.warm_session = None
+        return session['bot']
+    
     def is_already_booked(self, week):
         """
         Check if a booking already exists for the week
@@ -199,6 +414,9 @@ class BookingManager:
         Returns:
             list: Available slots
         """
+        if not self.use_slot_cache:
+            return self._scrape_and_cache_slots(pitch_type)
+        
         # Try to get from cache first
         cached_slots = self.db.get_available_slots(pitch_type)
         
@@ -235,12 +453,12 @@ class BookingManager:
             list: Available slots
         """
         try:
-            with MerkyFCBookingBot(headless=True) as bot:
+            with self.bot_factory(headless=True, profile='lean') as bot:
                 slots = bot.scrape_available_times(pitch_type)
                 
-                # Cache the slots
-                if slots:
-                    self.db.cache_available_slots(slots)
+                # Sync the cache (writes only what changed)
+                if slots and self.use_slot_cache:
+                    sync_slot_cache(self.db, pitch_type, slots)
                 
                 return slots
         except Exception as e:
@@ -260,39 +478,29 @@ class BookingManager:
         if not available_slots:
             return None
         
-        # Get next week's date range
-        today = datetime.now().date()
-        week_start = today + timedelta(days=(7 - today.weekday()))  # Next Monday
-        week_end = week_start + timedelta(days=6)
-        
-        # Filter slots for next week
-        next_week_slots = []
-        for slot in available_slots:
-            try:
-                slot_date = datetime.strptime(slot['date'], '%Y-%m-%d').date()
-                if week_start <= slot_date <= week_end:
-                    next_week_slots.append(slot)
-            except (ValueError, KeyError):
-                continue
-        
-        if not next_week_slots:
-            # If no slots next week, just take first available
-            return available_slots[0]
+        # Prefer next week; if nothing is available then, just take first available
+        index = SlotIndex(available_slots)
+        week_start, week_end = get_next_week_range()
+        return self.slot_selector.best_single(index, week_start, week_end) or available_slots[0]
+    
+    def select_best_pair(self, available_slots):
+        """
+        Select the best two pitches available at the same date/time
         
-        # Prefer slots close to preferred time
-        preferred_hour = int(self.preferred_time.split(':')[0])
+        Args:
+            available_slots (list): List of available slots
+            
+        Returns:
+            list: Two slots or None
+        """
+        if not available_slots:
+            return None
         
-        def time_score(slot):
-            """Score based on proximity to preferred time"""
-            try:
-                slot_hour = int(slot['time'].split(':')[0])
-                return abs(slot_hour - preferred_hour)
-            except (ValueError, KeyError):
-                return 999
-        
-        # Sort by time score and return best
-        next_week_slots.sort(key=time_score)
-        return next_week_slots[0]
+        # Prefer next week, falling back to any date with a free pair
+        index = SlotIndex(available_slots)
+        week_start, week_end = get_next_week_range()
+        return (self.slot_selector.best_pair(index, week_start, week_end) or
+                self.slot_selector.best_pair(index))
     
     def book_pitch_slot(self, slot, week, player_count):
         """
@@ -310,8 +518,9 @@ class BookingManager:
             # Get credentials
             credentials = get_credentials_from_secrets()
             
-            # Book via Selenium bot
-            with MerkyFCBookingBot(headless=True) as bot:
+            # Book via Selenium bot, reusing the warm session if one is ready
+            bot = self._take_warm_bot(slot['pitch_type']) or self.bot_factory(headless=True, profile='full')
+            with bot:
                 confirmation = bot.book_pitch(
                     slot['date'],
                     slot['time'],
@@ -353,7 +562,7 @@ class BookingManager:
             st.error(f"Error booking pitch: {str(e)}")
             return None
     
-    def manual_book(self, date, time, pitch_type, week, player_count=14):
+    def manual_book(self, date, time, pitch_type, week, player_count=14, price=None):
         """
         Manually trigger a booking (for admin use)
         
@@ -363,15 +572,22 @@ class BookingManager:
             pitch_type (str): Type of pitch
             week (str): Week identifier
             player_count (int): Expected number of players
+            price (float): Total pitch price (estimated from the price index if None)
             
         Returns:
-            dict: Booking confirmation
+            dict: Booking confirmation, or None if no price is known for the slot
         """
+        price = price or self.price_index.estimate_price(pitch_type, date, time)
+        if not price:
+            # A £0 booking would bill every player nothing for the session
+            st.error(f"No price known for {pitch_type} at {date} {time} - enter the price to book it")
+            return None
+        
         slot = {
             'date': date,
             'time': time,
             'pitch_type': pitch_type,
-            'price': 80.0 if pitch_type == 'half_pitch' else 150.0,
+            'price': price,
             'available': True
         }
         
@@ -387,10 +603,37 @@ class BookingManager:
         Returns:
             dict: Status information
         """
-        signups = self.db.fetch_signups(week)
-        count = len(signups)
+        count = self.db.get_signup_count(week)
         is_booked = self.is_already_booked(week)
+        return self._build_booking_status(week, count, is_booked)
+    
+    def get_booking_status_range(self, start_week, n_weeks):
+        """
+        Get the booking status for several consecutive weeks at once
+        
+        Args:
+            start_week (str): First week identifier (e.g., "2026-W05")
+            n_weeks (int): Number of weeks to include
+            
+        Returns:
+            list: Status dicts (as get_booking_status) in week order
+        """
+        weeks = get_week_range(start_week, n_weeks)
+        rows = self.db.get_booking_status_range(weeks)
+        return [self._build_booking_status(week, count, is_booked) for week, count, is_booked in rows]
+    
+    def _build_booking_status(self, week, count, is_booked):
+        """
+        Build a status dict from a week's signup count and booking state
         
+        Args:
+            week (str): Week identifier
+            count (int): Number of signups
+            is_booked (bool): Whether a booking exists
+            
+        Returns:
+            dict: Status information
+        """
         # Determine status
         if is_booked:
             status = 'booked'
@@ -415,3 +658,50 @@ class BookingManager:
             'threshold_half': self.thresholds['half_pitch'],
             'threshold_full': self.thresholds['full_pitch']
         }
+
+
+def get_bot_factory():
+    """
+    Bot factory for the configured backend
+    
+    Returns:
+        callable: factory(headless, profile) - the simulated bot when booking.dry_run
+                  is set, otherwise MerkyFCBookingBot
+    """
+    booking_config = get_booking_config()
+    if booking_config['dry_run']:
+        return make_simulated_bot_factory(
+            latency_seconds=booking_config['sim_latency_seconds'],
+            failure_rate=booking_config['sim_failure_rate']
+        )
+    return MerkyFCBookingBot
+
+
+def booking_details_from_result(booking_result):
+    """
+    Build the WhatsApp booking confirmation details from a check_and_book result
+    
+    Args:
+        booking_result (dict): Result of check_and_book / book_pitch_slot
+        
+    Returns:
+        dict: Details for WhatsAppNotifier.send_booking_confirmation
+    """
+    booking_details = {
+        'date': booking_result['slot']['date'],
+        'time': booking_result['slot']['time'],
+        'pitch_type': booking_result['slot']['pitch_type'],
+        'player_count': booking_result['player_count'],
+        'cost_per_player': booking_result['cost_per_player'],
+        'total_cost': booking_result['total_cost'],
+    }
+    
+    # Handle confirmation number (different for single vs 2 thirds)
+    if booking_result.get('status') == 'two_thirds_booked':
+        conf_numbers = [c.get('confirmation', {}).get('confirmation_number', 'N/A')
+                        for c in booking_result.get('confirmations', [])]
+        booking_details['confirmation_number'] = ', '.join(conf_numbers)
+    else:
+        booking_details['confirmation_number'] = booking_result.get('confirmation', {}).get('confirmation_number', 'N/A')
+    
+    return booking_details
@@ -0,0 +1,147 @@
+"""
+Background booking worker - runs queued auto-booking jobs off the web request
+
+Start from the repo root with: PYTHONPATH=src python -m booking_worker
+(or ./start.sh booking). Several workers can run at once; jobs are claimed
+with FOR UPDATE SKIP LOCKED so each one is only executed by a single worker.
+"""
+
+import os
+import signal
+import socket
+from threading import Event
+from booking_manager import BookingManager, booking_details_from_result
+from config import get_booking_config
+from helper import get_current_week
+from whatsapp import WhatsAppNotifier
+
+# How often a job re-checks a week another attempt is booking
+IN_PROGRESS_RETRY_SECONDS = 60
+
+
+class BookingJobWorker:
+    """Consumes public.booking_jobs and runs BookingManager.check_and_book"""
+
+    def __init__(self, db):
+        """
+        Initialize the worker
+
+        Args:
+            db: DatabaseHandler instance (dedicated to this worker)
+        """
+        self.db = db
+        self.booking_manager = BookingManager(db)
+        self.whatsapp = WhatsAppNotifier(db)
+        self.config = get_booking_config()
+        # A requeued job must find its crashed attempt's week claim already stale, or it would
+        # only wait on it - so never requeue sooner than the claim window
+        self.job_stale_minutes = max(self.config['job_stale_minutes'], self.config['in_progress_stale_minutes'])
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        self.stop_event = Event()
+        self.prebooking_state = 'idle'
+
+    def process_next_job(self):
+        """
+        Claim and run one job
+
+        Returns:
+            bool: True if a job was processed, False if the queue was empty
+        """
+        job = self.db.claim_booking_job()
+        if not job:
+            return False
+
+        job_id, week, attempts, max_attempts = job
+        if attempts > max_attempts:
+            self.db.finish_booking_job(job_id, 'failed', error='Exceeded max attempts')
+            return True
+
+        print(f"[{self.worker_id}] Running booking job {job_id} for {week} (attempt {attempts})")
+        try:
+            result = self.booking_manager.check_and_book(week)
+        except Exception as e:
+            self._handle_failure(job_id, attempts, max_attempts, str(e))
+            return True
+
+        if result is None:
+            # Below threshold, auto-booking off, or no slot could be booked
+            status = self.booking_manager.get_booking_status(week)
+            if status['status'] in ('ready_half', 'ready_full'):
+                self._handle_failure(job_id, attempts, max_attempts, 'Booking attempt did not complete')
+            else:
+                self.db.finish_booking_job(job_id, 'done', result={'status': 'not_needed', 'week': week})
+            return True
+
+        if result.get('status') == 'booking_in_progress':
+            # Another attempt holds the week: check back once it has finished or its claim has
+            # gone stale (a dead worker's), without using up this job's attempts
+            print(f"[{self.worker_id}] Job {job_id}: {week} is being booked elsewhere; checking again "
+                  f"in {IN_PROGRESS_RETRY_SECONDS}s")
+            self.db.retry_booking_job(job_id, 'Another booking attempt holds the week',
+                                      IN_PROGRESS_RETRY_SECONDS, count_attempt=False)
+            return True
+
+        self.db.finish_booking_job(job_id, 'done', result=result)
+
+        # Another attempt that booked the week sent its own confirmation
+        if result.get('status') != 'already_booked':
+            try:
+                self.whatsapp.send_booking_confirmation(booking_details_from_result(result))
+            except Exception as e:
+                print(f"[{self.worker_id}] Booking confirmation message failed: {e}")
+        return True
+
+    def _handle_failure(self, job_id, attempts, max_attempts, error):
+        """Retry with backoff, or fail the job once attempts are used up"""
+        if attempts < max_attempts:
+            delay_seconds = 30 * (2 ** (attempts - 1))
+            print(f"[{self.worker_id}] Job {job_id} failed ({error}); retrying in {delay_seconds}s")
+            self.db.retry_booking_job(job_id, error, delay_seconds)
+        else:
+            print(f"[{self.worker_id}] Job {job_id} failed permanently: {error}")
+            self.db.finish_booking_job(job_id, 'failed', error=error)
+
+    def run(self):
+        """Run until SIGTERM/SIGINT, draining the queue between polls"""
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.stop_event.set())
+        signal.signal(signal.SIGINT, lambda signum, frame: self.stop_event.set())
+        print(f"[{self.worker_id}] Booking worker started")
+
+        while not self.stop_event.is_set():
+            try:
+                self.db.requeue_stale_booking_jobs(self.job_stale_minutes)
+                while not self.stop_event.is_set() and self.process_next_job():
+                    pass
+                self.update_prebooking()
+            except Exception as e:
+                print(f"[{self.worker_id}] Booking worker error: {e}")
+            self.stop_event.wait(self.config['job_poll_seconds'])
+
+        self.booking_manager.release_warm_session()
+        print(f"[{self.worker_id}] Booking worker stopped")
+
+    def update_prebooking(self):
+        """Keep a warm booking session ready while this week's signups are near the threshold"""
+        state = self.booking_manager.update_prebooking(get_current_week())
+        if state != self.prebooking_state:
+            print(f"[{self.worker_id}] Pre-booking: {self.prebooking_state} -> {state} "
+                  f"{self.booking_manager.get_warm_session_status() or ''}")
+            self.prebooking_state = state
+
+
+def main():
+    """Entry point: `PYTHONPATH=src python -m booking_worker` from the repo root"""
+    from database import DatabaseHandler
+
+    db = DatabaseHandler(environment='live')
+    db.create_tables('create_booking_jobs_table.sql')
+    db.create_tables('create_week_booking_state_table.sql')
+
+    try:
+        BookingJobWorker(db).run()
+    finally:
+        db.close_connection()
+
+
+if __name__ == '__main__':
+    main()
@@ -85,7 +85,36 @@ def get_merky_fc_credentials():
 def get_whatsapp_config():
     """Get WhatsApp configuration"""
     return {
-        'group_id': get_config('whatsapp.group_id', os.getenv('WHATSAPP_GROUP_ID', 'CHAjDSd8Tm14QZ4rGrqQxc'))
+        'group_id': get_config('whatsapp.group_id', os.getenv('WHATSAPP_GROUP_ID', 'CHAjDSd8Tm14QZ4rGrqQxc')),
+        # Delivery transport: 'pywhatkit' (WhatsApp Web), 'webhook' (HTTP gateway) or 'capture' (offline sink)
+        'transport': get_config('whatsapp.transport', os.getenv('WHATSAPP_TRANSPORT', 'pywhatkit')),
+        'webhook_url': get_config('whatsapp.webhook_url', os.getenv('WHATSAPP_WEBHOOK_URL')),
+        'webhook_token': get_config('whatsapp.webhook_token', os.getenv('WHATSAPP_WEBHOOK_TOKEN')),
+        'capture_path': get_config('whatsapp.capture_path', os.getenv('WHATSAPP_CAPTURE_PATH')),
+        # Outbound queue: merge roster updates within this window, but never hold one longer than max_delay
+        'debounce_seconds': int(get_config('whatsapp.debounce_seconds', os.getenv('WHATSAPP_DEBOUNCE_SECONDS', '60'))),
+        'max_delay_seconds': int(get_config('whatsapp.max_delay_seconds', os.getenv('WHATSAPP_MAX_DELAY_SECONDS', '300'))),
+        # Scheduled messages (notification_worker): hours before kick-off each one is sent
+        'reminder_hours_before': int(get_config('whatsapp.reminder_hours_before', os.getenv('WHATSAPP_REMINDER_HOURS_BEFORE', '24'))),
+        'weekly_list_hours_before': int(get_config('whatsapp.weekly_list_hours_before', os.getenv('WHATSAPP_WEEKLY_LIST_HOURS_BEFORE', '48'))),
+        'dispatch_lookahead_days': int(get_config('whatsapp.dispatch_lookahead_days', os.getenv('WHATSAPP_DISPATCH_LOOKAHEAD_DAYS', '7'))),
+        'dispatch_poll_seconds': int(get_config('whatsapp.dispatch_poll_seconds', os.getenv('WHATSAPP_DISPATCH_POLL_SECONDS', '60'))),
+        'dispatch_max_attempts': int(get_config('whatsapp.dispatch_max_attempts', os.getenv('WHATSAPP_DISPATCH_MAX_ATTEMPTS', '3'))),
+        'dispatch_stale_minutes': int(get_config('whatsapp.dispatch_stale_minutes', os.getenv('WHATSAPP_DISPATCH_STALE_MINUTES', '10'))),
+        # Per-player invoice messages: parallel senders and overall send rate
+        'dm_workers': int(get_config('whatsapp.dm_workers', os.getenv('WHATSAPP_DM_WORKERS', '4'))),
+        'dm_per_minute': int(get_config('whatsapp.dm_per_minute', os.getenv('WHATSAPP_DM_PER_MINUTE', '30'))),
+        'dm_max_attempts': int(get_config('whatsapp.dm_max_attempts', os.getenv('WHATSAPP_DM_MAX_ATTEMPTS', '3')))
+    }
+
+
+def get_invoice_config():
+    """Get invoice configuration"""
+    return {
+        # Days after month end before its invoice snapshot is frozen
+        'close_after_days': int(get_config('invoice.close_after_days', os.getenv('INVOICE_CLOSE_AFTER_DAYS', '3'))),
+        # Processes rendering per-player invoice documents (0 = one per CPU)
+        'render_workers': int(get_config('invoice.render_workers', os.getenv('INVOICE_RENDER_WORKERS', '0')))
     }
 
 
@@ -95,7 +124,71 @@ def get_booking_config():
         'preferred_time': get_config('booking.preferred_time', os.getenv('BOOKING_PREFERRED_TIME', '19:00')),
         'auto_book_enabled': str(get_config('booking.auto_book_enabled', os.getenv('BOOKING_AUTO_ENABLED', 'true'))).lower() == 'true',
         'half_pitch_threshold': int(get_config('booking.half_pitch_threshold', os.getenv('BOOKING_HALF_PITCH_THRESHOLD', '14'))),
-        'full_pitch_threshold': int(get_config('booking.full_pitch_threshold', os.getenv('BOOKING_FULL_PITCH_THRESHOLD', '18')))
+        'full_pitch_threshold': int(get_config('booking.full_pitch_threshold', os.getenv('BOOKING_FULL_PITCH_THRESHOLD', '18'))),
+        # Booking job queue (consumed by booking_worker)
+        'job_poll_seconds': int(get_config('booking.job_poll_seconds', os.getenv('BOOKING_JOB_POLL_SECONDS', '5'))),
+        'job_max_attempts': int(get_config('booking.job_max_attempts', os.getenv('BOOKING_JOB_MAX_ATTEMPTS', '3'))),
+        'job_stale_minutes': int(get_config('booking.job_stale_minutes', os.getenv('BOOKING_JOB_STALE_MINUTES', '20'))),
+        # Slot selection: preferred weekdays (empty = any) and score weights
+        'preferred_days': [d.strip() for d in str(get_config('booking.preferred_days', os.getenv('BOOKING_PREFERRED_DAYS', ''))).split(',') if d.strip()],
+        'slot_weights': {
+            'time': float(get_config('booking.weight_time', os.getenv('BOOKING_WEIGHT_TIME', '0.5'))),
+            'day': float(get_config('booking.weight_day', os.getenv('BOOKING_WEIGHT_DAY', '0.2'))),
+            'price': float(get_config('booking.weight_price', os.getenv('BOOKING_WEIGHT_PRICE', '0.2'))),
+            'pairing': float(get_config('booking.weight_pairing', os.getenv('BOOKING_WEIGHT_PAIRING', '0.1')))
+        },
+        # Dry run: book against the simulated bot instead of Merky FC HQ
+        'dry_run': str(get_config('booking.dry_run', os.getenv('BOOKING_DRY_RUN', 'false'))).lower() == 'true',
+        'sim_latency_seconds': {
+            'start': float(get_config('booking.sim_start_seconds', os.getenv('BOOKING_SIM_START_SECONDS', '2'))),
+            'scrape': float(get_config('booking.sim_scrape_seconds', os.getenv('BOOKING_SIM_SCRAPE_SECONDS', '5'))),
+            'book': float(get_config('booking.sim_book_seconds', os.getenv('BOOKING_SIM_BOOK_SECONDS', '10')))
+        },
+        'sim_failure_rate': float(get_config('booking.sim_failure_rate', os.getenv('BOOKING_SIM_FAILURE_RATE', '0.0'))),
+        # Pre-booking: warm a logged-in browser this many players below the threshold
+        'prebook_margin': int(get_config('booking.prebook_margin', os.getenv('BOOKING_PREBOOK_MARGIN', '2'))),
+        'prebook_max_age_minutes': int(get_config('booking.prebook_max_age_minutes', os.getenv('BOOKING_PREBOOK_MAX_AGE_MINUTES', '20'))),
+        # An in-progress week booking older than this is assumed dead and can be retaken
+        'in_progress_stale_minutes': int(get_config('booking.in_progress_stale_minutes', os.getenv('BOOKING_IN_PROGRESS_STALE_MINUTES', '20')))
+    }
+
+
+def get_browser_config():
+    """Get browser/WebDriver configuration"""
+    return {
+        # Explicit chromedriver binary (skips resolution entirely when set)
+        'driver_path': get_config('browser.driver_path', os.getenv('CHROMEDRIVER_PATH')),
+        # Where the resolved driver pin is stored between runs
+        'driver_cache_dir': os.path.expanduser(
+            get_config('browser.driver_cache_dir', os.getenv('BROWSER_DRIVER_CACHE_DIR', '~/.wdm')))
+    }
+
+
+def get_scrape_config():
+    """Get adaptive scrape scheduling configuration (intervals in minutes)"""
+    return {
+        # Pitch types to keep cached; third_pitch (what gets booked) is always scraped as well
+        'pitch_types': [p.strip() for p in str(get_config('scrape.pitch_types', os.getenv('SCRAPE_PITCH_TYPES', 'third_pitch'))).split(',') if p.strip()],
+        'hot_interval_minutes': int(get_config('scrape.hot_interval_minutes', os.getenv('SCRAPE_HOT_INTERVAL_MINUTES', '5'))),
+        'warm_interval_minutes': int(get_config('scrape.warm_interval_minutes', os.getenv('SCRAPE_WARM_INTERVAL_MINUTES', '15'))),
+        'idle_interval_minutes': int(get_config('scrape.idle_interval_minutes', os.getenv('SCRAPE_IDLE_INTERVAL_MINUTES', '60'))),
+        # Scrape hot once signups are within this many players of the half pitch threshold
+        'near_threshold_margin': int(get_config('scrape.near_threshold_margin', os.getenv('SCRAPE_NEAR_THRESHOLD_MARGIN', '3'))),
+        # Fewer cached slots than this for the target week counts as scarce
+        'scarce_slot_count': int(get_config('scrape.scarce_slot_count', os.getenv('SCRAPE_SCARCE_SLOT_COUNT', '4'))),
+        'jitter_fraction': float(get_config('scrape.jitter_fraction', os.getenv('SCRAPE_JITTER_FRACTION', '0.15'))),
+        # Standalone worker: how often to heartbeat/tick, and when a worker counts as dead
+        'worker_heartbeat_seconds': int(get_config('scrape.worker_heartbeat_seconds', os.getenv('SCRAPE_WORKER_HEARTBEAT_SECONDS', '30'))),
+        'worker_stale_seconds': int(get_config('scrape.worker_stale_seconds', os.getenv('SCRAPE_WORKER_STALE_SECONDS', '120')))
+    }
+
+
+def get_tracing_config():
+    """Get bot tracing configuration"""
+    return {
+        'enabled': str(get_config('tracing.enabled', os.getenv('TRACING_ENABLED', 'true'))).lower() == 'true',
+        'trace_dir': os.path.expanduser(get_config('tracing.trace_dir', os.getenv('TRACING_TRACE_DIR', '.traces'))),
+        'screenshots_on_failure': str(get_config('tracing.screenshots_on_failure', os.getenv('TRACING_SCREENSHOTS_ON_FAILURE', 'true'))).lower() == 'true'
     }
 
 
@@ -1,7 +1,10 @@
 import psycopg2
+import psycopg2.extras
 import streamlit as st
 import os
+import json
 import pandas as pd
+from datetime import date, timedelta
 from config import get_database_config
 
 
@@ -98,13 +101,14 @@ class DatabaseHandler:
                 st.error(f"An error occurred: {str(e)}")
         return player_id
 
-    def add_weekly_signups(self, name, week, player_id):
+    def add_weekly_signups(self, name, week, player_id, show_message=True):
         with self.conn.cursor() as cur:
             try:
                 signup_query = self.load_sql("add_weekly_signup_entry.sql")
                 cur.execute(signup_query, (week, player_id,))
                 self.conn.commit()
-                st.success(f"Player {name} signed up for week {week}!")
+                if show_message:
+                    st.success(f"Player {name} signed up for week {week}!")
             except Exception as e:
                 self.conn.rollback()
                 st.error(f"An error occurred: {str(e)}")
@@ -122,6 +126,81 @@ class DatabaseHandler:
             rows = cur.fetchall()
         return rows
 
+    def get_signup_count(self, week):
+        """
+        Get the number of signups for a week from the trigger-maintained counter
+
+        Returns:
+            int: Signup count (0 for a week nobody has signed up for)
+        """
+        self.ensure_connection()
+        query = self.load_sql("get_week_signup_count.sql")
+        with self.conn.cursor() as cur:
+            cur.execute(query, (week,))
+            row = cur.fetchone()
+        self.conn.commit()
+        return row[0] if row else 0
+
+    def get_roster_version(self, week):
+        """
+        Get a week's roster version (changes whenever a signup for the week is written)
+
+        Returns:
+            tuple: (signup_count, updated_at), or None for a week nobody has signed up for
+        """
+        self.ensure_connection()
+        query = self.load_sql("get_week_roster_version.sql")
+        with self.conn.cursor() as cur:
+            cur.execute(query, (week,))
+            row = cur.fetchone()
+        self.conn.commit()
+        return tuple(row) if row else None
+
+    def get_booking_status_range(self, weeks):
+        """
+        Get signup counts and booking state for several weeks in one query
+
+        Args:
+            weeks (list): Week identifiers
+
+        Returns:
+            list of tuples: (week, signup_count, is_booked) in the order of weeks
+        """
+        self.ensure_connection()
+        query = self.load_sql("get_booking_status_range.sql")
+        with self.conn.cursor() as cur:
+            cur.execute(query, {'weeks': list(weeks)})
+            rows = cur.fetchall()
+        self.conn.commit()
+        return rows
+
+    def check_signup_counts(self, repair=False):
+        """
+        Compare the per-week counters against the signups table
+
+        Args:
+            repair (bool): Reset mismatched counters to the true count
+
+        Returns:
+            list of tuples: (week, counter_value, actual_count) for each mismatch found
+        """
+        self.ensure_connection()
+        check_query = self.load_sql("check_week_signup_counts.sql")
+        repair_query = self.load_sql("repair_week_signup_count.sql")
+        with self.conn.cursor() as cur:
+            try:
+                cur.execute(check_query)
+                mismatches = cur.fetchall()
+                if repair:
+                    for week, _, _ in mismatches:
+                        cur.execute(repair_query, {'week': week})
+                self.conn.commit()
+                return mismatches
+            except Exception as e:
+                self.conn.rollback()
+                st.error(f"An error occurred while checking signup counts: {str(e)}")
+                return []
+
     def get_signup_by_player_id(self, week, player_id):
         fetch_signups_query = self.load_sql("check_weekly_signups.sql")
         with self.conn.cursor() as cur:
@@ -201,6 +280,103 @@ class DatabaseHandler:
                 self.conn.rollback()
                 st.error(f"An error occurred while caching slots: {str(e)}")
 
+    def get_cached_slots(self, pitch_type):
+        """
+        Get the current cache state for a pitch type, including unavailable rows
+
+        Returns:
+            list of tuples: (date, time, price, available)
+        """
+        self.ensure_connection()
+        query = self.load_sql("get_cached_slots_for_pitch.sql")
+        with self.conn.cursor() as cur:
+            cur.execute(query, (pitch_type,))
+            rows = cur.fetchall()
+        return rows
+
+    def apply_slot_diff(self, pitch_type, added, changed, removed, slot_count, price_observations=None):
+        """
+        Write a slot diff in one transaction, recording added/removed slots in slot_events
+
+        Args:
+            pitch_type (str): Pitch type that was scraped
+            added (list): Slot dicts not previously available in the cache
+            changed (list): Slot dicts whose price changed
+            removed (list): (date, time) keys no longer listed on the site
+            slot_count (int): Number of slots in the scrape
+            price_observations (list): Dicts with pitch_type, weekday, hour, price
+                                       to fold into the price index
+
+        Returns:
+            bool: True if the diff was written
+        """
+        upsert_query = self.load_sql("cache_available_slots.sql")
+        remove_query = self.load_sql("mark_slot_unavailable.sql")
+        log_query = self.load_sql("record_slot_scrape.sql")
+        price_query = self.load_sql("record_slot_price.sql")
+        event_query = self.load_sql("record_slot_event.sql")
+        events = ([('added', pitch_type, slot['date'], slot['time'], slot['price']) for slot in added] +
+                  [('removed', pitch_type, date, time, None) for date, time in removed])
+        upserts = added + changed
+        with self.conn.cursor() as cur:
+            try:
+                if upserts:
+                    psycopg2.extras.execute_batch(cur, upsert_query, [
+                        (slot['date'], slot['time'], slot['pitch_type'], slot['price'], slot['available'])
+                        for slot in upserts
+                    ])
+                if removed:
+                    psycopg2.extras.execute_batch(cur, remove_query, [
+                        (pitch_type, date, time) for date, time in removed
+                    ])
+                if price_observations:
+                    psycopg2.extras.execute_batch(cur, price_query, price_observations)
+                if events:
+                    psycopg2.extras.execute_batch(cur, event_query, events)
+                    cur.execute(self.load_sql("prune_slot_events.sql"))
+                cur.execute(log_query, (pitch_type, slot_count, len(added), len(removed), len(changed)))
+                self.conn.commit()
+                return True
+            except Exception as e:
+                self.conn.rollback()
+                st.error(f"An error occurred while updating slot cache: {str(e)}")
+                return False
+
+    def get_slot_price_index(self):
+        """
+        Get the whole slot price index
+
+        Returns:
+            list of tuples: (pitch_type, weekday, hour, sample_count, avg_price,
+                             min_price, max_price, last_price, updated_at)
+        """
+        self.ensure_connection()
+        query = self.load_sql("get_slot_price_index.sql")
+        with self.conn.cursor() as cur:
+            cur.execute(query)
+            rows = cur.fetchall()
+        self.conn.commit()
+        return rows
+
+    def get_slot_events(self, slot_time=None, limit=50):
+        """
+        Get recent slot added/removed events, newest first
+
+        Args:
+            slot_time (str): Only events for this slot time, e.g. '19:00'
+            limit (int): Max events returned
+
+        Returns:
+            list of tuples: (event_type, pitch_type, slot_date, slot_time, price, recorded_at)
+        """
+        self.ensure_connection()
+        query = self.load_sql("get_slot_events.sql")
+        with self.conn.cursor() as cur:
+            cur.execute(query, {'slot_time': slot_time, 'limit': limit})
+            rows = cur.fetchall()
+        self.conn.commit()
+        return rows
+
     def get_available_slots(self, pitch_type=None):
         """Get available slots from cache"""
         query = self.load_sql("get_available_slots.sql")
@@ -209,40 +385,614 @@ class DatabaseHandler:
             rows = cur.fetchall()
         return rows
 
-    def get_bookings_for_month(self, month, year):
-        """Get all bookings for a specific month"""
-        query = self.load_sql("get_bookings_for_month.sql")
+    def try_advisory_lock(self, key):
+        """
+        Try to take a session-level Postgres advisory lock without waiting
+
+        The lock lives as long as this connection, so use a dedicated handler for it.
+
+        Returns:
+            bool: True if this connection now holds the lock
+        """
+        self.ensure_connection()
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT pg_try_advisory_lock(%s)", (key,))
+            acquired = cur.fetchone()[0]
+        self.conn.commit()
+        return acquired
+
+    def holds_advisory_lock(self, key):
+        """Check this connection still holds an advisory lock (False if it reconnected)"""
+        if self.conn.closed:
+            return False
+        query = self.load_sql("check_advisory_lock_held.sql")
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute(query, (key, key))
+                held = cur.fetchone()[0]
+            self.conn.commit()
+            return held
+        except psycopg2.Error:
+            return False
+
+    def release_advisory_lock(self, key):
+        """Release a session-level advisory lock held by this connection"""
+        if self.conn.closed:
+            return
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_unlock(%s)", (key,))
+        self.conn.commit()
+
+    def record_scraper_heartbeat(self, worker_id, hostname, pid, role, details):
+        """Upsert a scraper worker heartbeat with its current status details"""
+        self.ensure_connection()
+        query = self.load_sql("record_scraper_heartbeat.sql")
+        with self.conn.cursor() as cur:
+            try:
+                cur.execute(query, (worker_id, hostname, pid, role,
+                                    psycopg2.extras.Json(details, dumps=lambda d: json.dumps(d, default=str))))
+                self.conn.commit()
+            except Exception as e:
+                self.conn.rollback()
+                print(f"Failed to record scraper heartbeat: {e}")
+
+    def get_scraper_status(self):
+        """
+        Get recently seen scraper workers, leader first
+
+        Returns:
+            list of tuples: (worker_id, hostname, pid, role, started_at, last_heartbeat, details,
+                             heartbeat_age_seconds)
+        """
+        self.ensure_connection()
+        query = self.load_sql("get_scraper_status.sql")
         with self.conn.cursor() as cur:
-            cur.execute(query, (month, year))
+            cur.execute(query)
             rows = cur.fetchall()
         return rows
 
-    def get_monthly_player_costs(self, month, year):
+    def request_scrape(self):
+        """Ask the scraper leader for an immediate scrape"""
+        query = self.load_sql("request_scrape.sql")
+        with self.conn.cursor() as cur:
+            try:
+                cur.execute(query)
+                self.conn.commit()
+            except Exception as e:
+                self.conn.rollback()
+                st.error(f"An error occurred while requesting a scrape: {str(e)}")
+
+    def get_scrape_request(self):
+        """Get the time of the latest scrape request, or None"""
+        self.ensure_connection()
+        query = self.load_sql("get_scrape_request.sql")
+        with self.conn.cursor() as cur:
+            cur.execute(query)
+            row = cur.fetchone()
+        return row[0] if row else None
+
+    def enqueue_booking_job(self, week, trigger, max_attempts=3):
         """
-        Calculate player costs for monthly invoicing
-        Includes guests - guests are expensed to their host player
-        
+        Queue an auto-booking job for a week
+
         Returns:
-            list of tuples: (name, email, sessions_attended, total_cost, weeks_attended, guest_names[])
+            int: job_id (the already pending job if one exists for the week)
+        """
+        self.ensure_connection()
+        query = self.load_sql("enqueue_booking_job.sql")
+        with self.conn.cursor() as cur:
+            try:
+                cur.execute(query, (week, trigger, max_attempts))
+                job_id = cur.fetchone()[0]
+                self.conn.commit()
+                return job_id
+            except Exception as e:
+                self.conn.rollback()
+                st.error(f"An error occurred while queueing booking: {str(e)}")
+                return None
+
+    def claim_booking_job(self):
+        """
+        Claim the next runnable booking job (SKIP LOCKED, safe across workers)
+
+        Returns:
+            tuple: (job_id, week, attempts, max_attempts) or None if the queue is empty
+        """
+        self.ensure_connection()
+        query = self.load_sql("claim_booking_job.sql")
+        with self.conn.cursor() as cur:
+            cur.execute(query)
+            job = cur.fetchone()
+        self.conn.commit()
+        return job
+
+    def finish_booking_job(self, job_id, status, result=None, error=None):
+        """Mark a booking job 'done' or 'failed' with its result"""
+        self.ensure_connection()
+        query = self.load_sql("finish_booking_job.sql")
+        with self.conn.cursor() as cur:
+            cur.execute(query, (status,
+                                psycopg2.extras.Json(result, dumps=lambda d: json.dumps(d, default=str)),
+                                error, job_id))
+        self.conn.commit()
+
+    def retry_booking_job(self, job_id, error, delay_seconds, count_attempt=True):
+        """
+        Re-queue a booking job after a delay
+
+        Args:
+            job_id (int): Job to re-queue
+            error (str): Reason recorded on the job
+            delay_seconds (int): Seconds before it can be claimed again
+            count_attempt (bool): False to give back the attempt this run used
+        """
+        self.ensure_connection()
+        query = self.load_sql("retry_booking_job.sql")
+        with self.conn.cursor() as cur:
+            cur.execute(query, (error, 0 if count_attempt else 1, delay_seconds, job_id))
+        self.conn.commit()
+
+    def requeue_stale_booking_jobs(self, stale_minutes):
+        """Re-queue jobs stuck in 'running' longer than stale_minutes"""
+        self.ensure_connection()
+        query = self.load_sql("requeue_stale_booking_jobs.sql")
+        with self.conn.cursor() as cur:
+            cur.execute(query, (stale_minutes,))
+            count = cur.rowcount
+        self.conn.commit()
+        return count
+
+    def get_booking_job(self, job_id):
+        """
+        Get a booking job by id
+
+        Returns:
+            tuple: (job_id, week, status, trigger, attempts, max_attempts, result,
+                    error, created_at, started_at, finished_at) or None
+        """
+        self.ensure_connection()
+        query = self.load_sql("get_booking_job.sql")
+        with self.conn.cursor() as cur:
+            cur.execute(query, (job_id,))
+            row = cur.fetchone()
+        return row
+
+    def claim_week_booking(self, week, owner, lock_class, stale_minutes=15):
+        """
+        Claim the right to run the auto-booking for a week
+
+        A transaction-level advisory lock on (lock_class, week) serializes
+        concurrent claimers without blocking them; the week_booking_state row
+        then records the in-flight attempt for everyone who loses.
+
+        Returns:
+            tuple: (claimed, state) where state is the week's
+                   (week, status, owner, started_at, finished_at, result) row or None
+        """
+        self.ensure_connection()
+        lock_query = self.load_sql("try_week_booking_lock.sql")
+        claim_query = self.load_sql("claim_week_booking.sql")
+        state_query = self.load_sql("get_week_booking_state.sql")
+        with self.conn.cursor() as cur:
+            try:
+                cur.execute(lock_query, (lock_class, week))
+                if not cur.fetchone()[0]:
+                    # Another session is claiming this week right now
+                    self.conn.rollback()
+                    return False, None
+                cur.execute(claim_query, {'week': week, 'owner': owner, 'stale_minutes': stale_minutes})
+                claimed = cur.fetchone() is not None
+                cur.execute(state_query, (week,))
+                state = cur.fetchone()
+                self.conn.commit()  # Releases the advisory lock
+                return claimed, state
+            except Exception:
+                self.conn.rollback()
+                raise
+
+    def finish_week_booking(self, week, owner, status, result=None):
+        """Record the outcome ('booked' or 'failed') of a claimed week booking"""
+        self.ensure_connection()
+        query = self.load_sql("finish_week_booking.sql")
+        with self.conn.cursor() as cur:
+            try:
+                cur.execute(query, (status,
+                                    psycopg2.extras.Json(result, dumps=lambda d: json.dumps(d, default=str)),
+                                    week, owner))
+                self.conn.commit()
+            except Exception as e:
+                self.conn.rollback()
+                print(f"Failed to record booking state for {week}: {e}")
+
+    def get_week_booking_state(self, week):
+        """
+        Get the auto-booking state row for a week
+
+        Returns:
+            tuple: (week, status, owner, started_at, finished_at, result) or None
+        """
+        self.ensure_connection()
+        query = self.load_sql("get_week_booking_state.sql")
+        with self.conn.cursor() as cur:
+            cur.execute(query, (week,))
+            row = cur.fetchone()
+        self.conn.commit()
+        return row
+
+    def delete_simulated_weeks(self):
+        """Delete signups, bookings, booking state and players left by simulated (SIM-...) runs"""
+        self.ensure_connection()
+        query = self.load_sql("delete_simulated_weeks.sql")
+        with self.conn.cursor() as cur:
+            try:
+                cur.execute(query)
+                self.conn.commit()
+            except Exception as e:
+                self.conn.rollback()
+                st.error(f"An error occurred while cleaning up simulated weeks: {str(e)}")
+
+    def schedule_notification_dispatches(self, reminder_hours, weekly_list_hours, lookahead_days, max_attempts=3):
+        """
+        Queue reminders and weekly lists for upcoming sessions (one query, idempotent)
+
+        Args:
+            reminder_hours (int): Hours before kick-off the game reminder is due
+            weekly_list_hours (int): Hours before kick-off the weekly list is due
+            lookahead_days (int): How far ahead to look for booked sessions
+            max_attempts (int): Send attempts per message
+
+        Returns:
+            int: Number of newly queued messages
+        """
+        self.ensure_connection()
+        query = self.load_sql("schedule_notification_dispatches.sql")
+        with self.conn.cursor() as cur:
+            cur.execute(query, {
+                'reminder_hours': reminder_hours,
+                'weekly_list_hours': weekly_list_hours,
+                'lookahead_days': lookahead_days,
+                'max_attempts': max_attempts
+            })
+            count = cur.rowcount
+        self.conn.commit()
+        return count
+
+    def claim_notification_dispatch(self):
+        """
+        Claim the next due scheduled message (SKIP LOCKED, safe across dispatchers)
+
+        Returns:
+            tuple: (dispatch_id, kind, week, session_date, booking_time, pitch_type,
+                    attempts, max_attempts) or None if nothing is due
+        """
+        self.ensure_connection()
+        query = self.load_sql("claim_notification_dispatch.sql")
+        with self.conn.cursor() as cur:
+            cur.execute(query)
+            dispatch = cur.fetchone()
+        self.conn.commit()
+        return dispatch
+
+    def finish_notification_dispatch(self, dispatch_id, status, error=None):
+        """Mark a scheduled message 'sent' or 'failed'"""
+        self.ensure_connection()
+        query = self.load_sql("finish_notification_dispatch.sql")
+        with self.conn.cursor() as cur:
+            cur.execute(query, {'status': status, 'error': error, 'dispatch_id': dispatch_id})
+        self.conn.commit()
+
+    def retry_notification_dispatch(self, dispatch_id, error, delay_seconds):
+        """Re-queue a scheduled message after a failed send"""
+        self.ensure_connection()
+        query = self.load_sql("retry_notification_dispatch.sql")
+        with self.conn.cursor() as cur:
+            cur.execute(query, (error, delay_seconds, dispatch_id))
+        self.conn.commit()
+
+    def expire_notification_dispatches(self, stale_minutes):
+        """
+        Expire queued messages whose session has started, and fail ones stuck mid-send
+
+        Returns:
+            tuple: (expired, interrupted) row counts
+        """
+        self.ensure_connection()
+        expire_query = self.load_sql("expire_notification_dispatches.sql")
+        stale_query = self.load_sql("fail_stale_notification_dispatches.sql")
+        with self.conn.cursor() as cur:
+            cur.execute(expire_query)
+            expired = cur.rowcount
+            cur.execute(stale_query, (stale_minutes,))
+            interrupted = cur.rowcount
+        self.conn.commit()
+        return expired, interrupted
+
+    def get_notification_dispatches(self, limit=20):
+        """
+        Get recent and upcoming scheduled messages
+
+        Returns:
+            list: (kind, week, session_date, booking_time, status, attempts, due_at, sent_at, error) rows
+        """
+        self.ensure_connection()
+        query = self.load_sql("get_notification_dispatches.sql")
+        with self.conn.cursor() as cur:
+            cur.execute(query, (limit,))
+            rows = cur.fetchall()
+        self.conn.commit()
+        return rows
+
+    def get_player_phones(self):
+        """
+        WhatsApp numbers on file
+
+        Returns:
+            dict: email -> phone
+        """
+        self.ensure_connection()
+        query = self.load_sql("get_player_phones.sql")
+        with self.conn.cursor() as cur:
+            cur.execute(query)
+            rows = cur.fetchall()
+        self.conn.commit()
+        return dict(rows)
+
+    def set_player_phone(self, email, phone):
+        """Set a player's WhatsApp number (None clears it)"""
+        self.ensure_connection()
+        query = self.load_sql("set_player_phone.sql")
+        with self.conn.cursor() as cur:
+            try:
+                cur.execute(query, (phone or None, email))
+                self.conn.commit()
+                return cur.rowcount > 0
+            except Exception as e:
+                self.conn.rollback()
+                st.error(f"An error occurred while saving the phone number: {str(e)}")
+                return False
+
+    def enqueue_invoice_deliveries(self, deliveries):
+        """
+        Add rendered invoice messages to the delivery ledger in one batch
+
+        Args:
+            deliveries (list): Dicts with period, email_id, name, phone, amount,
+                               message, status ('queued' or 'skipped'), max_attempts, error
+        """
+        self.ensure_connection()
+        query = self.load_sql("enqueue_invoice_delivery.sql")
+        with self.conn.cursor() as cur:
+            try:
+                psycopg2.extras.execute_batch(cur, query, deliveries)
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+
+    def claim_invoice_deliveries(self, limit):
+        """
+        Claim up to `limit` due invoice messages (SKIP LOCKED, safe across senders)
+
+        Returns:
+            list: (delivery_id, period, name, phone, message, attempts, max_attempts) rows
         """
-        # Try new query with guest support first
+        self.ensure_connection()
+        query = self.load_sql("claim_invoice_deliveries.sql")
+        with self.conn.cursor() as cur:
+            cur.execute(query, (limit,))
+            rows = cur.fetchall()
+        self.conn.commit()
+        return rows
+
+    def finish_invoice_delivery(self, delivery_id, status, error=None):
+        """Mark an invoice message 'sent' or 'failed'"""
+        self.ensure_connection()
+        query = self.load_sql("finish_invoice_delivery.sql")
+        with self.conn.cursor() as cur:
+            cur.execute(query, {'status': status, 'error': error, 'delivery_id': delivery_id})
+        self.conn.commit()
+
+    def retry_invoice_delivery(self, delivery_id, error, delay_seconds):
+        """Re-queue an invoice message after a failed send"""
+        self.ensure_connection()
+        query = self.load_sql("retry_invoice_delivery.sql")
+        with self.conn.cursor() as cur:
+            cur.execute(query, (error, delay_seconds, delivery_id))
+        self.conn.commit()
+
+    def fail_stale_invoice_deliveries(self, stale_minutes):
+        """Fail invoice messages stuck mid-send (they may have gone out)"""
+        self.ensure_connection()
+        query = self.load_sql("fail_stale_invoice_deliveries.sql")
+        with self.conn.cursor() as cur:
+            cur.execute(query, (stale_minutes,))
+            count = cur.rowcount
+        self.conn.commit()
+        return count
+
+    def requeue_failed_invoice_deliveries(self, period):
+        """Retry a period's failed invoice messages"""
+        self.ensure_connection()
+        query = self.load_sql("requeue_failed_invoice_deliveries.sql")
+        with self.conn.cursor() as cur:
+            cur.execute(query, (period,))
+            count = cur.rowcount
+        self.conn.commit()
+        return count
+
+    def get_invoice_delivery_summary(self, period):
+        """
+        Fan-out progress for a period
+
+        Returns:
+            dict: status -> (count, last_activity)
+        """
+        self.ensure_connection()
+        query = self.load_sql("get_invoice_delivery_summary.sql")
+        with self.conn.cursor() as cur:
+            cur.execute(query, (period,))
+            rows = cur.fetchall()
+        self.conn.commit()
+        return {status: (count, last_activity) for status, count, last_activity in rows}
+
+    def get_invoice_snapshot(self, period, format):
+        """
+        Get a stored invoice snapshot
+
+        Returns:
+            tuple: (content_hash, report, report_text, report_csv, source_version,
+                    closed, created_at, current_version) or None
+        """
+        self.ensure_connection()
+        query = self.load_sql("get_invoice_snapshot.sql")
+        with self.conn.cursor() as cur:
+            cur.execute(query, (period, format))
+            row = cur.fetchone()
+        self.conn.commit()
+        return row
+
+    def get_invoice_month_version(self, period):
+        """Current source version of a month's invoice"""
+        self.ensure_connection()
+        query = self.load_sql("get_invoice_month_version.sql")
+        with self.conn.cursor() as cur:
+            cur.execute(query, (period,))
+            version = cur.fetchone()[0]
+        self.conn.commit()
+        return version
+
+    def save_invoice_snapshot(self, period, format, content_hash, report, report_text, report_csv,
+                              source_version, closed):
+        """Store an invoice snapshot (closed months keep their first snapshot)"""
+        self.ensure_connection()
+        query = self.load_sql("save_invoice_snapshot.sql")
+        with self.conn.cursor() as cur:
+            try:
+                cur.execute(query, {
+                    'period': period,
+                    'format': format,
+                    'content_hash': content_hash,
+                    'report': psycopg2.extras.Json(report),
+                    'report_text': report_text,
+                    'report_csv': report_csv,
+                    'source_version': source_version,
+                    'closed': closed
+                })
+                self.conn.commit()
+            except Exception as e:
+                self.conn.rollback()
+                print(f"Failed to store invoice snapshot for {period}: {e}")
+
+    def close_invoice_snapshot(self, period, format, source_version):
+        """
+        Mark an open snapshot closed once its month has closed
+
+        Returns:
+            bool: True if the snapshot was frozen (it was still at source_version)
+        """
+        self.ensure_connection()
+        query = self.load_sql("close_invoice_snapshot.sql")
+        with self.conn.cursor() as cur:
+            try:
+                cur.execute(query, {'period': period, 'format': format, 'source_version': source_version})
+                frozen = cur.rowcount == 1
+                self.conn.commit()
+                return frozen
+            except Exception as e:
+                self.conn.rollback()
+                print(f"Failed to close invoice snapshot for {period}: {e}")
+                return False
+
+    def stream_query(self, file_name, params=None, chunk_size=5000):
+        """
+        Run a query through a server-side cursor and yield its rows in chunks
+
+        Only chunk_size rows are held in memory at a time, whatever the result size.
+        The cursor runs on its own read-only connection, closed when the stream ends,
+        so commits and rollbacks on the shared connection can't invalidate it and a
+        failed export leaves the shared connection untouched.
+
+        Args:
+            file_name (str): SQL file in src/sql
+            params (dict|tuple): Query parameters
+            chunk_size (int): Rows fetched per round trip
+
+        Yields:
+            tuple: (column_names, rows) per chunk
+        """
+        query = self.load_sql(file_name)
+        conn = self.init_connection()
         try:
-            query = self.load_sql("get_monthly_player_costs_with_guests.sql")
-            with self.conn.cursor() as cur:
-                cur.execute(query, (month, year))
+            conn.set_session(readonly=True)
+            with conn.cursor(name=f"stream_{file_name.split('.')[0]}") as cur:
+                cur.itersize = chunk_size
+                cur.execute(query, params)
+                columns = None
+                while True:
+                    rows = cur.fetchmany(chunk_size)
+                    if columns is None:
+                        # Column names are known after the first fetch; an empty result still yields them once
+                        columns = [column[0] for column in cur.description]
+                        if not rows:
+                            yield columns, rows
+                    if not rows:
+                        break
+                    yield columns, rows
+        finally:
+            # Also runs when the consumer stops early or raises; closing ends the transaction
+            conn.close()
+
+    def get_bookings_for_month(self, month, year):
+        """Get all bookings for a specific month (the range query over one month)"""
+        start_date = date(year, month, 1)
+        return self.get_bookings_for_range(start_date, (start_date + timedelta(days=32)).replace(day=1))
+
+    def get_bookings_for_range(self, start_date, end_date):
+        """
+        Get all bookings with a session in [start_date, end_date)
+
+        Returns:
+            list of tuples: (booking_id, week, session_date, booking_time, pitch_type, booking_amount,
+                             cost_per_player, number_of_players, auto_booked, booking_confirmation, status)
+        """
+        self.ensure_connection()
+        query = self.load_sql("get_bookings_for_range.sql")
+        with self.conn.cursor() as cur:
+            cur.execute(query, {'start_date': start_date, 'end_date': end_date})
+            rows = cur.fetchall()
+        self.conn.commit()
+        return rows
+
+    def get_player_costs_for_range(self, start_date, end_date):
+        """
+        Player costs for every month in [start_date, end_date), guests expensed to their host
+
+        Returns:
+            list of tuples: (period, name, email, sessions_attended, total_cost,
+                             weeks_attended, guest_names[]) ordered by period and name
+        """
+        self.ensure_connection()
+        query = self.load_sql("get_player_costs_for_range.sql")
+        with self.conn.cursor() as cur:
+            try:
+                cur.execute(query, {'start_date': start_date, 'end_date': end_date})
                 rows = cur.fetchall()
-            return rows
-        except Exception as e:
-            # Fallback to old query if column doesn't exist yet
-            if "brought_by_player_id" in str(e) or "column" in str(e).lower():
-                query = self.load_sql("get_monthly_player_costs.sql")
-                with self.conn.cursor() as cur:
-                    cur.execute(query, (month, year))
-                    rows = cur.fetchall()
-                # Add empty guest list for backward compatibility
-                return [(row[0], row[1], row[2], row[3], row[4], []) for row in rows]
-            else:
+            except Exception:
+                self.conn.rollback()  # Don't leave the shared connection in an aborted transaction
                 raise
+        self.conn.commit()
+        return rows
+
+    def get_player_costs_for_month(self, month, year):
+        """
+        Player costs for one month, guests expensed to their host (the range query over one month)
+
+        Returns:
+            list of tuples: (name, email, sessions_attended, total_cost, weeks_attended, guest_names[])
+        """
+        start_date = date(year, month, 1)
+        end_date = (start_date + timedelta(days=32)).replace(day=1)
+        return [row[1:] for row in self.get_player_costs_for_range(start_date, end_date)]
 
     def close_connection(self):
         if self.conn:
@@ -0,0 +1,162 @@
+"""
+Streaming exports - booking history and invoice lines to CSV or Parquet
+
+Rows come from a server-side cursor on a dedicated connection (see
+DatabaseHandler.stream_query) in chunks and are written out chunk by
+chunk (a CSV block or a Parquet row group at a time), so memory stays flat
+however much history there is.
+"""
+
+import csv
+import io
+import tempfile
+from datetime import date
+
+# Lazy import pyarrow so CSV exports work without it
+_pyarrow = None
+
+
+def _get_pyarrow():
+    """Lazy import pyarrow only when a Parquet export is requested"""
+    global _pyarrow
+    if _pyarrow is None:
+        try:
+            import pyarrow
+            import pyarrow.parquet
+            _pyarrow = pyarrow
+        except Exception as e:
+            print(f"Parquet export disabled: {str(e)}")
+            _pyarrow = False  # Mark as unavailable
+    return _pyarrow if _pyarrow is not False else None
+
+
+# Export name -> (SQL file, [(column, Arrow type alias)])
+EXPORTS = {
+    'booking_history': ('export_booking_history.sql', [
+        ('booking_id', 'int64'),
+        ('week', 'string'),
+        ('session_date', 'date32'),
+        ('booking_time', 'time64[us]'),
+        ('pitch_type', 'string'),
+        ('booking_amount', 'double'),
+        ('cost_per_player', 'double'),
+        ('number_of_players', 'int32'),
+        ('auto_booked', 'bool'),
+        ('booking_confirmation', 'string'),
+        ('status', 'string')
+    ]),
+    'invoice_lines': ('export_invoice_lines.sql', [
+        ('period', 'string'),
+        ('session_date', 'date32'),
+        ('week', 'string'),
+        ('billed_to', 'string'),
+        ('billed_email', 'string'),
+        ('player', 'string'),
+        ('is_guest', 'bool'),
+        ('booking_id', 'int64'),
+        ('booking_confirmation', 'string'),
+        ('pitch_type', 'string'),
+        ('cost_per_player', 'double')
+    ])
+}
+
+
+def parquet_available():
+    """Whether Parquet exports can be written (pyarrow installed)"""
+    return _get_pyarrow() is not None
+
+
+def write_csv(db, export_name, file, params=None, chunk_size=5000):
+    """
+    Stream an export to CSV
+
+    Args:
+        db: DatabaseHandler instance
+        export_name (str): Key of EXPORTS
+        file: Text file object to write to
+        params (dict): Query parameters (e.g. start_date/end_date for invoice_lines)
+        chunk_size (int): Rows per round trip
+
+    Returns:
+        int: Rows written
+    """
+    sql_file, _ = EXPORTS[export_name]
+    writer = csv.writer(file)
+    written = 0
+    header_written = False
+    for columns, rows in db.stream_query(sql_file, params, chunk_size=chunk_size):
+        if not header_written:
+            writer.writerow(columns)
+            header_written = True
+        writer.writerows(rows)
+        written += len(rows)
+    return written
+
+
+def write_parquet(db, export_name, file, params=None, chunk_size=5000):
+    """
+    Stream an export to Parquet, one row group per chunk
+
+    Args:
+        db: DatabaseHandler instance
+        export_name (str): Key of EXPORTS
+        file: Binary file object or path to write to
+        params (dict): Query parameters
+        chunk_size (int): Rows per round trip (and per row group)
+
+    Returns:
+        int: Rows written
+    """
+    pa = _get_pyarrow()
+    if pa is None:
+        raise RuntimeError("Parquet export needs pyarrow")
+
+    sql_file, columns = EXPORTS[export_name]
+    schema = pa.schema([(name, pa.type_for_alias(alias)) for name, alias in columns])
+    written = 0
+    with pa.parquet.ParquetWriter(file, schema) as writer:
+        for _, rows in db.stream_query(sql_file, params, chunk_size=chunk_size):
+            if not rows:
+                break
+            # Column-wise from the row tuples, typed by the schema
+            arrays = [pa.array([row[i] for row in rows], type=field.type) for i, field in enumerate(schema)]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            written += len(rows)
+    return written
+
+
+def export_to_file(db, export_name, fmt='csv', params=None, chunk_size=5000, spool_bytes=8 * 1024 * 1024):
+    """
+    Write an export to a temporary file, ready to hand to st.download_button
+
+    Small exports stay in memory; larger ones roll over to disk.
+
+    Args:
+        db: DatabaseHandler instance
+        export_name (str): Key of EXPORTS
+        fmt (str): 'csv' or 'parquet'
+        params (dict): Query parameters
+        chunk_size (int): Rows per round trip
+        spool_bytes (int): Size kept in memory before spilling to disk
+
+    Returns:
+        tuple: (binary file object rewound to the start, rows written)
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=spool_bytes)
+    if fmt == 'parquet':
+        written = write_parquet(db, export_name, spool, params, chunk_size)
+    else:
+        text = io.TextIOWrapper(spool, encoding='utf-8', newline='')
+        written = write_csv(db, export_name, text, params, chunk_size)
+        text.flush()
+        text.detach()  # Keep the spool open after the wrapper goes away
+    spool.seek(0)
+    return spool, written
+
+
+def export_file_name(export_name, fmt, params=None):
+    """Download file name, e.g. booking_history_20261018.csv or invoice_lines_2026-01_2026-12.parquet"""
+    if params and 'start_date' in params:
+        start, end = params['start_date'], params['end_date']
+        return f"{export_name}_{start:%Y-%m}_{date.fromordinal(end.toordinal() - 1):%Y-%m}.{fmt}"
+    return f"{export_name}_{date.today():%Y%m%d}.{fmt}"
@@ -1,5 +1,6 @@
 import streamlit as st
 import re
+from datetime import datetime, timedelta
 
 def validate_name_email(string, type):
     """
@@ -50,8 +51,21 @@ def check_if_empty(string):
         return False
 
 
+def get_current_week(date=None):
+    """ISO week identifier used for signups, e.g. '2026-W05'"""
+    date = date or datetime.now()
+    year, week_num, _ = date.isocalendar()
+    return f"{year}-W{week_num:02d}"
 
 
+def get_next_week_range(today=None):
+    """Monday and Sunday of the week after today (the week bookings target)"""
+    today = today or datetime.now().date()
+    week_start = today + timedelta(days=(7 - today.weekday()))
+    return week_start, week_start + timedelta(days=6)
 
 
-
+def get_week_range(start_week, n_weeks):
+    """Consecutive ISO week identifiers starting at start_week, e.g. ['2026-W52', '2027-W01']"""
+    monday = datetime.strptime(f"{start_week}-1", "%G-W%V-%u")
+    return [get_current_week(monday + timedelta(weeks=i)) for i in range(n_weeks)]
@@ -0,0 +1,226 @@
+"""
+Per-player invoice documents - one HTML invoice per player, written to a zip archive
+
+Invoices are rendered from the monthly report (see invoice_generator) in a
+process pool. The template and stylesheet are read once in the parent and
+compiled once per worker, together with the month's session table, so each
+task only carries one player's row. Documents are self-contained HTML ready to
+print or save as PDF from a browser.
+"""
+
+import html
+import multiprocessing
+import os
+import re
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from string import Template
+
+TEMPLATE_DIR = os.path.join("src", "templates")
+
+# Below this many invoices, starting worker processes costs more than it saves
+POOL_MIN_INVOICES = 500
+
+# Per-process render state, set once by _init_worker
+_worker_state = None
+
+
+def load_assets(template_dir=TEMPLATE_DIR):
+    """
+    Read the invoice template and stylesheet
+
+    Args:
+        template_dir (str): Directory holding invoice.html and invoice.css
+
+    Returns:
+        dict: template and css text
+    """
+    assets = {}
+    for key, file_name in (('template', 'invoice.html'), ('css', 'invoice.css')):
+        with open(os.path.join(template_dir, file_name), 'r', encoding='utf-8') as file:
+            assets[key] = file.read()
+    return assets
+
+
+def _init_worker(assets, context):
+    """Compile the template (stylesheet inlined) and keep the month's context for this process"""
+    global _worker_state
+    template = Template(Template(assets['template']).safe_substitute(css=assets['css']))
+    _worker_state = {'template': template, **context}
+
+
+def _format_pitch_type(pitch_type):
+    """'third_pitch' -> 'Third Pitch'"""
+    return str(pitch_type or '').replace('_', ' ').title()
+
+
+def _file_name(invoice_number, name):
+    """Archive member name, e.g. 2026-09-0007_jane_smith.html"""
+    slug = re.sub(r'[^a-z0-9]+', '_', str(name).lower()).strip('_') or 'player'
+    return f"{invoice_number}_{slug}.html"
+
+
+def _render_invoice(player):
+    """
+    Render one player's invoice in a worker (after _init_worker)
+
+    Args:
+        player (tuple): (invoice_number, name, email, sessions_attended, total_cost,
+                         weeks_attended, guest_names)
+
+    Returns:
+        tuple: (archive member name, UTF-8 encoded HTML)
+    """
+    invoice_number, name, email, sessions_attended, total_cost, weeks_attended, guest_names = player
+    state = _worker_state
+
+    session_rows = [
+        f"<tr><td>{session_date}</td><td>{html.escape(week)}</td><td>{session_time}</td>"
+        f"<td>{html.escape(pitch)}</td><td class=\"amount\">£{cost_per_player:.2f}</td></tr>"
+        for week in weeks_attended
+        for session_date, session_time, pitch, cost_per_player in state['sessions_by_week'].get(week, ())
+    ]
+    guest_line = (f"<p>Guests: {html.escape(', '.join(guest_names))}</p>" if guest_names else "")
+
+    document = state['template'].substitute(
+        period_label=state['period_label'],
+        generated_at=state['generated_at'],
+        invoice_number=invoice_number,
+        name=html.escape(name),
+        email=html.escape(email),
+        session_rows="\n".join(session_rows),
+        guest_line=guest_line,
+        sessions_attended=sessions_attended,
+        total_cost=f"{total_cost:.2f}"
+    )
+    return _file_name(invoice_number, name), document.encode('utf-8')
+
+
+def _amount(value):
+    """Float amount, NULL/NaN as 0.0"""
+    return 0.0 if value is None or value != value else float(value)
+
+
+def _text(value):
+    """Display text, NULL as blank"""
+    return '' if value is None or value != value else str(value)
+
+
+def invoice_payloads(report):
+    """
+    Split a monthly report into the shared month context and one task per player
+
+    Args:
+        report (dict): build_invoice_report output
+
+    Returns:
+        tuple: (context dict, list of player tuples for _render_invoice)
+    """
+    bookings = report['bookings']
+    active = bookings[bookings['status'] != 'cancelled'].sort_values(['date', 'time'])
+    sessions_by_week = {}
+    for week, session_date, session_time, pitch_type, cost_per_player in zip(
+            active['week'], active['date'], active['time'], active['pitch_type'], active['cost_per_player']):
+        sessions_by_week.setdefault(week, []).append((
+            str(session_date),
+            str(session_time)[:5] if session_time is not None else 'TBC',
+            _format_pitch_type(pitch_type),
+            _amount(cost_per_player)
+        ))
+
+    context = {
+        'period_label': f"{report['month_name']} {report['year']}",
+        'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M'),
+        'sessions_by_week': sessions_by_week
+    }
+
+    period = f"{report['year']}-{report['month']:02d}"
+    players = report['players'].sort_values('name', kind='stable')
+    payloads = [
+        (f"{period}-{number:04d}", _text(name), _text(email), int(sessions_attended), _amount(total_cost),
+         tuple(weeks_attended), tuple(guest_names))
+        for number, (name, email, sessions_attended, total_cost, weeks_attended, guest_names) in enumerate(zip(
+            players['name'], players['email'], players['sessions_attended'], players['total_cost'],
+            players['weeks_attended'], players['guest_names']), start=1)
+    ]
+    return context, payloads
+
+
+def render_invoice_archive(report, file, workers=None, assets=None):
+    """
+    Render every player's invoice into a zip archive
+
+    Args:
+        report (dict): build_invoice_report output
+        file: Binary file object or path to write the zip to
+        workers (int): Render processes (defaults to invoice.render_workers, or in this
+                       process for small months; 1 always renders in this process)
+        assets (dict): load_assets output (read from TEMPLATE_DIR if None)
+
+    Returns:
+        dict: invoices, workers, seconds, invoices_per_second and archive_bytes
+    """
+    from config import get_invoice_config  # Not at module level: spawned workers import this module
+
+    started = time.perf_counter()
+    assets = assets or load_assets()
+    context, payloads = invoice_payloads(report)
+    if workers is None and len(payloads) < POOL_MIN_INVOICES:
+        workers = 1
+    workers = workers or get_invoice_config()['render_workers'] or os.cpu_count() or 1
+    workers = max(1, min(workers, len(payloads)))
+
+    with zipfile.ZipFile(file, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        if workers == 1:
+            _init_worker(assets, context)
+            for member_name, document in map(_render_invoice, payloads):
+                archive.writestr(member_name, document)
+        else:
+            # Spawned rather than forked: the Streamlit server has threads running
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=_init_worker, initargs=(assets, context)) as executor:
+                chunksize = max(1, len(payloads) // (workers * 4))
+                for member_name, document in executor.map(_render_invoice, payloads, chunksize=chunksize):
+                    archive.writestr(member_name, document)
+
+    elapsed = time.perf_counter() - started
+    archive_bytes = file.tell() if hasattr(file, 'tell') else os.path.getsize(file)
+    return {
+        'invoices': len(payloads),
+        'workers': workers,
+        'seconds': round(elapsed, 3),
+        'invoices_per_second': round(len(payloads) / elapsed, 1) if elapsed else None,
+        'archive_bytes': archive_bytes
+    }
+
+
+def benchmark_invoice_documents(sizes=(200, 2000, 10000), workers=(1, None)):
+    """
+    Measure invoice rendering throughput on synthetic months (no database)
+
+    Args:
+        sizes (tuple): Players per month
+        workers (tuple): Pool sizes to compare (None = automatic, as in the app)
+
+    Returns:
+        list: One render_invoice_archive result per size and pool size
+    """
+    import io
+    from invoice_generator import _synthetic_invoice_rows, build_invoice_report
+
+    assets = load_assets()
+    results = []
+    for n_players in sizes:
+        player_rows, booking_rows = _synthetic_invoice_rows(n_players, 20)
+        report = build_invoice_report(9, 2026, player_rows, booking_rows)
+        for pool_size in workers:
+            results.append(dict({'players': n_players},
+                                **render_invoice_archive(report, io.BytesIO(), workers=pool_size, assets=assets)))
+    return results
+
+
+if __name__ == '__main__':
+    for result in benchmark_invoice_documents():
+        print(result)
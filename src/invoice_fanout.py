@@ -0,0 +1,281 @@
+"""
+Per-player invoice fan-out - one WhatsApp direct message per player, sent in parallel
+
+Messages are rendered in bulk from get_player_costs_for_month into the
+invoice_deliveries ledger (one row per period and player), then sent by the
+notification worker through a small thread pool behind a shared rate limit.
+Every outcome is written back to the ledger, so a run that stops part-way
+picks up with the players who have not been sent yet.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from threading import Lock
+from config import get_whatsapp_config
+from notification_transports import CaptureTransport
+
+
+class RateLimiter:
+    """Spaces calls evenly so at most per_minute start in any minute (thread-safe)"""
+
+    def __init__(self, per_minute):
+        """
+        Initialize the limiter
+
+        Args:
+            per_minute (int): Calls allowed per minute (0 or None for no limit)
+        """
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self._next_slot = time.monotonic()
+        self._lock = Lock()
+
+    def acquire(self):
+        """Block until the caller may go"""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+def period_key(month, year):
+    """Ledger period for a month, e.g. '2026-09'"""
+    return f"{year}-{month:02d}"
+
+
+def build_player_invoice(month_name, year, name, sessions_attended, total_cost, weeks_attended=None, guests=None):
+    """
+    Render one player's invoice message
+
+    Args:
+        month_name (str): e.g. 'September'
+        year (int): Year
+        name (str): Player name
+        sessions_attended (int): Sessions played (including guests brought)
+        total_cost (float): Amount due
+        weeks_attended (list): Week identifiers
+        guests (list): Guest names billed to this player
+
+    Returns:
+        str: Message text
+    """
+    lines = [
+        f"💰 {month_name} {year} - Football Invoice",
+        "",
+        f"Hi {name},",
+        f"Sessions: {sessions_attended}"
+    ]
+    if weeks_attended:
+        lines.append(f"Weeks: {', '.join(weeks_attended)}")
+    guest_names = [guest for guest in (guests or []) if guest]
+    if guest_names:
+        lines.append(f"Guests: {', '.join(guest_names)}")
+    lines += [f"Amount due: £{float(total_cost):.2f}", "", "Thanks! ⚽"]
+    return "\n".join(lines)
+
+
+class InvoiceFanout:
+    """Renders per-player invoice messages into the delivery ledger and sends them"""
+
+    def __init__(self, db, notifier=None, workers=None, per_minute=None, max_attempts=None):
+        """
+        Initialize the fan-out
+
+        Args:
+            db: DatabaseHandler instance
+            notifier: WhatsAppNotifier to send with (created on first send if None)
+            workers (int): Parallel senders (capped by the transport's max_concurrency)
+            per_minute (int): Overall send rate limit
+            max_attempts (int): Send attempts per player
+        """
+        whatsapp_config = get_whatsapp_config()
+        self.db = db
+        self.notifier = notifier
+        self.workers = workers or whatsapp_config['dm_workers']
+        self.max_attempts = max_attempts or whatsapp_config['dm_max_attempts']
+        self.stale_minutes = whatsapp_config['dispatch_stale_minutes']
+        self.rate_limiter = RateLimiter(per_minute if per_minute is not None else whatsapp_config['dm_per_minute'])
+        self.executor = None
+
+    def render_messages(self, month, year):
+        """
+        Render every player's message for a month
+
+        Returns:
+            list: Ledger rows for enqueue_invoice_deliveries
+        """
+        period = period_key(month, year)
+        month_name = datetime(year, month, 1).strftime('%B')
+        phones = self.db.get_player_phones()
+
+        deliveries = []
+        for name, email, sessions_attended, total_cost, weeks_attended, guests in self.db.get_player_costs_for_month(month, year):
+            phone = phones.get(email)
+            deliveries.append({
+                'period': period,
+                'email_id': email,
+                'name': name,
+                'phone': phone,
+                'amount': float(total_cost),
+                'message': build_player_invoice(month_name, year, name, sessions_attended, total_cost,
+                                                weeks_attended, guests),
+                'status': 'queued' if phone else 'skipped',
+                'max_attempts': self.max_attempts,
+                'error': None if phone else 'No WhatsApp number on file'
+            })
+        return deliveries
+
+    def enqueue(self, month, year):
+        """
+        Add a month's messages to the ledger (players already sent to are left alone)
+
+        Returns:
+            dict: recipients, with_phone and without_phone counts
+        """
+        deliveries = self.render_messages(month, year)
+        if deliveries:
+            self.db.enqueue_invoice_deliveries(deliveries)
+        with_phone = sum(1 for delivery in deliveries if delivery['phone'])
+        return {
+            'recipients': len(deliveries),
+            'with_phone': with_phone,
+            'without_phone': len(deliveries) - with_phone
+        }
+
+    @property
+    def pool_size(self):
+        """Senders actually used - a browser-driven transport only takes one at a time"""
+        max_concurrency = self._get_notifier().transport.max_concurrency
+        return max(1, min(self.workers, max_concurrency or self.workers))
+
+    def _get_notifier(self):
+        if self.notifier is None:
+            from whatsapp import WhatsAppNotifier
+            self.notifier = WhatsAppNotifier(self.db)
+        return self.notifier
+
+    def _send_one(self, phone, message):
+        """Send one message; returns None on success, else the error text"""
+        self.rate_limiter.acquire()
+        try:
+            if self._get_notifier().send_message(message, recipient=phone):
+                return None
+            return 'Transport did not deliver the message'
+        except Exception as e:
+            return str(e)
+
+    def send_batch(self, batch):
+        """
+        Send messages through the worker pool
+
+        Args:
+            batch (list): (delivery_id, phone, message) tuples
+
+        Yields:
+            tuple: (delivery_id, error) as each send finishes; error is None on success
+        """
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix='invoice-dm')
+        futures = {self.executor.submit(self._send_one, phone, message): delivery_id
+                   for delivery_id, phone, message in batch}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+    def drain(self, stop_event=None):
+        """
+        Send every due message in the ledger, a pool-sized batch at a time
+
+        Outcomes are recorded from this thread as sends finish, so at most one
+        batch is left in doubt if the process dies.
+
+        Args:
+            stop_event (Event): Stop between batches once set
+
+        Returns:
+            dict: sent, retrying and failed counts
+        """
+        self.db.fail_stale_invoice_deliveries(self.stale_minutes)
+        counts = {'sent': 0, 'retrying': 0, 'failed': 0}
+        while not (stop_event and stop_event.is_set()):
+            batch = self.db.claim_invoice_deliveries(self.pool_size)
+            if not batch:
+                break
+            attempts_by_id = {row[0]: (row[5], row[6]) for row in batch}
+            for delivery_id, error in self.send_batch([(row[0], row[3], row[4]) for row in batch]):
+                attempts, max_attempts = attempts_by_id[delivery_id]
+                if error is None:
+                    self.db.finish_invoice_delivery(delivery_id, 'sent')
+                    counts['sent'] += 1
+                elif attempts < max_attempts:
+                    self.db.retry_invoice_delivery(delivery_id, error, 30 * (2 ** (attempts - 1)))
+                    counts['retrying'] += 1
+                else:
+                    self.db.finish_invoice_delivery(delivery_id, 'failed', error=error)
+                    counts['failed'] += 1
+        return counts
+
+    def close(self):
+        """Stop the worker pool"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+
+class _LatencyCaptureTransport(CaptureTransport):
+    """Capture sink that takes a fixed time per send, like a real gateway"""
+
+    def __init__(self, latency_seconds):
+        super().__init__()
+        self.latency_seconds = latency_seconds
+
+    def send(self, recipient, message):
+        time.sleep(self.latency_seconds)
+        return super().send(recipient, message)
+
+
+def benchmark_fanout(n_players=60, send_seconds=0.2, workers=4, per_minute=0):
+    """
+    Time the render + pooled send path against a simulated gateway (no database)
+
+    Args:
+        n_players (int): Players in the month
+        send_seconds (float): Simulated latency per send
+        workers (int): Parallel senders
+        per_minute (int): Rate limit (0 for none)
+
+    Returns:
+        dict: Render and send timings, and the serial time the pool saves
+    """
+    from whatsapp import WhatsAppNotifier
+
+    notifier = WhatsAppNotifier(db=None, transport=_LatencyCaptureTransport(send_seconds))
+    fanout = InvoiceFanout(db=None, notifier=notifier, workers=workers, per_minute=per_minute, max_attempts=1)
+
+    started = time.perf_counter()
+    batch = [
+        (i, f"+4477009{i:05d}", build_player_invoice('September', 2026, f"Player {i}", 4, 15.72,
+                                                    ['2026-W36', '2026-W37', '2026-W38', '2026-W39']))
+        for i in range(n_players)
+    ]
+    render_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    failures = sum(1 for _, error in fanout.send_batch(batch) if error)
+    send_seconds_total = time.perf_counter() - started
+    fanout.close()
+
+    return {
+        'players': n_players,
+        'workers': fanout.workers,
+        'failures': failures,
+        'render_seconds': round(render_seconds, 4),
+        'send_seconds': round(send_seconds_total, 2),
+        'serial_send_seconds': round(n_players * send_seconds, 2),
+        'messages_per_minute': round(n_players / send_seconds_total * 60, 1) if send_seconds_total else None
+    }
+
+
+if __name__ == '__main__':
+    print(benchmark_fanout())
@@ -2,12 +2,227 @@
 Invoice generator for end-of-month billing
 """
 
+import hashlib
+import io
+import json
+import random
+import time
 import pandas as pd
-from datetime import datetime
+from datetime import date, datetime, timedelta
+from config import get_invoice_config
+from invoice_documents import render_invoice_archive
+from price_index import SlotPriceIndex
 from whatsapp import WhatsAppNotifier
 import streamlit as st
 
 
+# Column names for get_player_costs_for_month and get_bookings_for_month rows
+PLAYER_COLUMNS = ['name', 'email', 'sessions_attended', 'total_cost', 'weeks_attended', 'guests']
+BOOKING_COLUMNS = ['booking_id', 'week', 'date', 'time', 'pitch_type', 'amount', 'cost_per_player',
+                   'num_players', 'auto_booked', 'confirmation', 'status']
+
+
+def _type_player_frame(players):
+    """Cast the report's player columns to their dtypes"""
+    return players.astype({'sessions_attended': 'int64', 'total_cost': 'float64', 'guest_count': 'int64'})
+
+
+def _type_booking_frame(bookings):
+    """Cast the report's booking columns to their dtypes"""
+    bookings = bookings.astype({'amount': 'float64', 'cost_per_player': 'float64', 'num_players': 'Int64'})
+    bookings['cost_per_player'] = bookings['cost_per_player'].fillna(0.0)
+    return bookings
+
+
+def month_is_closed(month, year, close_after_days):
+    """Whether a month ended more than close_after_days ago"""
+    next_month = (date(year, month, 1) + timedelta(days=32)).replace(day=1)
+    return date.today() >= next_month + timedelta(days=close_after_days)
+
+
+def report_to_json(report):
+    """JSON-safe copy of a report (frames as lists of records)"""
+    def records(frame):
+        return json.loads(frame.to_json(orient='records', default_handler=str))
+    
+    # Session dates and times are kept as the text the renderers print
+    bookings = report['bookings'].assign(**{
+        column: report['bookings'][column].map(lambda value: None if value is None else str(value))
+        for column in ('date', 'time')
+    })
+    return dict(report, players=records(report['players']), bookings=records(bookings))
+
+
+def report_from_json(data):
+    """Rebuild a report stored with report_to_json"""
+    players = pd.DataFrame.from_records(data['players'], columns=PLAYER_COLUMNS[:-1] + ['guest_names', 'guest_count'])
+    bookings = pd.DataFrame.from_records(data['bookings'], columns=BOOKING_COLUMNS)
+    return dict(data, players=_type_player_frame(players), bookings=_type_booking_frame(bookings))
+
+
+def build_invoice_report(month, year, player_rows, booking_rows, price_index=None):
+    """
+    Build the monthly report as typed frames, straight from the query rows
+    
+    Args:
+        month (int): Month number (1-12)
+        year (int): Year
+        player_rows (list): get_player_costs_for_month rows
+        booking_rows (list): get_bookings_for_month rows
+        price_index (SlotPriceIndex): Flags unusual booking amounts when given
+        
+    Returns:
+        dict: month, year, month_name, players and bookings DataFrames,
+              price_warnings and summary; None if nobody played
+    """
+    if not player_rows:
+        return None
+    
+    players = pd.DataFrame.from_records(player_rows, columns=PLAYER_COLUMNS)
+    players['weeks_attended'] = players['weeks_attended'].map(lambda weeks: list(weeks or []))
+    
+    # Guest names billed to each host, None entries dropped
+    guest_names = players['guests'].explode().dropna()
+    players['guest_names'] = guest_names.groupby(level=0).agg(list).reindex(players.index)
+    players['guest_names'] = players['guest_names'].map(lambda names: names if isinstance(names, list) else [])
+    players['guest_count'] = guest_names.groupby(level=0).size().reindex(players.index, fill_value=0)
+    players = _type_player_frame(players.drop(columns=['guests']))
+    
+    bookings = _type_booking_frame(pd.DataFrame.from_records(booking_rows or [], columns=BOOKING_COLUMNS))
+    
+    # Sanity check recorded amounts against typical prices for that slot
+    price_warnings = []
+    if price_index is not None:
+        active = bookings[bookings['status'] != 'cancelled']
+        for week, pitch_type, session_date, slot_time, amount in zip(
+                active['week'], active['pitch_type'], active['date'], active['time'], active['amount']):
+            price_check = price_index.check_amount(pitch_type, session_date, slot_time, amount)
+            if price_check:
+                price_warnings.append(dict(price_check, week=week, amount=amount))
+    
+    total_players = len(players)
+    total_sessions = len(bookings)
+    total_revenue = float(players['total_cost'].sum())
+    total_spent = float(bookings['amount'].sum())
+    
+    return {
+        'month': month,
+        'year': year,
+        'month_name': datetime(year, month, 1).strftime('%B'),
+        'players': players,
+        'bookings': bookings,
+        'price_warnings': price_warnings,
+        'summary': {
+            'total_players': total_players,
+            'total_sessions': total_sessions,
+            'total_guests': int(players['guest_count'].sum()),
+            'total_revenue': round(total_revenue, 2),
+            'total_spent': round(total_spent, 2),
+            'profit': round(total_revenue - total_spent, 2),
+            'avg_per_player': round(total_revenue / total_players, 2),
+            'avg_per_session': round(total_spent / total_sessions, 2) if total_sessions else 0
+        }
+    }
+
+
+def month_range(start, end):
+    """
+    Date bounds covering whole months
+    
+    Args:
+        start (date): Any day in the first month
+        end (date): Any day in the last month
+        
+    Returns:
+        tuple: (first day of the first month, first day after the last month)
+    """
+    start_date = start.replace(day=1)
+    end_date = (end.replace(day=1) + timedelta(days=32)).replace(day=1)
+    return start_date, end_date
+
+
+def build_range_report(start, end, player_rows, booking_rows):
+    """
+    Per-month and per-player rollups for a range of months, from one set of rows
+    
+    Args:
+        start (date): Any day in the first month
+        end (date): Any day in the last month
+        player_rows (list): get_player_costs_for_range rows
+        booking_rows (list): get_bookings_for_range rows
+        
+    Returns:
+        dict: label, months (one row per month, including empty ones),
+              players (one row per billed player), player_months (player x month
+              cost grid) and summary; None if nobody played in the range
+    """
+    if not player_rows:
+        return None
+    
+    costs = pd.DataFrame.from_records(player_rows, columns=['period'] + PLAYER_COLUMNS)
+    costs = costs.astype({'sessions_attended': 'int64', 'total_cost': 'float64'})
+    costs['guest_count'] = (costs['guests'].explode().dropna()
+                            .groupby(level=0).size().reindex(costs.index, fill_value=0))
+    
+    bookings = _type_booking_frame(pd.DataFrame.from_records(booking_rows or [], columns=BOOKING_COLUMNS))
+    bookings['period'] = pd.to_datetime(bookings['date']).dt.strftime('%Y-%m')
+    
+    # Per-month rollup; months nobody played still get a row
+    start_date, end_date = month_range(start, end)
+    periods = pd.period_range(start_date, end_date - timedelta(days=1), freq='M').strftime('%Y-%m')
+    revenue = costs.groupby('period').agg(
+        players=('email', 'nunique'),
+        guests=('guest_count', 'sum'),
+        revenue=('total_cost', 'sum')
+    )
+    spend = bookings.groupby('period').agg(sessions=('booking_id', 'size'), spent=('amount', 'sum'))
+    months = revenue.join(spend, how='outer').reindex(periods).fillna(0)
+    months = months.astype({'players': 'int64', 'guests': 'int64', 'sessions': 'int64'})
+    months['profit'] = months['revenue'] - months['spent']
+    months = months.round(2).rename_axis('month').reset_index()
+    
+    # Per-player rollup across the range
+    players = costs.groupby('email', sort=False).agg(
+        name=('name', 'last'),
+        months_played=('period', 'nunique'),
+        sessions_attended=('sessions_attended', 'sum'),
+        guest_count=('guest_count', 'sum'),
+        total_cost=('total_cost', 'sum')
+    ).reset_index()
+    players = players[['name', 'email', 'months_played', 'sessions_attended', 'guest_count', 'total_cost']]
+    players = players.sort_values('name', kind='stable').reset_index(drop=True).round({'total_cost': 2})
+    
+    player_months = costs.pivot_table(index='email', columns='period', values='total_cost',
+                                      aggfunc='sum', fill_value=0.0).reindex(columns=periods, fill_value=0.0)
+    player_months = players[['name', 'email']].join(player_months, on='email').round(2)
+    
+    total_revenue = float(months['revenue'].sum())
+    total_spent = float(months['spent'].sum())
+    if start_date.month == 1 and end_date == start_date.replace(year=start_date.year + 1):
+        label = str(start_date.year)
+    else:
+        label = f"{start_date:%b %Y} - {end_date - timedelta(days=1):%b %Y}"
+    
+    return {
+        'label': label,
+        'start_date': start_date,
+        'end_date': end_date,
+        'months': months,
+        'players': players,
+        'player_months': player_months,
+        'summary': {
+            'total_players': len(players),
+            'total_sessions': int(months['sessions'].sum()),
+            'total_guests': int(players['guest_count'].sum()),
+            'total_revenue': round(total_revenue, 2),
+            'total_spent': round(total_spent, 2),
+            'profit': round(total_revenue - total_spent, 2),
+            'avg_per_player': round(total_revenue / len(players), 2),
+            'avg_per_month': round(total_revenue / len(months), 2) if len(months) else 0
+        }
+    }
+
+
 class InvoiceGenerator:
     """Generate and send monthly invoices"""
     
@@ -20,6 +235,7 @@ class InvoiceGenerator:
         """
         self.db = db
         self.whatsapp = WhatsAppNotifier(db)
+        self.price_index = SlotPriceIndex(db)
     
     def generate_monthly_report(self, month, year, format='summary'):
         """
@@ -31,72 +247,99 @@ class InvoiceGenerator:
             format (str): 'summary' or 'detailed'
             
         Returns:
-            dict: Report data
+            dict: Report data (see build_invoice_report)
+        """
+        return build_invoice_report(
+            month, year,
+            self.db.get_player_costs_for_month(month, year),
+            self.db.get_bookings_for_month(month, year),
+            price_index=self.price_index
+        )
+    
+    def generate_range_report(self, start, end):
         """
-        # Get player costs
-        player_costs = self.db.get_monthly_player_costs(month, year)
+        Generate rollups for several months with one query per table
         
-        if not player_costs:
-            return None
+        Args:
+            start (date): Any day in the first month
+            end (date): Any day in the last month
+            
+        Returns:
+            dict: Report data (see build_range_report)
+        """
+        start_date, end_date = month_range(start, end)
+        return build_range_report(
+            start, end,
+            self.db.get_player_costs_for_range(start_date, end_date),
+            self.db.get_bookings_for_range(start_date, end_date)
+        )
+    
+    def generate_yearly_report(self, year):
+        """Rollups for January to December of a year"""
+        return self.generate_range_report(date(year, 1, 1), date(year, 12, 1))
+    
+    def get_report_snapshot(self, month, year, format='summary'):
+        """
+        Serve a month's invoice from its stored snapshot
         
-        # Get booking details
-        bookings = self.db.get_bookings_for_month(month, year)
-        
-        # Build report
-        report = {
-            'month': month,
-            'year': year,
-            'month_name': datetime(year, month, 1).strftime('%B'),
-            'player_data': [],
-            'booking_data': [],
-            'summary': {}
-        }
+        Closed months are built once and never change; an open month is rebuilt
+        only after a booking or signup in it changed (its source version moved).
+        A snapshot taken while the month was open is frozen as it stands once the
+        month closes, or rebuilt and frozen if its source moved in the meantime.
         
-        # Process player data
-        total_revenue = 0
-        for player in player_costs:
-            player_info = {
-                'name': player[0],
-                'email': player[1],
-                'sessions_attended': player[2],
-                'total_cost': float(player[3]),
-                'weeks_attended': player[4] if len(player) > 4 else [],
-                'guests': player[5] if len(player) > 5 else []  # Guest names
-            }
-            report['player_data'].append(player_info)
-            total_revenue += player_info['total_cost']
-        
-        # Process booking data
-        total_spent = 0
-        for booking in bookings:
-            booking_info = {
-                'booking_id': booking[0],
-                'week': booking[1],
-                'date': booking[2],
-                'time': booking[3],
-                'pitch_type': booking[4],
-                'amount': float(booking[5]),
-                'cost_per_player': float(booking[6]) if booking[6] else 0,
-                'num_players': booking[7],
-                'auto_booked': booking[8],
-                'confirmation': booking[9],
-                'status': booking[10]
-            }
-            report['booking_data'].append(booking_info)
-            total_spent += booking_info['amount']
-        
-        # Calculate summary
-        report['summary'] = {
-            'total_players': len(player_costs),
-            'total_sessions': len(bookings),
-            'total_revenue': round(total_revenue, 2),
-            'total_spent': round(total_spent, 2),
-            'profit': round(total_revenue - total_spent, 2),
-            'avg_per_player': round(total_revenue / len(player_costs), 2) if player_costs else 0,
-            'avg_per_session': round(total_spent / len(bookings), 2) if bookings else 0
-        }
+        Args:
+            month (int): Month number (1-12)
+            year (int): Year
+            format (str): 'summary' or 'detailed'
+            
+        Returns:
+            dict: report, text, csv, content_hash, closed, created_at, cached and
+                  stale (closed snapshot whose source changed since); None if no data
+        """
+        period = f"{year}-{month:02d}"
+        snapshot = self.db.get_invoice_snapshot(period, format)
+        if snapshot:
+            content_hash, report_json, text, csv, source_version, closed, created_at, current_version = snapshot
+            if (not closed and source_version == current_version
+                    and month_is_closed(month, year, get_invoice_config()['close_after_days'])):
+                closed = self.db.close_invoice_snapshot(period, format, source_version)
+            if closed or source_version == current_version:
+                return {
+                    'report': report_from_json(report_json),
+                    'text': text,
+                    'csv': csv,
+                    'content_hash': content_hash,
+                    'closed': closed,
+                    'created_at': created_at,
+                    'cached': True,
+                    'stale': source_version != current_version
+                }
+        
+        # Read the version first so a change made while building invalidates this snapshot
+        source_version = self.db.get_invoice_month_version(period)
+        report = self.generate_monthly_report(month, year, format)
+        if not report:
+            return None
         
-        return report
+        text = self.format_report_text(report, format)
+        csv = self.generate_csv_export(report)
+        report_json = report_to_json(report)
+        content_hash = hashlib.sha256(
+            (json.dumps(report_json, sort_keys=True, default=str) + text).encode()
+        ).hexdigest()
+        closed = month_is_closed(month, year, get_invoice_config()['close_after_days'])
+        self.db.save_invoice_snapshot(period, format, content_hash, report_json, text, csv, source_version, closed)
+        
+        return {
+            'report': report,
+            'text': text,
+            'csv': csv,
+            'content_hash': content_hash,
+            'closed': closed,
+            'created_at': datetime.now(),
+            'cached': False,
+            'stale': False
+        }
     
     def format_report_text(self, report, format='summary'):
         """
@@ -112,64 +355,55 @@ class InvoiceGenerator:
         if not report:
             return "No data available for the selected month."
         
+        divider = "=" * 50 + "\n"
+        rule = "-" * 50 + "\n"
+        players = report['players'].sort_values('name', kind='stable')
+        totals = players['total_cost'].map('£{:.2f}'.format)
+        
         text = f"📊 MONTHLY INVOICE - {report['month_name']} {report['year']}\n"
-        text += "=" * 50 + "\n\n"
+        text += divider + "\n"
         
         if format == 'detailed':
             # Detailed player breakdown
-            text += "👥 PLAYER COSTS:\n"
-            text += "-" * 50 + "\n"
-            
-            for player in sorted(report['player_data'], key=lambda x: x['name']):
-                text += f"\n{player['name']}\n"
-                text += f"  Sessions: {player['sessions_attended']}\n"
-                text += f"  Total: £{player['total_cost']:.2f}\n"
-                
-                # Show guests if any
-                if player.get('guests') and player['guests']:
-                    guests_list = [g for g in player['guests'] if g]  # Filter None
-                    if guests_list:
-                        text += f"  Guests: {', '.join(guests_list)}\n"
-                
-                if player['weeks_attended']:
-                    weeks = ', '.join(player['weeks_attended'])
-                    text += f"  Weeks: {weeks}\n"
-            
-            text += "\n" + "=" * 50 + "\n\n"
+            guests_text = players['guest_names'].map(', '.join)
+            weeks_text = players['weeks_attended'].map(', '.join)
+            player_blocks = (
+                "\n" + players['name'] + "\n"
+                + "  Sessions: " + players['sessions_attended'].astype(str) + "\n"
+                + "  Total: " + totals + "\n"
+                + guests_text.where(guests_text == '', "  Guests: " + guests_text + "\n")
+                + weeks_text.where(weeks_text == '', "  Weeks: " + weeks_text + "\n")
+            )
+            text += "👥 PLAYER COSTS:\n" + rule + "".join(player_blocks)
+            text += "\n" + divider + "\n"
             
             # Detailed booking breakdown
-            text += "⚽ BOOKINGS:\n"
-            text += "-" * 50 + "\n"
-            
-            for booking in report['booking_data']:
-                text += f"\n{booking['date']} at {booking['time']}\n"
-                text += f"  Week: {booking['week']}\n"
-                text += f"  Pitch: {self._format_pitch_type(booking['pitch_type'])}\n"
-                text += f"  Players: {booking['num_players']}\n"
-                text += f"  Cost: £{booking['amount']:.2f}\n"
-                text += f"  Per player: £{booking['cost_per_player']:.2f}\n"
-            
-            text += "\n" + "=" * 50 + "\n\n"
+            bookings = report['bookings']
+            booking_blocks = (
+                "\n" + bookings['date'].astype(str) + " at " + bookings['time'].astype(str) + "\n"
+                + "  Week: " + bookings['week'] + "\n"
+                + "  Pitch: " + bookings['pitch_type'].map(self._format_pitch_type).astype(str) + "\n"
+                + "  Players: " + bookings['num_players'].astype(str) + "\n"
+                + "  Cost: " + bookings['amount'].map('£{:.2f}'.format) + "\n"
+                + "  Per player: " + bookings['cost_per_player'].map('£{:.2f}'.format) + "\n"
+            )
+            text += "⚽ BOOKINGS:\n" + rule + "".join(booking_blocks)
+            text += "\n" + divider + "\n"
         
         else:
             # Summary only
-            text += "👥 PLAYER SUMMARY:\n"
-            text += "-" * 50 + "\n"
-            
-            for player in sorted(report['player_data'], key=lambda x: x['name']):
-                guest_info = ""
-                if player.get('guests') and player['guests']:
-                    guests_list = [g for g in player['guests'] if g]
-                    if guests_list:
-                        guest_info = f" + {len(guests_list)} guest(s)"
-                text += f"{player['name']}{guest_info}: £{player['total_cost']:.2f} ({player['sessions_attended']} sessions)\n"
-            
-            text += "\n" + "=" * 50 + "\n\n"
+            guest_info = players['guest_count'].map(lambda count: f" + {count} guest(s)" if count else "")
+            player_lines = (
+                players['name'] + guest_info + ": " + totals
+                + " (" + players['sessions_attended'].astype(str) + " sessions)\n"
+            )
+            text += "👥 PLAYER SUMMARY:\n" + rule + "".join(player_lines)
+            text += "\n" + divider + "\n"
         
         # Always show summary statistics
         summary = report['summary']
         text += "📈 SUMMARY:\n"
-        text += "-" * 50 + "\n"
+        text += rule
         text += f"Total Players: {summary['total_players']}\n"
         text += f"Total Sessions: {summary['total_sessions']}\n"
         text += f"Revenue Collected: £{summary['total_revenue']:.2f}\n"
@@ -193,25 +427,64 @@ class InvoiceGenerator:
         if not report:
             return None
         
-        # Create player DataFrame
-        player_df = pd.DataFrame(report['player_data'])
+        # Sections are written into one buffer rather than concatenated strings
+        csv_output = io.StringIO()
+        csv_output.write(f"# MONTHLY INVOICE - {report['month_name']} {report['year']}\n\n")
+        csv_output.write("## PLAYER COSTS\n")
+        report['players'].drop(columns=['guest_names']).to_csv(csv_output, index=False)
+        csv_output.write("\n## BOOKINGS\n")
+        report['bookings'].to_csv(csv_output, index=False)
+        csv_output.write("\n## SUMMARY\n")
+        pd.DataFrame([report['summary']]).to_csv(csv_output, index=False)
+        
+        return csv_output.getvalue()
+    
+    def generate_range_csv_export(self, range_report):
+        """
+        Generate CSV export of a multi-month report
         
-        # Create booking DataFrame
-        booking_df = pd.DataFrame(report['booking_data'])
+        Args:
+            range_report (dict): Report data from generate_range_report
+            
+        Returns:
+            str: CSV formatted string
+        """
+        if not range_report:
+            return None
         
-        # Combine into CSV string
-        csv_output = f"# MONTHLY INVOICE - {report['month_name']} {report['year']}\n\n"
-        csv_output += "## PLAYER COSTS\n"
-        csv_output += player_df.to_csv(index=False)
-        csv_output += "\n## BOOKINGS\n"
-        csv_output += booking_df.to_csv(index=False)
-        csv_output += f"\n## SUMMARY\n"
+        csv_output = io.StringIO()
+        csv_output.write(f"# INVOICE STATEMENT - {range_report['label']}\n\n")
+        for title, frame in (('MONTHS', range_report['months']),
+                             ('PLAYERS', range_report['players']),
+                             ('PLAYER COSTS BY MONTH', range_report['player_months']),
+                             ('SUMMARY', pd.DataFrame([range_report['summary']]))):
+            csv_output.write(f"## {title}\n")
+            frame.to_csv(csv_output, index=False)
+            csv_output.write("\n")
+        
+        return csv_output.getvalue()
+    
+    def generate_player_invoices_archive(self, month, year, format='summary', workers=None):
+        """
+        Render one HTML invoice per player for a month into a zip archive
         
-        summary_df = pd.DataFrame([report['summary']])
-        csv_output += summary_df.to_csv(index=False)
+        Args:
+            month (int): Month number (1-12)
+            year (int): Year
+            format (str): Snapshot to render from ('summary' or 'detailed')
+            workers (int): Render processes (see render_invoice_archive)
+        
+        Returns:
+            tuple: (zip bytes, render stats) or (None, None) if no data
+        """
+        snapshot = self.get_report_snapshot(month, year, format)
+        if not snapshot:
+            return None, None
+        
+        archive = io.BytesIO()
+        stats = render_invoice_archive(snapshot['report'], archive, workers=workers)
+        return archive.getvalue(), stats
         
-        return csv_output
-    
     def send_invoice_via_whatsapp(self, month, year, format='summary'):
         """
         Generate and send invoice via WhatsApp
@@ -224,41 +497,44 @@ class InvoiceGenerator:
         Returns:
             bool: True if successful
         """
-        # Generate report
-        report = self.generate_monthly_report(month, year, format)
+        snapshot = self.get_report_snapshot(month, year, format)
         
-        if not report:
+        if not snapshot:
             st.error("No data available for the selected month")
             return False
         
-        # Format as text
-        message = self.format_report_text(report, format)
-        
         # Send via WhatsApp
-        success = self.whatsapp.send_message(message)
+        success = self.whatsapp.send_message(snapshot['text'])
         
         if success:
-            st.success(f"Invoice sent via WhatsApp for {report['month_name']} {year}")
+            st.success(f"Invoice sent via WhatsApp for {snapshot['report']['month_name']} {year}")
         else:
             st.error("Failed to send invoice via WhatsApp")
         
         return success
     
-    def display_invoice_in_app(self, month, year):
+    def display_invoice_in_app(self, month, year, format='summary'):
         """
         Display invoice in Streamlit app
         
         Args:
             month (int): Month number
             year (int): Year
+            format (str): Snapshot format to serve
         """
-        report = self.generate_monthly_report(month, year)
+        snapshot = self.get_report_snapshot(month, year, format)
         
-        if not report:
+        if not snapshot:
             st.warning("No data available for the selected month")
             return
         
+        report = snapshot['report']
         st.header(f"📊 Invoice - {report['month_name']} {report['year']}")
+        st.caption(f"{'Final snapshot' if snapshot['closed'] else 'Snapshot'} "
+                   f"{snapshot['content_hash'][:12]} · {snapshot['created_at']:%Y-%m-%d %H:%M}")
+        if snapshot['stale']:
+            st.warning("Bookings or signups for this month changed after it was closed; "
+                       "the final snapshot is shown unchanged")
         
         # Summary metrics
         col1, col2, col3, col4 = st.columns(4)
@@ -273,20 +549,64 @@ class InvoiceGenerator:
         
         # Player costs table
         st.subheader("👥 Player Costs")
-        player_df = pd.DataFrame(report['player_data'])
-        if not player_df.empty:
-            display_df = player_df[['name', 'sessions_attended', 'total_cost']].copy()
-            display_df.columns = ['Player', 'Sessions', 'Total Cost (£)']
+        if not report['players'].empty:
+            display_df = report['players'][['name', 'sessions_attended', 'guest_count', 'total_cost']].copy()
+            display_df.columns = ['Player', 'Sessions', 'Guests', 'Total Cost (£)']
             st.dataframe(display_df, use_container_width=True)
         
         # Booking details table
         st.subheader("⚽ Bookings")
-        booking_df = pd.DataFrame(report['booking_data'])
-        if not booking_df.empty:
-            display_df = booking_df[['date', 'time', 'pitch_type', 'num_players', 'amount']].copy()
+        if not report['bookings'].empty:
+            display_df = report['bookings'][['date', 'time', 'pitch_type', 'num_players', 'amount']].copy()
             display_df.columns = ['Date', 'Time', 'Pitch Type', 'Players', 'Cost (£)']
-            display_df['Pitch Type'] = display_df['Pitch Type'].apply(self._format_pitch_type)
+            display_df['Pitch Type'] = display_df['Pitch Type'].map(self._format_pitch_type)
             st.dataframe(display_df, use_container_width=True)
+        
+        # Amounts that don't look like the usual price for that slot
+        for warning in report['price_warnings']:
+            st.warning(
+                f"Week {warning['week']}: booked at £{warning['amount']:.2f}, "
+                f"typically £{warning['expected']:.2f} ({warning['deviation']:+.0%})"
+            )
+    
+    def display_range_in_app(self, range_report):
+        """
+        Display a multi-month report in Streamlit app
+        
+        Args:
+            range_report (dict): Report data from generate_range_report
+        """
+        if not range_report:
+            st.warning("No data available for the selected period")
+            return
+        
+        summary = range_report['summary']
+        st.header(f"📅 Statement - {range_report['label']}")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Players", summary['total_players'])
+        with col2:
+            st.metric("Sessions", summary['total_sessions'])
+        with col3:
+            st.metric("Revenue", f"£{summary['total_revenue']:.2f}")
+        with col4:
+            st.metric("Profit", f"£{summary['profit']:.2f}")
+        
+        st.subheader("🗓️ By Month")
+        months = range_report['months']
+        st.bar_chart(months.set_index('month')[['revenue', 'spent']])
+        display_df = months[['month', 'players', 'sessions', 'guests', 'revenue', 'spent', 'profit']].copy()
+        display_df.columns = ['Month', 'Players', 'Sessions', 'Guests', 'Revenue (£)', 'Spent (£)', 'Profit (£)']
+        st.dataframe(display_df, use_container_width=True, hide_index=True)
+        
+        st.subheader("👥 By Player")
+        display_df = range_report['players'][['name', 'months_played', 'sessions_attended', 'guest_count', 'total_cost']].copy()
+        display_df.columns = ['Player', 'Months', 'Sessions', 'Guests', 'Total Cost (£)']
+        st.dataframe(display_df, use_container_width=True, hide_index=True)
+        
+        with st.expander("Player costs by month"):
+            st.dataframe(range_report['player_months'].drop(columns=['email']), use_container_width=True, hide_index=True)
     
     def _format_pitch_type(self, pitch_type):
         """Format pitch type for display"""
@@ -323,3 +643,58 @@ def generate_and_send_invoice(db, month=None, year=None):
     
     generator = InvoiceGenerator(db)
     return generator.send_invoice_via_whatsapp(month, year)
+
+
+def _synthetic_invoice_rows(n_players, n_bookings, year=2026, month=9, seed=0):
+    """Random player cost and booking rows in query format, for benchmarking"""
+    rng = random.Random(seed)
+    weeks = [f"{year}-W{week:02d}" for week in range(36, 41)]
+    player_rows = []
+    for i in range(n_players):
+        attended = sorted(rng.sample(weeks, rng.randint(1, len(weeks))))
+        guests = [f"Guest {i}-{g}" for g in range(rng.choice([0, 0, 0, 1, 2]))] + [None]
+        player_rows.append((f"Player {i}", f"player{i}@example.com", len(attended),
+                            round(len(attended) * rng.uniform(3, 6), 2), attended, guests))
+    booking_rows = []
+    for i in range(n_bookings):
+        players = rng.randint(10, 20)
+        amount = float(rng.choice([55, 60, 110, 120]))
+        booking_rows.append((i, rng.choice(weeks), date(year, month, 1) + timedelta(days=rng.randrange(28)),
+                             '19:00', 'third_pitch', amount, round(amount / players, 2), players,
+                             True, f"BENCH-{i}", rng.choice(['confirmed'] * 9 + ['cancelled'])))
+    return player_rows, booking_rows
+
+
+def benchmark_invoice_report(sizes=((1000, 200), (5000, 1000), (20000, 5000)), repeats=3):
+    """
+    Time report building and each renderer on synthetic months (no database)
+    
+    Args:
+        sizes (tuple): (players, bookings) pairs to measure
+        repeats (int): Runs per size (best run is reported)
+        
+    Returns:
+        list: One dict of timings (milliseconds) per size
+    """
+    generator = InvoiceGenerator.__new__(InvoiceGenerator)  # Renderers only, no DB or transport
+    results = []
+    for n_players, n_bookings in sizes:
+        player_rows, booking_rows = _synthetic_invoice_rows(n_players, n_bookings)
+        timings = {'build_ms': [], 'summary_text_ms': [], 'detailed_text_ms': [], 'csv_ms': []}
+        for _ in range(repeats):
+            started = time.perf_counter()
+            report = build_invoice_report(9, 2026, player_rows, booking_rows)
+            timings['build_ms'].append(time.perf_counter() - started)
+            
+            for name, render in (('summary_text_ms', lambda: generator.format_report_text(report, 'summary')),
+                                 ('detailed_text_ms', lambda: generator.format_report_text(report, 'detailed')),
+                                 ('csv_ms', lambda: generator.generate_csv_export(report))):
+                started = time.perf_counter()
+                render()
+                timings[name].append(time.perf_counter() - started)
+        
+        results.append(dict(
+            {'players': n_players, 'bookings': n_bookings},
+            **{name: round(min(values) * 1000, 2) for name, values in timings.items()}
+        ))
+    return results
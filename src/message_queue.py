@@ -0,0 +1,214 @@
+"""
+Outbound WhatsApp queue - debounces signup updates and sends them off the request thread
+"""
+
+import itertools
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from threading import Event, Lock, Thread
+from config import get_whatsapp_config
+import streamlit as st
+
+
+class OutboundMessageQueue:
+    """
+    Coalescing outbound queue for WhatsApp messages
+
+    Signup updates are keyed by (group, week): every update inside the debounce
+    window is merged into the pending entry, and one roster message is rendered
+    and sent when the window closes. A single background thread does the sending.
+    """
+
+    def __init__(self, notifier, debounce_seconds=None, max_delay_seconds=None):
+        """
+        Initialize the queue
+
+        Args:
+            notifier: WhatsAppNotifier used to render and send (ideally with its own DB connection)
+            debounce_seconds (int): Quiet period after the last update before sending
+            max_delay_seconds (int): Longest an update may wait under a steady stream of changes
+        """
+        whatsapp_config = get_whatsapp_config()
+        self.notifier = notifier
+        self.debounce = timedelta(seconds=debounce_seconds if debounce_seconds is not None
+                                  else whatsapp_config['debounce_seconds'])
+        self.max_delay = timedelta(seconds=max_delay_seconds if max_delay_seconds is not None
+                                   else whatsapp_config['max_delay_seconds'])
+
+        self.pending = {}  # key -> entry dict
+        self._message_ids = itertools.count()
+        self._lock = Lock()
+        self._wake = Event()
+        self.running = False
+        self.thread = None
+
+        # Reporting
+        self.sent_count = 0
+        self.failed_count = 0
+        self.coalesced_count = 0
+        self.send_seconds = deque(maxlen=50)  # Time spent in the transport per message
+        self.queue_seconds = deque(maxlen=50)  # First enqueue -> delivered
+        self.last_sent_at = None
+
+    def enqueue_signup_update(self, name, action, week, threshold_half, threshold_full):
+        """
+        Queue a signup/removal for the week's roster message
+
+        Args:
+            name (str): Player name
+            action (str): "signed up" or "removed themselves"
+            week (str): Week identifier
+            threshold_half (int): Half pitch threshold
+            threshold_full (int): Two thirds threshold
+        """
+        now = datetime.now()
+        key = (self.notifier.group_id, 'signup_update', week)
+        with self._lock:
+            entry = self.pending.get(key)
+            if entry is None:
+                entry = self.pending[key] = {
+                    'kind': 'signup_update',
+                    'week': week,
+                    'changes': [],
+                    'first_enqueued_at': now
+                }
+            else:
+                self.coalesced_count += 1
+            entry['changes'].append((name, action))
+            entry['thresholds'] = (threshold_half, threshold_full)
+            entry['due_at'] = min(now + self.debounce, entry['first_enqueued_at'] + self.max_delay)
+        self._ensure_running()
+        self._wake.set()
+
+    def enqueue_message(self, message):
+        """
+        Queue a one-off message for immediate background delivery (not coalesced)
+
+        Args:
+            message (str): Message text
+        """
+        now = datetime.now()
+        with self._lock:
+            key = (self.notifier.group_id, 'message', next(self._message_ids))
+            self.pending[key] = {
+                'kind': 'message',
+                'message': message,
+                'first_enqueued_at': now,
+                'due_at': now
+            }
+        self._ensure_running()
+        self._wake.set()
+
+    def flush(self):
+        """Make every pending entry due now"""
+        with self._lock:
+            for entry in self.pending.values():
+                entry['due_at'] = datetime.now()
+        self._wake.set()
+
+    def _take_due(self):
+        """Pop entries whose window has closed; return them and the next wake-up delay"""
+        now = datetime.now()
+        with self._lock:
+            due_keys = [key for key, entry in self.pending.items() if entry['due_at'] <= now]
+            due = [self.pending.pop(key) for key in due_keys]
+            next_due = min((entry['due_at'] for entry in self.pending.values()), default=None)
+        timeout = None if next_due is None else max(0.0, (next_due - now).total_seconds())
+        return due, timeout
+
+    def _deliver(self, entry):
+        """Render and send one entry"""
+        started = time.perf_counter()
+        if entry['kind'] == 'signup_update':
+            threshold_half, threshold_full = entry['thresholds']
+            message = self.notifier.build_signup_update(
+                entry['changes'], entry['week'], threshold_half, threshold_full)
+        else:
+            message = entry['message']
+
+        delivered = self.notifier.send_message(message)
+        self.send_seconds.append(time.perf_counter() - started)
+        if delivered:
+            self.sent_count += 1
+            self.last_sent_at = datetime.now()
+            self.queue_seconds.append((self.last_sent_at - entry['first_enqueued_at']).total_seconds())
+        else:
+            self.failed_count += 1
+
+    def _run_loop(self):
+        """Background thread: sleep until the next entry is due, then send"""
+        while self.running:
+            self._wake.clear()
+            due, timeout = self._take_due()
+            for entry in due:
+                try:
+                    self._deliver(entry)
+                except Exception as e:
+                    self.failed_count += 1
+                    print(f"Outbound message failed: {e}")
+            if due:
+                continue
+            self._wake.wait(timeout)
+
+    def _ensure_running(self):
+        """Start the delivery thread on first use"""
+        with self._lock:
+            if self.running:
+                return
+            self.running = True
+            self.thread = Thread(target=self._run_loop, daemon=True, name='whatsapp-outbound')
+            self.thread.start()
+
+    def stop(self, timeout=30):
+        """Stop the delivery thread after flushing what is pending"""
+        self.flush()
+        deadline = time.monotonic() + timeout
+        while self.pending and time.monotonic() < deadline:
+            time.sleep(0.5)
+        self.running = False
+        self._wake.set()
+        if self.thread:
+            self.thread.join(timeout=max(0.0, deadline - time.monotonic()))
+
+    def get_status(self):
+        """
+        Queue depth and delivery stats
+
+        Returns:
+            dict: Status information
+        """
+        with self._lock:
+            depth = len(self.pending)
+            pending_changes = sum(len(entry.get('changes', [])) or 1 for entry in self.pending.values())
+            next_send = min((entry['due_at'] for entry in self.pending.values()), default=None)
+        return {
+            'running': self.running,
+            'queue_depth': depth,
+            'pending_changes': pending_changes,
+            'next_send': next_send,
+            'sent': self.sent_count,
+            'failed': self.failed_count,
+            'coalesced': self.coalesced_count,
+            'avg_send_seconds': round(sum(self.send_seconds) / len(self.send_seconds), 2) if self.send_seconds else None,
+            'avg_queue_seconds': round(sum(self.queue_seconds) / len(self.queue_seconds), 2) if self.queue_seconds else None,
+            'last_sent_at': self.last_sent_at
+        }
+
+
+# Streamlit-specific initialization using cache_resource
+@st.cache_resource
+def get_message_queue():
+    """
+    Get or create the outbound message queue (singleton pattern)
+
+    The queue renders rosters from its delivery thread, so it gets its own
+    database connection rather than sharing the app's.
+
+    Returns:
+        OutboundMessageQueue: The queue instance
+    """
+    from database import DatabaseHandler
+    from whatsapp import WhatsAppNotifier
+
+    return OutboundMessageQueue(WhatsAppNotifier(DatabaseHandler(environment='live')))
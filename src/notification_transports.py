@@ -0,0 +1,184 @@
+"""
+Notification transports - how a rendered WhatsApp message actually leaves the app
+
+pywhatkit drives WhatsApp Web in a local browser, the webhook adapter posts to an
+HTTP gateway, and the capture sink records messages in memory (and optionally a
+JSONL file) so notifications can be exercised offline.
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+from threading import Lock
+import requests
+from config import get_whatsapp_config
+
+# Lazy import pywhatkit to avoid GUI/display issues at module load time
+_pywhatkit = None
+
+
+def _get_pywhatkit():
+    """Lazy import pywhatkit only when needed"""
+    global _pywhatkit
+    if _pywhatkit is None:
+        try:
+            import pywhatkit as pwk
+            _pywhatkit = pwk
+        except Exception as e:
+            print(f"WhatsApp features disabled: {str(e)}")
+            _pywhatkit = False  # Mark as unavailable
+    return _pywhatkit if _pywhatkit is not False else None
+
+
+class NotificationTransport:
+    """Base transport: deliver a message to a group id or phone number"""
+
+    name = 'base'
+    max_concurrency = None  # Parallel sends the transport tolerates (None = no limit)
+
+    def send(self, recipient, message):
+        """
+        Deliver a message
+
+        Args:
+            recipient (str): WhatsApp group id, or a phone number starting with '+'
+            message (str): Message text
+
+        Returns:
+            bool: True if delivered
+        """
+        raise NotImplementedError
+
+    def is_available(self):
+        """Whether the transport can send right now"""
+        return True
+
+
+class PyWhatKitTransport(NotificationTransport):
+    """Send through WhatsApp Web with pywhatkit (needs a browser session on this host)"""
+
+    name = 'pywhatkit'
+    max_concurrency = 1  # One browser session drives every send
+
+    def is_available(self):
+        return _get_pywhatkit() is not None
+
+    def send(self, recipient, message):
+        pwk = _get_pywhatkit()
+        if pwk is None:
+            raise RuntimeError("pywhatkit is not available")
+        if str(recipient).startswith('+'):
+            pwk.sendwhatmsg_instantly(recipient, message)
+        else:
+            pwk.sendwhatmsg_to_group_instantly(recipient, message)
+        return True
+
+
+class WebhookTransport(NotificationTransport):
+    """POST messages as JSON to an HTTP gateway"""
+
+    name = 'webhook'
+
+    def __init__(self, url, token=None, timeout=10):
+        """
+        Initialize the webhook transport
+
+        Args:
+            url (str): Gateway endpoint
+            token (str): Optional bearer token
+            timeout (int): Request timeout in seconds
+        """
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+        if token:
+            self.session.headers['Authorization'] = f"Bearer {token}"
+
+    def is_available(self):
+        return bool(self.url)
+
+    def send(self, recipient, message):
+        response = self.session.post(
+            self.url, json={'recipient': recipient, 'message': message}, timeout=self.timeout)
+        response.raise_for_status()
+        return True
+
+
+class CaptureTransport(NotificationTransport):
+    """Record messages instead of sending them (in memory, plus a JSONL file if a path is set)"""
+
+    name = 'capture'
+
+    def __init__(self, path=None, max_messages=1000):
+        """
+        Initialize the capture sink
+
+        Args:
+            path (str): Optional JSONL file each message is appended to
+            max_messages (int): Messages kept in memory
+        """
+        self.path = path
+        self.max_messages = max_messages
+        self.messages = []
+        self._lock = Lock()
+
+    def send(self, recipient, message):
+        record = {'recipient': recipient, 'message': message, 'sent_at': datetime.now().isoformat()}
+        with self._lock:
+            self.messages.append(record)
+            del self.messages[:-self.max_messages]
+            if self.path:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                with open(self.path, 'a') as file:
+                    file.write(json.dumps(record) + '\n')
+        return True
+
+
+def get_transport(name=None):
+    """
+    Build the configured transport
+
+    Args:
+        name (str): 'pywhatkit', 'webhook' or 'capture' (defaults to whatsapp.transport)
+
+    Returns:
+        NotificationTransport: Transport instance
+    """
+    whatsapp_config = get_whatsapp_config()
+    name = name or whatsapp_config['transport']
+    if name == 'webhook':
+        return WebhookTransport(whatsapp_config['webhook_url'], token=whatsapp_config['webhook_token'])
+    if name == 'capture':
+        return CaptureTransport(path=whatsapp_config['capture_path'])
+    return PyWhatKitTransport()
+
+
+def benchmark_transport(transport, messages, recipient='benchmark'):
+    """
+    Measure how fast a transport delivers a batch of messages
+
+    Args:
+        transport (NotificationTransport): Transport under test (use CaptureTransport offline)
+        messages (list): Rendered message texts
+        recipient (str): Recipient passed to the transport
+
+    Returns:
+        dict: messages, failures, total_seconds, messages_per_second
+    """
+    failures = 0
+    started = time.perf_counter()
+    for message in messages:
+        try:
+            if not transport.send(recipient, message):
+                failures += 1
+        except Exception:
+            failures += 1
+    elapsed = time.perf_counter() - started
+    return {
+        'transport': transport.name,
+        'messages': len(messages),
+        'failures': failures,
+        'total_seconds': round(elapsed, 4),
+        'messages_per_second': round(len(messages) / elapsed, 1) if elapsed else None
+    }
@@ -0,0 +1,144 @@
+"""
+Scheduled notification worker - sends game reminders, weekly lists and per-player
+invoice messages off the web process
+
+Start from the repo root with: PYTHONPATH=src python -m notification_worker
+(or ./start.sh notifications). Each tick queues messages for upcoming booked
+sessions with one query over booking_references; the unique (kind, session)
+key on notification_dispatches means each message is queued once, and claims
+use FOR UPDATE SKIP LOCKED so it is sent by a single worker.
+"""
+
+import os
+import signal
+import socket
+from threading import Event
+from config import get_whatsapp_config
+from invoice_fanout import InvoiceFanout
+from whatsapp import WhatsAppNotifier
+
+
+class NotificationDispatcher:
+    """Schedules and sends rows of public.notification_dispatches"""
+
+    def __init__(self, db, notifier=None):
+        """
+        Initialize the dispatcher
+
+        Args:
+            db: DatabaseHandler instance (dedicated to this worker)
+            notifier: WhatsAppNotifier to send with (defaults to one on db)
+        """
+        self.db = db
+        self.whatsapp = notifier or WhatsAppNotifier(db)
+        self.invoice_fanout = InvoiceFanout(db, notifier=self.whatsapp)
+        self.config = get_whatsapp_config()
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        self.stop_event = Event()
+
+    def schedule(self):
+        """
+        Queue reminders and weekly lists for sessions coming up
+
+        Returns:
+            int: Newly queued messages
+        """
+        return self.db.schedule_notification_dispatches(
+            reminder_hours=self.config['reminder_hours_before'],
+            weekly_list_hours=self.config['weekly_list_hours_before'],
+            lookahead_days=self.config['dispatch_lookahead_days'],
+            max_attempts=self.config['dispatch_max_attempts']
+        )
+
+    def build_message(self, kind, week, session_date, booking_time, pitch_type):
+        """
+        Render a scheduled message
+
+        Returns:
+            str: Message text
+        """
+        if kind == 'reminder':
+            time_text = booking_time.strftime('%H:%M') if booking_time else 'TBC'
+            return self.whatsapp.build_reminder(week, session_date.strftime('%Y-%m-%d'), time_text, pitch_type)
+        if kind == 'weekly_list':
+            return self.whatsapp.build_weekly_list(week)
+        raise ValueError(f"Unknown notification kind: {kind}")
+
+    def process_next_dispatch(self):
+        """
+        Claim and send one due message
+
+        Returns:
+            bool: True if a message was processed, False if nothing is due
+        """
+        dispatch = self.db.claim_notification_dispatch()
+        if not dispatch:
+            return False
+
+        dispatch_id, kind, week, session_date, booking_time, pitch_type, attempts, max_attempts = dispatch
+        print(f"[{self.worker_id}] Sending {kind} for {week} ({session_date}, attempt {attempts})")
+        try:
+            delivered = self.whatsapp.send_message(
+                self.build_message(kind, week, session_date, booking_time, pitch_type))
+            error = None if delivered else 'Transport did not deliver the message'
+        except Exception as e:
+            error = str(e)
+
+        if error is None:
+            self.db.finish_notification_dispatch(dispatch_id, 'sent')
+        elif attempts < max_attempts:
+            delay_seconds = 60 * (2 ** (attempts - 1))
+            print(f"[{self.worker_id}] {kind} {dispatch_id} failed ({error}); retrying in {delay_seconds}s")
+            self.db.retry_notification_dispatch(dispatch_id, error, delay_seconds)
+        else:
+            print(f"[{self.worker_id}] {kind} {dispatch_id} failed permanently: {error}")
+            self.db.finish_notification_dispatch(dispatch_id, 'failed', error=error)
+        return True
+
+    def tick(self):
+        """Schedule new messages, tidy up old ones, send everything due, then queued invoices"""
+        queued = self.schedule()
+        expired, interrupted = self.db.expire_notification_dispatches(self.config['dispatch_stale_minutes'])
+        if queued or expired or interrupted:
+            print(f"[{self.worker_id}] Scheduled {queued}, expired {expired}, interrupted {interrupted}")
+        while not self.stop_event.is_set() and self.process_next_dispatch():
+            pass
+
+        sent = self.invoice_fanout.drain(self.stop_event)
+        if any(sent.values()):
+            print(f"[{self.worker_id}] Invoice messages: {sent}")
+
+    def run(self):
+        """Run until SIGTERM/SIGINT"""
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.stop_event.set())
+        signal.signal(signal.SIGINT, lambda signum, frame: self.stop_event.set())
+        print(f"[{self.worker_id}] Notification worker started")
+
+        while not self.stop_event.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                print(f"[{self.worker_id}] Notification worker error: {e}")
+            self.stop_event.wait(self.config['dispatch_poll_seconds'])
+
+        self.invoice_fanout.close()
+        print(f"[{self.worker_id}] Notification worker stopped")
+
+
+def main():
+    """Entry point: `PYTHONPATH=src python -m notification_worker` from the repo root"""
+    from database import DatabaseHandler
+
+    db = DatabaseHandler(environment='live')
+    db.create_tables('create_notification_dispatches_table.sql')
+    db.create_tables('alter_players_add_phone.sql')
+    db.create_tables('create_invoice_deliveries_table.sql')
+
+    try:
+        NotificationDispatcher(db).run()
+    finally:
+        db.close_connection()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""
+Historical slot price index - typical prices by pitch type, weekday and kick-off hour
+"""
+
+import time
+from slot_selection import parse_slot_datetime
+
+
+# Last resort when the index has never seen a pitch type (the old hard-coded prices)
+FALLBACK_PRICES = {
+    'half_pitch': 80.0,
+    'full_pitch': 150.0,
+    'third_pitch': 150.0
+}
+
+
+def price_observations(slots):
+    """
+    Turn scraped slots into price index observations
+
+    Args:
+        slots (list): Slot dicts with 'date', 'time', 'pitch_type', 'price'
+
+    Returns:
+        list: Dicts with pitch_type, weekday (ISO, 1 = Monday), hour and price
+    """
+    observations = []
+    for slot in slots:
+        kick_off = parse_slot_datetime(slot)
+        price = slot.get('price')
+        if kick_off is None or not price or price <= 0:
+            continue
+        observations.append({
+            'pitch_type': slot['pitch_type'],
+            'weekday': kick_off.isoweekday(),
+            'hour': kick_off.hour,
+            'price': float(price)
+        })
+    return observations
+
+
+class SlotPriceIndex:
+    """In-memory view of public.slot_price_index with O(1) price lookups"""
+
+    def __init__(self, db, ttl_seconds=300):
+        """
+        Initialize the index (loaded lazily on first lookup)
+
+        Args:
+            db: DatabaseHandler instance
+            ttl_seconds (int): How long a loaded copy is used before reloading
+        """
+        self.db = db
+        self.ttl_seconds = ttl_seconds
+        self.loaded_at = None
+        self.by_slot = {}
+        self.by_hour = {}
+        self.by_pitch = {}
+
+    def refresh(self):
+        """Reload the index and rebuild the hour and pitch type fallbacks"""
+        by_slot, hour_totals, pitch_totals = {}, {}, {}
+        for pitch_type, weekday, hour, samples, avg_price, min_price, max_price, last_price, _ in self.db.get_slot_price_index():
+            entry = {
+                'price': float(avg_price),
+                'min_price': float(min_price),
+                'max_price': float(max_price),
+                'last_price': float(last_price),
+                'samples': samples
+            }
+            by_slot[(pitch_type, weekday, hour)] = entry
+            for totals, key in ((hour_totals, (pitch_type, hour)), (pitch_totals, pitch_type)):
+                total, count = totals.get(key, (0.0, 0))
+                totals[key] = (total + entry['price'] * samples, count + samples)
+
+        self.by_slot = by_slot
+        self.by_hour = {key: {'price': total / count, 'samples': count}
+                        for key, (total, count) in hour_totals.items() if count}
+        self.by_pitch = {key: {'price': total / count, 'samples': count}
+                         for key, (total, count) in pitch_totals.items() if count}
+        self.loaded_at = time.monotonic()
+
+    def _ensure_loaded(self):
+        if self.loaded_at is None or time.monotonic() - self.loaded_at > self.ttl_seconds:
+            try:
+                self.refresh()
+            except Exception as e:
+                # Keep serving the previous copy if the reload fails
+                print(f"Could not load slot price index: {e}")
+                if self.loaded_at is None:
+                    self.loaded_at = time.monotonic()
+
+    def lookup(self, pitch_type, date=None, slot_time=None):
+        """
+        Typical price for a slot, falling back from (weekday, hour) to hour to pitch type
+
+        Args:
+            pitch_type (str): Pitch type
+            date (str|date): Slot date (optional)
+            slot_time (str|time): Kick-off time (optional)
+
+        Returns:
+            dict: price, samples and basis ('weekday_hour', 'hour' or 'pitch_type'), or None
+        """
+        self._ensure_loaded()
+        kick_off = parse_slot_datetime({'date': date, 'time': slot_time}) if date and slot_time else None
+
+        if kick_off is not None:
+            entry = self.by_slot.get((pitch_type, kick_off.isoweekday(), kick_off.hour))
+            if entry:
+                return dict(entry, basis='weekday_hour')
+            entry = self.by_hour.get((pitch_type, kick_off.hour))
+            if entry:
+                return dict(entry, basis='hour')
+
+        entry = self.by_pitch.get(pitch_type)
+        return dict(entry, basis='pitch_type') if entry else None
+
+    def estimate_price(self, pitch_type, date=None, slot_time=None):
+        """
+        Best price estimate for a slot
+
+        Returns:
+            float: Indexed price, FALLBACK_PRICES for unseen pitch types, or None
+        """
+        entry = self.lookup(pitch_type, date, slot_time)
+        if entry:
+            return round(entry['price'], 2)
+        return FALLBACK_PRICES.get(pitch_type)
+
+    def check_amount(self, pitch_type, date, slot_time, amount, tolerance=0.25):
+        """
+        Flag a booking amount far from the indexed price
+
+        Args:
+            pitch_type (str): Pitch type booked
+            date (str|date): Session date
+            slot_time (str|time): Kick-off time
+            amount (float): Amount recorded for the booking
+            tolerance (float): Allowed relative deviation
+
+        Returns:
+            dict: expected price and deviation if outside tolerance, else None
+        """
+        entry = self.lookup(pitch_type, date, slot_time)
+        if not entry or not entry['price']:
+            return None
+        deviation = (amount - entry['price']) / entry['price']
+        if abs(deviation) <= tolerance:
+            return None
+        return {'expected': round(entry['price'], 2), 'deviation': round(deviation, 3), 'basis': entry['basis']}
@@ -2,47 +2,260 @@
 Background scraper service for periodically updating available pitch times
 """
 
-import schedule
+import os
+import random
+import signal
+import socket
 import time
-from threading import Thread
-from datetime import datetime
+from threading import Event, Lock, Thread
+from datetime import datetime, timedelta
 from booking_bot import MerkyFCBookingBot
+from config import get_booking_config, get_scrape_config
+from helper import get_current_week, get_next_week_range
+from price_index import price_observations
 import streamlit as st
 
+# The pitch type BookingManager books (one or two thirds) - always scraped
+BOOKED_PITCH_TYPE = 'third_pitch'
+
+
+def scheduled_pitch_types(pitch_types=None):
+    """
+    Pitch types to scrape: the booked pitch type first, then any others configured
+    
+    Args:
+        pitch_types (list): Extra pitch types (defaults to scrape config)
+        
+    Returns:
+        list: Pitch types without duplicates
+    """
+    configured = pitch_types if pitch_types is not None else get_scrape_config()['pitch_types']
+    return list(dict.fromkeys([BOOKED_PITCH_TYPE] + list(configured)))
+
+
+def _slot_key(date, time_value):
+    """Normalise a slot's date/time (DB objects or scraped strings) to a comparable key"""
+    date_str = date.strftime('%Y-%m-%d') if hasattr(date, 'strftime') else str(date)
+    time_str = time_value.strftime('%H:%M') if hasattr(time_value, 'strftime') else str(time_value)[:5]
+    return date_str, time_str
+
+
+def diff_slots(cached_rows, scraped_slots):
+    """
+    Compare a fresh scrape against the cached state of the same pitch type
+    
+    Args:
+        cached_rows (list): (date, time, price, available) rows from get_cached_slots
+        scraped_slots (list): Slot dicts from the scraper
+        
+    Returns:
+        dict: 'added' and 'changed' slot dicts, 'removed' (date, time) keys, 'unchanged' count
+    """
+    cached = {
+        _slot_key(row[0], row[1]): (float(row[2]) if row[2] is not None else None, row[3])
+        for row in cached_rows
+    }
+    
+    added, changed, seen = [], [], set()
+    for slot in scraped_slots:
+        key = _slot_key(slot['date'], slot['time'])
+        if key in seen:
+            continue
+        seen.add(key)
+        previous = cached.get(key)
+        if previous is None or not previous[1]:
+            # Never seen, or previously marked unavailable
+            added.append(slot)
+        elif previous[0] != float(slot['price']):
+            changed.append(slot)
+    
+    removed = [key for key, (_, available) in cached.items() if available and key not in seen]
+    
+    return {
+        'added': added,
+        'changed': changed,
+        'removed': removed,
+        'unchanged': len(seen) - len(added) - len(changed)
+    }
+
+
+def sync_slot_cache(db, pitch_type, slots):
+    """
+    Write only the differences between a scrape and the cache
+    
+    Added and removed slots are recorded in public.slot_events in the same
+    transaction, so the app (a different process) can show them.
+    
+    Args:
+        db: DatabaseHandler instance
+        pitch_type (str): Pitch type that was scraped
+        slots (list): Slot dicts from the scraper (must be non-empty)
+        
+    Returns:
+        dict: Counts of added, changed, removed and unchanged slots, or None on failure
+    """
+    diff = diff_slots(db.get_cached_slots(pitch_type), slots)
+    
+    # New and re-priced slots are fresh observations for the price index
+    observations = price_observations(diff['added'] + diff['changed'])
+    if not db.apply_slot_diff(pitch_type, diff['added'], diff['changed'], diff['removed'], len(slots),
+                              price_observations=observations):
+        return None
+    
+    return {
+        'added': len(diff['added']),
+        'changed': len(diff['changed']),
+        'removed': len(diff['removed']),
+        'unchanged': diff['unchanged']
+    }
+
+
+class AdaptiveScrapePolicy:
+    """Decides how soon each pitch type should be scraped again"""
+    
+    def __init__(self, db, scrape_config=None, booking_config=None):
+        """
+        Initialize the policy
+        
+        Args:
+            db: DatabaseHandler instance
+            scrape_config (dict): Overrides get_scrape_config()
+            booking_config (dict): Overrides get_booking_config()
+        """
+        self.db = db
+        self.config = scrape_config or get_scrape_config()
+        self.half_pitch_threshold = (booking_config or get_booking_config())['half_pitch_threshold']
+    
+    def assess(self):
+        """
+        Read the signals shared by every pitch type (one read per tick)
+        
+        Returns:
+            dict: week, signup_count, is_booked, near_threshold
+        """
+        week = get_current_week()
+        signup_count = self.db.get_signup_count(week)
+        is_booked = self.db.check_booking_exists(week)
+        return {
+            'week': week,
+            'signup_count': signup_count,
+            'is_booked': is_booked,
+            'near_threshold': (not is_booked and
+                               signup_count >= self.half_pitch_threshold - self.config['near_threshold_margin'])
+        }
+    
+    def target_slot_count(self, pitch_type):
+        """Number of cached available slots for the target week"""
+        week_start, week_end = get_next_week_range()
+        count = 0
+        for slot in self.db.get_available_slots(pitch_type):
+            slot_date = slot[1] if hasattr(slot[1], 'year') else None
+            if slot_date and week_start <= slot_date <= week_end:
+                count += 1
+        return count
+    
+    def next_interval(self, pitch_type, signals, consecutive_errors=0):
+        """
+        Work out the delay before the next scrape of a pitch type
+        
+        Signups and scarcity only speed up the pitch type that gets booked;
+        other pitch types are scraped at the idle interval.
+        
+        Args:
+            pitch_type (str): Pitch type being scheduled
+            signals (dict): Output of assess()
+            consecutive_errors (int): Failed scrapes in a row for this pitch type
+            
+        Returns:
+            tuple: (interval_minutes, urgency) where urgency is 'hot', 'warm' or 'idle'
+        """
+        booked_type = pitch_type == BOOKED_PITCH_TYPE
+        if booked_type and signals['near_threshold']:
+            urgency = 'hot'
+            interval = self.config['hot_interval_minutes']
+        elif (booked_type and not signals['is_booked']
+              and self.target_slot_count(pitch_type) < self.config['scarce_slot_count']):
+            urgency = 'warm'
+            interval = self.config['warm_interval_minutes']
+        else:
+            urgency = 'idle'
+            interval = self.config['idle_interval_minutes']
+        
+        # Exponential backoff on repeated failures, never slower than idle
+        if consecutive_errors:
+            interval = min(interval * (2 ** consecutive_errors), self.config['idle_interval_minutes'])
+            interval = max(interval, self.config['hot_interval_minutes'])
+        
+        # Jitter so replicas and pitch types don't scrape in lockstep
+        jitter = self.config['jitter_fraction']
+        interval *= random.uniform(1 - jitter, 1 + jitter)
+        
+        return round(interval, 2), urgency
+
 
 class ScraperService:
     """Background service for scraping pitch availability"""
     
-    def __init__(self, db, scrape_interval_minutes=5):
+    def __init__(self, db, scrape_interval_minutes=None, pitch_types=None):
         """
         Initialize the scraper service
         
         Args:
             db: DatabaseHandler instance
-            scrape_interval_minutes (int): How often to scrape
+            scrape_interval_minutes (int): Fixed interval (disables adaptive scheduling)
+            pitch_types (list): Extra pitch types to scrape (defaults to scrape config);
+                                BOOKED_PITCH_TYPE is always included
         """
         self.db = db
+        self.policy = AdaptiveScrapePolicy(db)
         self.scrape_interval = scrape_interval_minutes
+        self.pitch_types = scheduled_pitch_types(pitch_types or self.policy.config['pitch_types'])
         self.running = False
         self.thread = None
         self.last_scrape_time = None
         self.scrape_count = 0
         self.error_count = 0
+        
+        # Per pitch type scheduling state
+        self.next_due = {pitch_type: datetime.now() for pitch_type in self.pitch_types}
+        self.consecutive_errors = {pitch_type: 0 for pitch_type in self.pitch_types}
+        self.intervals = {pitch_type: None for pitch_type in self.pitch_types}
+        self.urgency = {pitch_type: None for pitch_type in self.pitch_types}
+        
+        # Lifecycle - the thread sleeps on _wake until the next due time, no polling
+        self._wake = Event()
+        self._run_lock = Lock()
+        self.last_run_duration = None
+        self.last_queue_lag = None
+        self.skipped_overlaps = 0
     
-    def update_availability_cache(self):
-        """Scrape and cache available slots for all pitch types"""
+    def update_availability_cache(self, pitch_types=None):
+        """
+        Scrape and cache available slots
+        
+        Args:
+            pitch_types (list): Pitch types to scrape, or None for all
+            
+        Returns:
+            dict: pitch_type -> True if the scrape succeeded
+        """
+        pitch_types = pitch_types or self.pitch_types
+        outcomes = {pitch_type: False for pitch_type in pitch_types}
+        
         try:
             st.info(f"Starting availability scrape at {datetime.now().strftime('%H:%M:%S')}")
             
-            with MerkyFCBookingBot(headless=True) as bot:
-                # Scrape both pitch types
-                for pitch_type in ['half_pitch', 'full_pitch']:
+            with MerkyFCBookingBot(headless=True, profile='lean') as bot:
+                for pitch_type in pitch_types:
                     try:
                         slots = bot.scrape_available_times(pitch_type)
                         
                         if slots:
-                            self.db.cache_available_slots(slots)
-                            st.success(f"Cached {len(slots)} slots for {pitch_type}")
+                            changes = sync_slot_cache(self.db, pitch_type, slots)
+                            if changes:
+                                outcomes[pitch_type] = True
+                                st.success(f"Synced {len(slots)} slots for {pitch_type} "
+                                           f"(+{changes['added']} / -{changes['removed']} / ~{changes['changed']})")
                         else:
                             st.warning(f"No slots found for {pitch_type}")
                             
@@ -56,59 +269,178 @@ class ScraperService:
         except Exception as e:
             st.error(f"Scraper error: {str(e)}")
             self.error_count += 1
+        
+        return outcomes
     
-    def start_background_scraper(self):
-        """Start the background scraping service"""
-        if self.running:
-            st.warning("Scraper service already running")
-            return
+    def _reschedule(self, outcomes):
+        """Set the next due time for each scraped pitch type"""
+        try:
+            signals = self.policy.assess()
+        except Exception as e:
+            # Without signals we can't judge urgency - treat it like a failure
+            st.warning(f"Could not read scheduling signals: {str(e)}")
+            signals = {'near_threshold': False, 'is_booked': True}
         
-        self.running = True
+        for pitch_type, succeeded in outcomes.items():
+            self.consecutive_errors[pitch_type] = 0 if succeeded else self.consecutive_errors[pitch_type] + 1
+            
+            if self.scrape_interval:
+                interval, urgency = self.scrape_interval, 'fixed'
+            else:
+                interval, urgency = self.policy.next_interval(
+                    pitch_type, signals, self.consecutive_errors[pitch_type]
+                )
+            
+            self.intervals[pitch_type] = interval
+            self.urgency[pitch_type] = urgency
+            self.next_due[pitch_type] = datetime.now() + timedelta(minutes=interval)
+    
+    def run_due_scrapes(self):
+        """
+        Scrape the pitch types whose next scrape is due (one browser for all of them)
+        
+        Never overlaps with another run on this instance.
         
-        # Schedule scraping every N minutes
-        schedule.every(self.scrape_interval).minutes.do(self.update_availability_cache)
+        Returns:
+            bool: False if skipped because a run was already in progress
+        """
+        if not self._run_lock.acquire(blocking=False):
+            self.skipped_overlaps += 1
+            return False
         
-        # Also run once immediately
-        self.update_availability_cache()
+        try:
+            now = datetime.now()
+            due = [pitch_type for pitch_type in self.pitch_types if self.next_due[pitch_type] <= now]
+            if not due:
+                return True
+            
+            # Queue lag: how late the most overdue pitch type started
+            self.last_queue_lag = (now - min(self.next_due[p] for p in due)).total_seconds()
+            started = time.perf_counter()
+            
+            outcomes = self.update_availability_cache(due)
+            self._reschedule(outcomes)
+            
+            self.last_run_duration = time.perf_counter() - started
+            return True
+        finally:
+            self._run_lock.release()
+    
+    def _seconds_until_next_due(self):
+        """Seconds until the earliest pitch type is due (0 if overdue)"""
+        earliest = min(self.next_due.values())
+        return max(0.0, (earliest - datetime.now()).total_seconds())
+    
+    def _run_loop(self):
+        """Sleep until the next due scrape (or a wake-up), then run it"""
+        while self.running:
+            self._wake.wait(timeout=self._seconds_until_next_due())
+            self._wake.clear()
+            if not self.running:
+                break
+            try:
+                self.run_due_scrapes()
+            except Exception as e:
+                st.error(f"Scraper run failed: {str(e)}")
+                self.error_count += 1
+                # Don't spin on a run that fails before it can reschedule
+                retry_at = datetime.now() + timedelta(minutes=self.policy.config['hot_interval_minutes'])
+                for pitch_type, due_at in self.next_due.items():
+                    if due_at <= datetime.now():
+                        self.next_due[pitch_type] = retry_at
+    
+    def start_background_scraper(self, run_immediately=True):
+        """
+        Start the background scraping thread owned by this instance
+        
+        Args:
+            run_immediately (bool): Scrape every pitch type straight away
+        """
+        if self.running:
+            st.warning("Scraper service already running")
+            return
         
-        def run_scheduler():
-            """Run the scheduler in a loop"""
-            while self.running:
-                schedule.run_pending()
-                time.sleep(1)
+        if run_immediately:
+            for pitch_type in self.pitch_types:
+                self.next_due[pitch_type] = datetime.now()
         
-        # Start scheduler in daemon thread
-        self.thread = Thread(target=run_scheduler, daemon=True)
+        self.running = True
+        self._wake.clear()
+        self.thread = Thread(target=self._run_loop, name='scraper-service', daemon=True)
         self.thread.start()
         
-        st.success(f"Background scraper started (every {self.scrape_interval} minutes)")
+        mode = f"every {self.scrape_interval} minutes" if self.scrape_interval else "adaptive intervals"
+        st.success(f"Background scraper started ({mode})")
     
-    def stop_background_scraper(self):
-        """Stop the background scraping service"""
+    def stop_background_scraper(self, timeout=None):
+        """
+        Stop the background scraping thread
+        
+        A scrape already in progress is allowed to finish.
+        
+        Args:
+            timeout (float): Max seconds to wait for the thread (None waits for the current run)
+            
+        Returns:
+            bool: True if the thread has exited
+        """
         self.running = False
+        self._wake.set()
         if self.thread:
-            self.thread.join(timeout=2)
+            self.thread.join(timeout=timeout)
+            if self.thread.is_alive():
+                st.warning("Background scraper is still finishing its current run")
+                return False
+            self.thread = None
         st.info("Background scraper stopped")
+        return True
+    
+    def is_stopping(self):
+        """Whether a stopped background thread is still finishing its last run"""
+        return not self.running and self.thread is not None and self.thread.is_alive()
     
     def get_status(self):
         """Get scraper service status"""
         return {
             'running': self.running,
+            'in_progress': self._run_lock.locked(),
             'last_scrape': self.last_scrape_time,
             'scrape_count': self.scrape_count,
             'error_count': self.error_count,
-            'interval_minutes': self.scrape_interval
+            'interval_minutes': self.scrape_interval,
+            'last_run_duration_seconds': round(self.last_run_duration, 2) if self.last_run_duration is not None else None,
+            'last_queue_lag_seconds': round(self.last_queue_lag, 2) if self.last_queue_lag is not None else None,
+            'skipped_overlaps': self.skipped_overlaps,
+            'next_wakeup': min(self.next_due.values()),
+            'pitch_types': {
+                pitch_type: {
+                    'urgency': self.urgency[pitch_type],
+                    'interval_minutes': self.intervals[pitch_type],
+                    'next_due': self.next_due[pitch_type],
+                    'consecutive_errors': self.consecutive_errors[pitch_type]
+                }
+                for pitch_type in self.pitch_types
+            }
         }
     
     def force_update(self):
-        """Force an immediate update"""
+        """
+        Force an immediate update of every pitch type
+        
+        With the background thread running this just wakes it (a run already in
+        progress is followed by the forced one). Otherwise the scrape runs inline.
+        
+        Returns:
+            bool: False if an inline run was skipped because one was in progress
+        """
+        for pitch_type in self.pitch_types:
+            self.next_due[pitch_type] = datetime.now()
+        
         if self.running:
-            # Cancel pending jobs and reschedule
-            schedule.clear()
-            schedule.every(self.scrape_interval).minutes.do(self.update_availability_cache)
+            self._wake.set()
+            return True
         
-        # Run update now
-        self.update_availability_cache()
+        return self.run_due_scrapes()
 
 
 # Streamlit-specific initialization using cache_resource
@@ -123,7 +455,7 @@ def get_scraper_service(_db):
     Returns:
         ScraperService: The service instance
     """
-    service = ScraperService(_db, scrape_interval_minutes=5)
+    service = ScraperService(_db)
     
     # Auto-start the service
     try:
@@ -141,29 +473,32 @@ def scrape_now(db, pitch_types=None):
     
     Args:
         db: DatabaseHandler instance
-        pitch_types (list): List of pitch types to scrape, or None for all
+        pitch_types (list): List of pitch types to scrape, or None for all scheduled ones
         
     Returns:
         dict: Results for each pitch type
     """
     if pitch_types is None:
-        pitch_types = ['half_pitch', 'full_pitch']
+        pitch_types = scheduled_pitch_types()
     
     results = {}
     
     try:
-        with MerkyFCBookingBot(headless=True) as bot:
+        with MerkyFCBookingBot(headless=True, profile='lean') as bot:
             for pitch_type in pitch_types:
                 try:
                     slots = bot.scrape_available_times(pitch_type)
                     
                     if slots:
-                        db.cache_available_slots(slots)
+                        changes = sync_slot_cache(db, pitch_type, slots)
                         results[pitch_type] = {
-                            'success': True,
+                            'success': changes is not None,
                             'slot_count': len(slots),
-                            'slots': slots
+                            'slots': slots,
+                            'changes': changes
                         }
+                        if changes is None:
+                            results[pitch_type]['error'] = "Failed to update slot cache"
                     else:
                         results[pitch_type] = {
                             'success': False,
@@ -180,3 +515,157 @@ def scrape_now(db, pitch_types=None):
         return None
     
     return results
+
+
+# Advisory lock key shared by every scraper worker - whoever holds it is the leader
+SCRAPER_LEADER_LOCK_KEY = 72011501
+
+
+class ScraperWorker:
+    """
+    Standalone scraper process with leader election
+    
+    Any number of replicas can run this; the one holding the Postgres advisory
+    lock scrapes, the others stand by and take over if the leader disappears.
+    Every worker heartbeats its role and status to public.scraper_status.
+    """
+    
+    def __init__(self, db, lock_db):
+        """
+        Initialize the worker
+        
+        Args:
+            db: DatabaseHandler used only by the scraper thread
+            lock_db: Dedicated DatabaseHandler whose connection holds the leader lock;
+                     the worker's own heartbeat/control queries also go through it
+        """
+        self.db = db
+        self.lock_db = lock_db
+        self.service = ScraperService(db)
+        self.config = get_scrape_config()
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        self.is_leader = False
+        self.last_handled_request = None
+        self.stop_event = Event()
+    
+    def _update_leadership(self):
+        """Keep or acquire the leader lock, starting/stopping the scraper to match"""
+        if self.is_leader and not self.lock_db.holds_advisory_lock(SCRAPER_LEADER_LOCK_KEY):
+            print(f"[{self.worker_id}] Lost scraper leadership")
+            self.is_leader = False
+            # Signal the stop without waiting: the tick must keep heartbeating as
+            # standby while a scrape in progress winds down
+            self.service.stop_background_scraper(timeout=0)
+        
+        if self.service.is_stopping():
+            # Not eligible again until the old scraper thread has exited
+            return
+        
+        if not self.is_leader:
+            try:
+                self.is_leader = self.lock_db.try_advisory_lock(SCRAPER_LEADER_LOCK_KEY)
+            except Exception as e:
+                print(f"[{self.worker_id}] Leader election failed: {e}")
+                self.is_leader = False
+            if self.is_leader:
+                print(f"[{self.worker_id}] Elected scraper leader")
+                # Don't replay requests that were served by the previous leader
+                self.last_handled_request = self.lock_db.get_scrape_request()
+                self.service.start_background_scraper()
+    
+    def _heartbeat(self):
+        """Write this worker's role and scraper status"""
+        if self.is_leader:
+            details = self.service.get_status()
+        else:
+            details = {'winding_down': True} if self.service.is_stopping() else {}
+        self.lock_db.record_scraper_heartbeat(
+            self.worker_id, socket.gethostname(), os.getpid(),
+            'leader' if self.is_leader else 'standby', details
+        )
+    
+    def tick(self):
+        """One worker iteration: election, manual scrape requests, heartbeat"""
+        self._update_leadership()
+        
+        if self.is_leader:
+            requested_at = self.lock_db.get_scrape_request()
+            if requested_at and requested_at != self.last_handled_request:
+                self.last_handled_request = requested_at
+                self.service.force_update()
+        
+        self._heartbeat()
+    
+    def run(self):
+        """Run until SIGTERM/SIGINT"""
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.stop_event.set())
+        signal.signal(signal.SIGINT, lambda signum, frame: self.stop_event.set())
+        print(f"[{self.worker_id}] Scraper worker started")
+        
+        while not self.stop_event.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                print(f"[{self.worker_id}] Worker tick failed: {e}")
+            self.stop_event.wait(self.config['worker_heartbeat_seconds'])
+        
+        # Let any scrape in progress finish, then hand over leadership straight away
+        # instead of waiting for the connection to drop
+        if self.is_leader:
+            self.service.stop_background_scraper()
+            try:
+                self.lock_db.release_advisory_lock(SCRAPER_LEADER_LOCK_KEY)
+            except Exception:
+                pass
+        self.is_leader = False
+        self.lock_db.record_scraper_heartbeat(self.worker_id, socket.gethostname(), os.getpid(), 'stopped', {})
+        print(f"[{self.worker_id}] Scraper worker stopped")
+
+
+def get_worker_status(db):
+    """
+    Summarise scraper workers for the app (read-only)
+    
+    Args:
+        db: DatabaseHandler instance
+        
+    Returns:
+        dict: 'leader' (row dict or None), 'workers' (list of row dicts), 'alive' (bool)
+    """
+    stale_seconds = get_scrape_config()['worker_stale_seconds']
+    columns = ['worker_id', 'hostname', 'pid', 'role', 'started_at', 'last_heartbeat', 'details',
+               'heartbeat_age_seconds']
+    workers = [dict(zip(columns, row)) for row in db.get_scraper_status()]
+    
+    # Ages come from the database clock, not this process's
+    for worker in workers:
+        worker['alive'] = worker['role'] != 'stopped' and worker['heartbeat_age_seconds'] < stale_seconds
+    
+    leader = next((w for w in workers if w['role'] == 'leader' and w['alive']), None)
+    return {
+        'leader': leader,
+        'workers': workers,
+        'alive': any(w['alive'] for w in workers)
+    }
+
+
+def main():
+    """Entry point: `PYTHONPATH=src python -m scraper_service` from the repo root"""
+    from database import DatabaseHandler
+    
+    db = DatabaseHandler(environment='live')
+    lock_db = DatabaseHandler(environment='live')
+    for table_file in ('create_available_slots_cache.sql', 'create_slot_scrape_log.sql',
+                       'create_slot_events_table.sql', 'create_scraper_status_table.sql'):
+        db.create_tables(table_file)
+    
+    worker = ScraperWorker(db, lock_db)
+    try:
+        worker.run()
+    finally:
+        db.close_connection()
+        lock_db.close_connection()
+
+
+if __name__ == '__main__':
+    main()
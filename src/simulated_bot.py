@@ -0,0 +1,224 @@
+"""
+Simulated booking bot - a dry-run stand-in for MerkyFCBookingBot
+
+Drop-in for BookingManager(bot_factory=...) so the signup -> threshold -> booking
+-> DB insert -> notify pipeline can be exercised without touching Merky FC HQ.
+"""
+
+import itertools
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+
+class SimulatedBookingBot:
+    """Same interface as MerkyFCBookingBot, with configurable latency and failures"""
+
+    # Shared across instances so simulated confirmation numbers stay unique
+    _booking_numbers = itertools.count(1)
+
+    def __init__(self, headless=True, profile='full', latency_seconds=None, failure_rate=0.0,
+                 slots_per_day=4, rng=None):
+        """
+        Initialize the simulated bot
+
+        Args:
+            headless (bool): Ignored (kept for interface compatibility)
+            profile (str): Browser profile name, recorded in stats only
+            latency_seconds (dict): Per-step latency, keys 'start', 'scrape', 'book'
+            failure_rate (float): Probability [0, 1] that a scrape or booking fails
+            slots_per_day (int): Third-pitch slots generated per evening
+            rng (random.Random): Random source (seed it for repeatable runs)
+        """
+        self.headless = headless
+        self.profile = profile
+        self.latency_seconds = dict({'start': 0.0, 'scrape': 0.0, 'book': 0.0}, **(latency_seconds or {}))
+        self.failure_rate = failure_rate
+        self.slots_per_day = slots_per_day
+        self.rng = rng or random.Random()
+        self.started = False
+        self.prepared = None
+        self.startup_stats = {}
+        self.last_trace = None
+
+    def _start(self):
+        """Simulate the browser launch once per bot"""
+        if not self.started:
+            time.sleep(self.latency_seconds['start'])
+            self.started = True
+            self.startup_stats = {'driver_source': 'simulated', 'launch_seconds': self.latency_seconds['start']}
+
+    def _fails(self):
+        return self.rng.random() < self.failure_rate
+
+    def scrape_available_times(self, pitch_type='half_pitch'):
+        """
+        Generate availability for the next two weeks
+
+        Returns:
+            list: Slot dicts in scrape format ([] on a simulated failure)
+        """
+        self._start()
+        time.sleep(self.latency_seconds['scrape'])
+        if self._fails():
+            return []
+
+        base_date = datetime.now().date()
+        price = 80.0 if pitch_type == 'half_pitch' else 150.0 if pitch_type == 'full_pitch' else 55.0
+        slots = []
+        for day_offset in range(1, 15):
+            date = (base_date + timedelta(days=day_offset)).strftime('%Y-%m-%d')
+            for hour in range(18, 18 + self.slots_per_day):
+                # Third pitches come in threes at each kick-off
+                for _ in range(3 if pitch_type == 'third_pitch' else 1):
+                    slots.append({
+                        'date': date,
+                        'time': f"{hour:02d}:00",
+                        'price': price,
+                        'pitch_type': pitch_type,
+                        'available': True
+                    })
+        return slots
+
+    def prepare_booking(self, pitch_type, user_credentials=None):
+        """Simulate warming a logged-in session"""
+        self._start()
+        self.prepared = {'pitch_type': pitch_type, 'logged_in': bool(user_credentials),
+                         'prepared_at': datetime.now()}
+        return True
+
+    def is_prepared_for(self, pitch_type):
+        return self.prepared is not None and self.prepared['pitch_type'] == pitch_type
+
+    def book_pitch(self, date, slot_time, pitch_type, user_credentials=None):
+        """
+        Simulate a booking
+
+        Returns:
+            dict: Confirmation details, or None on a simulated failure
+        """
+        warm = self.is_prepared_for(pitch_type)
+        self.prepared = None
+        self._start()
+        time.sleep(self.latency_seconds['book'] * (0.5 if warm else 1))
+        if self._fails():
+            return None
+
+        booking_number = next(self._booking_numbers)
+        return {
+            'confirmation_number': f"SIM-{datetime.now().strftime('%Y%m%d%H%M%S')}-{booking_number}",
+            'status': 'confirmed',
+            'timestamp': datetime.now().isoformat(),
+            'simulated': True
+        }
+
+    def close(self):
+        self.started = False
+        self.prepared = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def make_simulated_bot_factory(latency_seconds=None, failure_rate=0.0, seed=None):
+    """
+    Build a bot factory producing SimulatedBookingBot instances
+
+    Args:
+        latency_seconds (dict): Per-step latency, keys 'start', 'scrape', 'book'
+        failure_rate (float): Probability that a scrape or booking fails
+        seed (int): Seed for repeatable failure patterns
+
+    Returns:
+        callable: factory(headless=True, profile='full') -> SimulatedBookingBot
+    """
+    rng = random.Random(seed)
+
+    def factory(headless=True, profile='full'):
+        return SimulatedBookingBot(headless=headless, profile=profile, latency_seconds=latency_seconds,
+                                   failure_rate=failure_rate, rng=random.Random(rng.random()))
+
+    return factory
+
+
+def benchmark_booking_pipeline(db, n_weeks=10, players_per_week=18, latency_seconds=None,
+                               failure_rate=0.0, notify=None, seed=0, cleanup=True):
+    """
+    Drive signup -> threshold -> booking -> DB insert -> notify against the simulated bot
+
+    Writes signups, bookings and booking state for weeks named SIM-0001,
+    SIM-0002, ... and players with @simulated.invalid emails (all removed again
+    when cleanup is set). Slots come straight from the simulated bot: the shared
+    slot cache and price index are neither read nor written.
+
+    Args:
+        db: DatabaseHandler instance
+        n_weeks (int): Weeks to simulate
+        players_per_week (int): Signups per week
+        latency_seconds (dict): Simulated bot latency, keys 'start', 'scrape', 'book'
+        failure_rate (float): Simulated scrape/booking failure probability
+        notify (callable): Called with the booking details of each booking (default: no-op)
+        seed (int): Seed for the simulated failures
+        cleanup (bool): Delete the simulated weeks and players afterwards
+
+    Returns:
+        dict: Booked/failed counts and per-stage p50/p95/max timings in seconds
+    """
+    from booking_manager import BookingManager, booking_details_from_result
+
+    manager = BookingManager(db, auto_book_enabled=True, use_slot_cache=False, bot_factory=make_simulated_bot_factory(
+        latency_seconds=latency_seconds, failure_rate=failure_rate, seed=seed))
+    notify = notify or (lambda booking_details: None)
+
+    timings = {'signups': [], 'threshold': [], 'booking': [], 'notify': [], 'total': []}
+    outcomes = {'booked': 0, 'failed': 0}
+
+    try:
+        player_ids = []
+        for i in range(players_per_week):
+            email = f"sim-player-{i}@simulated.invalid"
+            existing = db.get_player_id(email)
+            player_ids.append(existing[0] if existing else db.add_player_signup(f"Sim Player {i}", email))
+
+        for week_number in range(1, n_weeks + 1):
+            week = f"SIM-{week_number:04d}"
+            started = time.perf_counter()
+
+            stage = time.perf_counter()
+            for player_id in player_ids:
+                db.add_weekly_signups(f"player {player_id}", week, player_id, show_message=False)
+            timings['signups'].append(time.perf_counter() - stage)
+
+            stage = time.perf_counter()
+            status = manager.get_booking_status(week)
+            timings['threshold'].append(time.perf_counter() - stage)
+
+            stage = time.perf_counter()
+            result = manager.check_and_book(week) if status['status'] in ('ready_half', 'ready_full') else None
+            timings['booking'].append(time.perf_counter() - stage)
+
+            if result and result.get('slot'):
+                outcomes['booked'] += 1
+                stage = time.perf_counter()
+                notify(booking_details_from_result(result))
+                timings['notify'].append(time.perf_counter() - stage)
+            else:
+                outcomes['failed'] += 1
+
+            timings['total'].append(time.perf_counter() - started)
+    finally:
+        if cleanup:
+            db.delete_simulated_weeks()
+
+    summary = dict(outcomes, weeks=n_weeks, players_per_week=players_per_week)
+    for stage_name, values in timings.items():
+        if values:
+            values = sorted(values)
+            summary[f"{stage_name}_p50"] = round(statistics.median(values), 4)
+            summary[f"{stage_name}_p95"] = round(values[min(len(values) - 1, int(len(values) * 0.95))], 4)
+            summary[f"{stage_name}_max"] = round(values[-1], 4)
+    return summary
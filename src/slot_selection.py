@@ -0,0 +1,252 @@
+"""
+Slot selection engine - indexes available slots and scores them against booking preferences
+"""
+
+import random
+import time
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+
+
+DEFAULT_WEIGHTS = {
+    'time': 0.5,      # Closeness to the preferred kick-off time
+    'day': 0.2,       # Falls on a preferred weekday
+    'price': 0.2,     # Cheaper than the other candidates
+    'pairing': 0.1    # Spare pitches at the same date/time
+}
+
+# A kick-off this many minutes or more from the preferred time scores 0 on time
+MAX_TIME_DISTANCE_MINUTES = 6 * 60
+
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+
+def parse_slot_datetime(slot):
+    """Parse a slot's date and time once, returning None for malformed slots"""
+    try:
+        slot_date = slot['date']
+        slot_time = slot['time']
+        if not isinstance(slot_date, date):
+            slot_date = date.fromisoformat(str(slot_date)[:10])
+        if hasattr(slot_time, 'hour'):
+            hour, minute = slot_time.hour, slot_time.minute
+        else:
+            hour, minute = (int(part) for part in str(slot_time).split(':')[:2])
+        return datetime(slot_date.year, slot_date.month, slot_date.day, hour, minute)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class SlotIndex:
+    """Available slots sorted by kick-off, grouped by (date, time) with pitch counts"""
+
+    def __init__(self, slots):
+        """
+        Build the index (one parse per slot, one sort)
+
+        Args:
+            slots (list): Slot dicts with 'date', 'time', 'pitch_type', 'price'
+        """
+        groups = {}
+        for slot in slots:
+            kick_off = parse_slot_datetime(slot)
+            if kick_off is not None:
+                groups.setdefault(kick_off, []).append(slot)
+
+        self.kick_offs = sorted(groups)
+        self.groups = groups
+        for pitches in self.groups.values():
+            pitches.sort(key=lambda s: s.get('price') or 0)
+
+    def __len__(self):
+        return len(self.kick_offs)
+
+    def between(self, start, end):
+        """
+        Kick-off times within [start, end]
+
+        Args:
+            start (date|datetime): Window start
+            end (date|datetime): Window end (a date includes the whole day)
+
+        Returns:
+            list: datetimes in order
+        """
+        if not isinstance(start, datetime):
+            start = datetime(start.year, start.month, start.day)
+        if not isinstance(end, datetime):
+            end = datetime(end.year, end.month, end.day) + timedelta(days=1) - timedelta(microseconds=1)
+        return self.kick_offs[bisect_left(self.kick_offs, start):bisect_right(self.kick_offs, end)]
+
+    def pitches_at(self, kick_off):
+        """Slots at a kick-off time, cheapest first"""
+        return self.groups.get(kick_off, [])
+
+
+class SlotSelector:
+    """Weighted multi-criteria choice of the best single slot or same-time pair"""
+
+    def __init__(self, preferred_time='19:00', preferred_days=None, weights=None):
+        """
+        Initialize the selector
+
+        Args:
+            preferred_time (str): Preferred kick-off, "HH:MM"
+            preferred_days (list): Preferred weekday names; empty means any day
+            weights (dict): Criterion weights, see DEFAULT_WEIGHTS
+        """
+        hour, minute = (int(part) for part in preferred_time.split(':')[:2])
+        self.preferred_minutes = hour * 60 + minute
+        self.preferred_weekdays = {WEEKDAYS.index(day.strip().lower())
+                                   for day in (preferred_days or [])
+                                   if day.strip().lower() in WEEKDAYS}
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+
+    def score(self, kick_off, pitches, needed, price_range):
+        """
+        Score a kick-off time (higher is better)
+
+        Args:
+            kick_off (datetime): Kick-off time
+            pitches (list): Slots available at that time, cheapest first
+            needed (int): Pitches to book (1 or 2)
+            price_range (tuple): (min, max) total price across candidates
+
+        Returns:
+            float: Weighted score in [0, 1]
+        """
+        distance = abs(kick_off.hour * 60 + kick_off.minute - self.preferred_minutes)
+        time_score = 1 - min(distance, MAX_TIME_DISTANCE_MINUTES) / MAX_TIME_DISTANCE_MINUTES
+
+        day_score = 1.0 if not self.preferred_weekdays or kick_off.weekday() in self.preferred_weekdays else 0.0
+
+        low, high = price_range
+        price = sum(slot.get('price') or 0 for slot in pitches[:needed])
+        price_score = 1.0 if high == low else 1 - (price - low) / (high - low)
+
+        # Spare pitches beyond what we book leave room to upgrade or recover from a failed booking
+        pairing_score = min(len(pitches) - needed, 1)
+
+        return (self.weights['time'] * time_score +
+                self.weights['day'] * day_score +
+                self.weights['price'] * price_score +
+                self.weights['pairing'] * pairing_score)
+
+    def rank(self, index, needed=1, start=None, end=None):
+        """
+        Rank kick-off times that have at least `needed` pitches
+
+        Args:
+            index (SlotIndex): Indexed slots
+            needed (int): Pitches required at the same time
+            start (date): Optional window start
+            end (date): Optional window end
+
+        Returns:
+            list: (score, kick_off, pitches) best first; ties go to the earlier kick-off
+        """
+        kick_offs = index.between(start, end) if start and end else index.kick_offs
+        candidates = [(kick_off, index.pitches_at(kick_off)) for kick_off in kick_offs
+                      if len(index.pitches_at(kick_off)) >= needed]
+        if not candidates:
+            return []
+
+        prices = [sum(slot.get('price') or 0 for slot in pitches[:needed]) for _, pitches in candidates]
+        price_range = (min(prices), max(prices))
+
+        ranked = [(self.score(kick_off, pitches, needed, price_range), kick_off, pitches)
+                  for kick_off, pitches in candidates]
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+        return ranked
+
+    def best_single(self, index, start=None, end=None):
+        """
+        Best single slot
+
+        Returns:
+            dict: Slot or None
+        """
+        ranked = self.rank(index, needed=1, start=start, end=end)
+        return ranked[0][2][0] if ranked else None
+
+    def best_pair(self, index, start=None, end=None):
+        """
+        Best two pitches at the same date/time
+
+        Returns:
+            list: Two slots (cheapest at the winning time) or None
+        """
+        ranked = self.rank(index, needed=2, start=start, end=end)
+        return ranked[0][2][:2] if ranked else None
+
+
+def generate_synthetic_slots(n_slots, start=None, seed=0):
+    """
+    Random slots spread over four weeks, for benchmarking
+
+    Args:
+        n_slots (int): Number of slots
+        start (date): First day (defaults to today)
+        seed (int): Random seed
+
+    Returns:
+        list: Slot dicts in scrape format
+    """
+    rng = random.Random(seed)
+    start = start or datetime.now().date()
+    return [
+        {
+            'date': (start + timedelta(days=rng.randrange(28))).strftime('%Y-%m-%d'),
+            'time': f"{rng.randrange(8, 23):02d}:{rng.choice(['00', '30'])}",
+            'pitch_type': 'third_pitch',
+            'price': float(rng.choice([45, 50, 55, 60, 65])),
+            'available': True
+        }
+        for _ in range(n_slots)
+    ]
+
+
+def benchmark_slot_selection(slot_counts=(1000, 5000, 20000), repeats=5):
+    """
+    Time index build and single/pair selection at increasing slot counts
+
+    Args:
+        slot_counts (tuple): Slot counts to measure
+        repeats (int): Runs per count (best run is reported)
+
+    Returns:
+        list: One dict of timings (milliseconds) per slot count
+    """
+    selector = SlotSelector(preferred_time='19:00', preferred_days=['tuesday', 'wednesday'])
+    today = datetime.now().date()
+    week_start = today + timedelta(days=(7 - today.weekday()))
+    week_end = week_start + timedelta(days=6)
+    results = []
+
+    for n_slots in slot_counts:
+        slots = generate_synthetic_slots(n_slots, start=today)
+        timings = {'index_ms': [], 'single_ms': [], 'pair_ms': []}
+        for _ in range(repeats):
+            started = time.perf_counter()
+            index = SlotIndex(slots)
+            timings['index_ms'].append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            selector.best_single(index, week_start, week_end)
+            timings['single_ms'].append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            selector.best_pair(index, week_start, week_end)
+            timings['pair_ms'].append(time.perf_counter() - started)
+
+        results.append(dict(
+            {'slots': n_slots, 'kick_off_times': len(index)},
+            **{name: round(min(values) * 1000, 3) for name, values in timings.items()}
+        ))
+
+    return results
+
+
+if __name__ == '__main__':
+    for row in benchmark_slot_selection():
+        print(row)
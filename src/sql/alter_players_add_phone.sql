@@ -0,0 +1,3 @@
+-- WhatsApp number for direct messages (international format, e.g. +447700900123)
+ALTER TABLE public.players 
+ADD COLUMN IF NOT EXISTS phone TEXT DEFAULT NULL;
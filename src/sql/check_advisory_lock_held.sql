@@ -0,0 +1,12 @@
+-- Is a session advisory lock on this key held by the current connection?
+-- (bigint keys are split into classid = high 32 bits, objid = low 32 bits)
+SELECT EXISTS (
+    SELECT 1
+    FROM pg_locks
+    WHERE locktype = 'advisory'
+      AND granted
+      AND pid = pg_backend_pid()
+      AND classid = (%s >> 32)::oid
+      AND objid = (%s & 4294967295)::oid
+      AND objsubid = 1
+);
@@ -0,0 +1,13 @@
+-- Weeks where the maintained counter disagrees with the signups table
+SELECT 
+    COALESCE(actual.week, counts.week) AS week,
+    COALESCE(counts.signup_count, 0) AS counter_value,
+    COALESCE(actual.signup_count, 0) AS actual_count
+FROM (
+    SELECT week, COUNT(*) AS signup_count
+    FROM public.signups
+    GROUP BY week
+) actual
+FULL OUTER JOIN public.week_signup_counts counts ON counts.week = actual.week
+WHERE COALESCE(counts.signup_count, 0) <> COALESCE(actual.signup_count, 0)
+ORDER BY week;
@@ -0,0 +1,16 @@
+-- Claim the oldest runnable job; concurrent workers skip rows another worker has locked
+UPDATE public.booking_jobs
+SET 
+    status = 'running',
+    attempts = attempts + 1,
+    started_at = CURRENT_TIMESTAMP
+WHERE job_id = (
+    SELECT job_id
+    FROM public.booking_jobs
+    WHERE status = 'queued'
+      AND run_after <= CURRENT_TIMESTAMP
+    ORDER BY run_after, job_id
+    FOR UPDATE SKIP LOCKED
+    LIMIT 1
+)
+RETURNING job_id, week, attempts, max_attempts;
@@ -0,0 +1,16 @@
+-- Claim a batch of due messages; concurrent senders skip rows another one has locked
+UPDATE public.invoice_deliveries
+SET 
+    status = 'sending',
+    attempts = attempts + 1,
+    started_at = CURRENT_TIMESTAMP
+WHERE delivery_id IN (
+    SELECT delivery_id
+    FROM public.invoice_deliveries
+    WHERE status = 'queued'
+      AND run_after <= CURRENT_TIMESTAMP
+    ORDER BY run_after, delivery_id
+    FOR UPDATE SKIP LOCKED
+    LIMIT %s
+)
+RETURNING delivery_id, period, name, phone, message, attempts, max_attempts;
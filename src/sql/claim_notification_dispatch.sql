@@ -0,0 +1,17 @@
+-- Claim the next due message; concurrent dispatchers skip rows another one has locked
+UPDATE public.notification_dispatches
+SET 
+    status = 'sending',
+    attempts = attempts + 1,
+    started_at = CURRENT_TIMESTAMP
+WHERE dispatch_id = (
+    SELECT dispatch_id
+    FROM public.notification_dispatches
+    WHERE status = 'queued'
+      AND due_at <= CURRENT_TIMESTAMP
+      AND expires_at > CURRENT_TIMESTAMP
+    ORDER BY due_at, dispatch_id
+    FOR UPDATE SKIP LOCKED
+    LIMIT 1
+)
+RETURNING dispatch_id, kind, week, session_date, booking_time, pitch_type, attempts, max_attempts;
@@ -0,0 +1,23 @@
+-- Mark the week's booking in progress unless another attempt is live or it's already booked
+-- (an in-progress row older than the stale window is taken over - its owner died - and a
+-- 'booked' week whose bookings have all been cancelled can be booked again)
+INSERT INTO public.week_booking_state (week, status, owner, started_at)
+VALUES (%(week)s, 'in_progress', %(owner)s, CURRENT_TIMESTAMP)
+ON CONFLICT (week) DO UPDATE
+SET 
+    status = 'in_progress',
+    owner = EXCLUDED.owner,
+    started_at = CURRENT_TIMESTAMP,
+    finished_at = NULL,
+    result = NULL
+WHERE week_booking_state.status = 'failed'
+   OR (week_booking_state.status = 'in_progress'
+       AND week_booking_state.started_at < CURRENT_TIMESTAMP - (%(stale_minutes)s * INTERVAL '1 minute'))
+   OR (week_booking_state.status = 'booked'
+       AND NOT EXISTS (
+           SELECT 1
+           FROM public.booking_references b
+           WHERE b.week = week_booking_state.week
+             AND COALESCE(b.status, 'confirmed') != 'cancelled'
+       ))
+RETURNING week;
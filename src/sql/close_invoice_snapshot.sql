@@ -0,0 +1,7 @@
+-- Freeze an open snapshot once its month has closed, if it is still current
+UPDATE public.invoice_snapshots
+SET closed = true
+WHERE period = %(period)s
+  AND format = %(format)s
+  AND source_version = %(source_version)s
+  AND NOT closed;
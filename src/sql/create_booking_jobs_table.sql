@@ -0,0 +1,25 @@
+-- Durable queue of auto-booking jobs, consumed by booking_worker with SKIP LOCKED
+CREATE TABLE IF NOT EXISTS public.booking_jobs (
+    job_id SERIAL PRIMARY KEY,
+    week TEXT NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',  -- queued, running, done, failed
+    trigger TEXT,
+    attempts INT NOT NULL DEFAULT 0,
+    max_attempts INT NOT NULL DEFAULT 3,
+    result JSONB,
+    error TEXT,
+    run_after TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+-- At most one pending job per week - repeated triggers collapse into it
+CREATE UNIQUE INDEX IF NOT EXISTS idx_booking_jobs_pending_week 
+ON public.booking_jobs(week) 
+WHERE status IN ('queued', 'running');
+
+-- Fast claim of the oldest runnable job
+CREATE INDEX IF NOT EXISTS idx_booking_jobs_queued 
+ON public.booking_jobs(run_after) 
+WHERE status = 'queued';
@@ -0,0 +1,27 @@
+-- Per-player invoice direct messages: one ledger row per (period, recipient)
+CREATE TABLE IF NOT EXISTS public.invoice_deliveries (
+    delivery_id SERIAL PRIMARY KEY,
+    period TEXT NOT NULL,                  -- 'YYYY-MM'
+    email_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    phone TEXT,
+    amount DECIMAL(10,2),
+    message TEXT NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',  -- queued, sending, sent, failed, skipped
+    attempts INT NOT NULL DEFAULT 0,
+    max_attempts INT NOT NULL DEFAULT 3,
+    error TEXT,
+    run_after TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    sent_at TIMESTAMP
+);
+
+-- A recipient gets at most one invoice message per period
+CREATE UNIQUE INDEX IF NOT EXISTS idx_invoice_deliveries_recipient 
+ON public.invoice_deliveries(period, email_id);
+
+-- Fast claim of the next batch to send
+CREATE INDEX IF NOT EXISTS idx_invoice_deliveries_queued 
+ON public.invoice_deliveries(run_after) 
+WHERE status = 'queued';
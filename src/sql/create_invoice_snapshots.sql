@@ -0,0 +1,103 @@
+-- Stored invoice reports per (month, format). A snapshot taken after the month
+-- closed is final; an open month's snapshot is reused while its source version holds.
+CREATE TABLE IF NOT EXISTS public.invoice_snapshots (
+    period TEXT NOT NULL,                  -- 'YYYY-MM'
+    format VARCHAR(20) NOT NULL,           -- summary, detailed
+    content_hash TEXT NOT NULL,
+    report JSONB NOT NULL,
+    report_text TEXT NOT NULL,
+    report_csv TEXT NOT NULL,
+    source_version BIGINT NOT NULL,
+    closed BOOLEAN NOT NULL DEFAULT false,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (period, format)
+);
+
+-- Bumped whenever a booking, signup or player feeding a month's invoice changes
+CREATE TABLE IF NOT EXISTS public.invoice_month_versions (
+    period TEXT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE OR REPLACE FUNCTION public.bump_invoice_month_version(target_period TEXT) RETURNS VOID AS $$
+BEGIN
+    INSERT INTO public.invoice_month_versions (period, version)
+    VALUES (target_period, 1)
+    ON CONFLICT (period) DO UPDATE
+    SET version = invoice_month_versions.version + 1, updated_at = CURRENT_TIMESTAMP;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION public.invoice_booking_changed() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') AND OLD.session_date IS NOT NULL THEN
+        PERFORM public.bump_invoice_month_version(to_char(OLD.session_date, 'YYYY-MM'));
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.session_date IS NOT NULL
+       AND (TG_OP = 'INSERT' OR OLD.session_date IS DISTINCT FROM NEW.session_date) THEN
+        PERFORM public.bump_invoice_month_version(to_char(NEW.session_date, 'YYYY-MM'));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- A signup changes the invoice of every month the week was played in
+CREATE OR REPLACE FUNCTION public.invoice_signup_changed() RETURNS TRIGGER AS $$
+DECLARE
+    changed_period TEXT;
+BEGIN
+    FOR changed_period IN
+        SELECT DISTINCT to_char(b.session_date, 'YYYY-MM')
+        FROM public.booking_references b
+        WHERE b.session_date IS NOT NULL
+          AND b.week IN (
+              CASE WHEN TG_OP IN ('DELETE', 'UPDATE') THEN OLD.week END,
+              CASE WHEN TG_OP IN ('INSERT', 'UPDATE') THEN NEW.week END
+          )
+    LOOP
+        PERFORM public.bump_invoice_month_version(changed_period);
+    END LOOP;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Renaming a player, changing their email or who brought them changes who is billed
+-- in every month they (or guests billed to them) played in
+CREATE OR REPLACE FUNCTION public.invoice_player_changed() RETURNS TRIGGER AS $$
+DECLARE
+    changed_period TEXT;
+BEGIN
+    FOR changed_period IN
+        SELECT DISTINCT to_char(b.session_date, 'YYYY-MM')
+        FROM public.signups s
+        JOIN public.booking_references b ON b.week = s.week
+        WHERE b.session_date IS NOT NULL
+          AND (s.player_id = NEW.player_id
+               OR s.player_id IN (SELECT g.player_id FROM public.players g
+                                  WHERE g.brought_by_player_id = NEW.player_id))
+    LOOP
+        PERFORM public.bump_invoice_month_version(changed_period);
+    END LOOP;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_invoice_booking_changed ON public.booking_references;
+CREATE TRIGGER trg_invoice_booking_changed
+AFTER INSERT OR DELETE OR UPDATE ON public.booking_references
+FOR EACH ROW EXECUTE FUNCTION public.invoice_booking_changed();
+
+DROP TRIGGER IF EXISTS trg_invoice_signup_changed ON public.signups;
+CREATE TRIGGER trg_invoice_signup_changed
+AFTER INSERT OR DELETE OR UPDATE ON public.signups
+FOR EACH ROW EXECUTE FUNCTION public.invoice_signup_changed();
+
+DROP TRIGGER IF EXISTS trg_invoice_player_changed ON public.players;
+CREATE TRIGGER trg_invoice_player_changed
+AFTER UPDATE OF name, email_id, brought_by_player_id ON public.players
+FOR EACH ROW
+WHEN (OLD.name IS DISTINCT FROM NEW.name
+      OR OLD.email_id IS DISTINCT FROM NEW.email_id
+      OR OLD.brought_by_player_id IS DISTINCT FROM NEW.brought_by_player_id)
+EXECUTE FUNCTION public.invoice_player_changed();
@@ -0,0 +1,32 @@
+-- Scheduled WhatsApp sends (game reminders, weekly lists), one row per message ever due
+CREATE TABLE IF NOT EXISTS public.notification_dispatches (
+    dispatch_id SERIAL PRIMARY KEY,
+    kind VARCHAR(20) NOT NULL,             -- reminder, weekly_list
+    dispatch_key TEXT NOT NULL,            -- what the message is about, e.g. the session
+    week TEXT NOT NULL,
+    session_date DATE,
+    booking_time TIME,
+    pitch_type VARCHAR(20),
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',  -- queued, sending, sent, failed, expired
+    attempts INT NOT NULL DEFAULT 0,
+    max_attempts INT NOT NULL DEFAULT 3,
+    error TEXT,
+    due_at TIMESTAMP NOT NULL,
+    expires_at TIMESTAMP NOT NULL,          -- kick-off; never sent after this
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    sent_at TIMESTAMP
+);
+
+-- Each message is scheduled once, however often the scheduler sees its session
+CREATE UNIQUE INDEX IF NOT EXISTS idx_notification_dispatches_key 
+ON public.notification_dispatches(kind, dispatch_key);
+
+-- Fast claim of the next due message
+CREATE INDEX IF NOT EXISTS idx_notification_dispatches_queued 
+ON public.notification_dispatches(due_at) 
+WHERE status = 'queued';
+
+-- Upcoming-session range scan for the scheduler
+CREATE INDEX IF NOT EXISTS idx_booking_references_session_date 
+ON public.booking_references(session_date);
@@ -0,0 +1,17 @@
+-- Heartbeats and status of standalone scraper workers (one row per worker process)
+CREATE TABLE IF NOT EXISTS public.scraper_status (
+    worker_id TEXT PRIMARY KEY,
+    hostname TEXT,
+    pid INT,
+    role VARCHAR(20) NOT NULL,
+    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_heartbeat TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    details JSONB
+);
+
+-- Single-row mailbox the app uses to ask the leader for an immediate scrape
+CREATE TABLE IF NOT EXISTS public.scraper_control (
+    control_id INT PRIMARY KEY DEFAULT 1,
+    scrape_requested_at TIMESTAMP,
+    CHECK (control_id = 1)
+);
@@ -0,0 +1,14 @@
+-- Slots that appeared on or vanished from the booking site, written by the scraper
+-- worker with each cache diff so other processes (the app) can read them
+CREATE TABLE IF NOT EXISTS public.slot_events (
+    event_id BIGSERIAL PRIMARY KEY,
+    event_type VARCHAR(10) NOT NULL CHECK (event_type IN ('added', 'removed')),
+    pitch_type VARCHAR(20) NOT NULL,
+    slot_date DATE NOT NULL,
+    slot_time TIME NOT NULL,
+    price DECIMAL(10, 2),
+    recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_slot_events_time_recorded
+    ON public.slot_events (slot_time, recorded_at DESC);
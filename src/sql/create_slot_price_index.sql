@@ -0,0 +1,30 @@
+-- Observed slot prices aggregated by pitch type, ISO weekday (1 = Monday) and kick-off hour
+-- Updated incrementally from each scrape's new/changed slots
+CREATE TABLE IF NOT EXISTS public.slot_price_index (
+    pitch_type VARCHAR(20) NOT NULL,
+    weekday SMALLINT NOT NULL,
+    hour SMALLINT NOT NULL,
+    sample_count INT NOT NULL DEFAULT 0,
+    avg_price DECIMAL(10,2),
+    min_price DECIMAL(10,2),
+    max_price DECIMAL(10,2),
+    last_price DECIMAL(10,2),
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (pitch_type, weekday, hour)
+);
+
+-- Seed from the slot cache the first time the index is created
+INSERT INTO public.slot_price_index (pitch_type, weekday, hour, sample_count, avg_price, min_price, max_price, last_price)
+SELECT 
+    pitch_type,
+    EXTRACT(ISODOW FROM date)::SMALLINT,
+    EXTRACT(HOUR FROM time)::SMALLINT,
+    COUNT(*),
+    AVG(price),
+    MIN(price),
+    MAX(price),
+    (ARRAY_AGG(price ORDER BY scraped_at DESC))[1]
+FROM public.available_slots_cache
+WHERE price > 0
+  AND NOT EXISTS (SELECT 1 FROM public.slot_price_index)
+GROUP BY pitch_type, EXTRACT(ISODOW FROM date), EXTRACT(HOUR FROM time);
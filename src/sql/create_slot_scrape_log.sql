@@ -0,0 +1,10 @@
+-- One row per pitch type recording the latest scrape and what it changed
+-- Lets unchanged cache rows stay untouched while freshness is still tracked
+CREATE TABLE IF NOT EXISTS public.slot_scrape_log (
+    pitch_type VARCHAR(20) PRIMARY KEY,
+    last_scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    slot_count INT DEFAULT 0,
+    added_count INT DEFAULT 0,
+    removed_count INT DEFAULT 0,
+    changed_count INT DEFAULT 0
+);
@@ -0,0 +1,9 @@
+-- One row per week recording the auto-booking attempt currently in flight (or its outcome)
+CREATE TABLE IF NOT EXISTS public.week_booking_state (
+    week TEXT PRIMARY KEY,
+    status VARCHAR(20) NOT NULL,  -- in_progress, booked, failed
+    owner TEXT NOT NULL,
+    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP,
+    result JSONB
+);
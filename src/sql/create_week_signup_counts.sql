@@ -0,0 +1,38 @@
+-- Per-week signup counter kept in step with public.signups by trigger
+-- (covers every write path, including ON DELETE CASCADE from players)
+CREATE TABLE IF NOT EXISTS public.week_signup_counts (
+    week TEXT PRIMARY KEY,
+    signup_count INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE OR REPLACE FUNCTION public.maintain_week_signup_counts() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        UPDATE public.week_signup_counts
+        SET signup_count = signup_count - 1, updated_at = CURRENT_TIMESTAMP
+        WHERE week = OLD.week;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO public.week_signup_counts (week, signup_count)
+        VALUES (NEW.week, 1)
+        ON CONFLICT (week) DO UPDATE
+        SET signup_count = week_signup_counts.signup_count + 1, updated_at = CURRENT_TIMESTAMP;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_week_signup_counts ON public.signups;
+CREATE TRIGGER trg_week_signup_counts
+AFTER INSERT OR DELETE OR UPDATE OF week ON public.signups
+FOR EACH ROW EXECUTE FUNCTION public.maintain_week_signup_counts();
+
+-- Backfill from existing signups (no-op once counters are in step)
+INSERT INTO public.week_signup_counts (week, signup_count)
+SELECT week, COUNT(*)
+FROM public.signups
+GROUP BY week
+ON CONFLICT (week) DO UPDATE
+SET signup_count = EXCLUDED.signup_count, updated_at = CURRENT_TIMESTAMP
+WHERE week_signup_counts.signup_count <> EXCLUDED.signup_count;
@@ -0,0 +1,10 @@
+-- Remove everything written by simulated pipeline runs (weeks named SIM-..., players @simulated.invalid)
+DELETE FROM public.signups WHERE week LIKE 'SIM-%';
+DELETE FROM public.week_signup_counts WHERE week LIKE 'SIM-%';
+DELETE FROM public.booking_references WHERE week LIKE 'SIM-%';
+DELETE FROM public.week_booking_state WHERE week LIKE 'SIM-%';
+DELETE FROM public.booking_jobs WHERE week LIKE 'SIM-%';
+DELETE FROM public.notification_dispatches WHERE week LIKE 'SIM-%';
+DELETE FROM public.signups
+WHERE player_id IN (SELECT player_id FROM public.players WHERE email_id LIKE 'sim-player-%@simulated.invalid');
+DELETE FROM public.players WHERE email_id LIKE 'sim-player-%@simulated.invalid';
@@ -0,0 +1,6 @@
+-- Queue a booking job for a week, or return the job already pending for it
+INSERT INTO public.booking_jobs (week, trigger, max_attempts)
+VALUES (%s, %s, %s)
+ON CONFLICT (week) WHERE status IN ('queued', 'running')
+DO UPDATE SET trigger = EXCLUDED.trigger
+RETURNING job_id;
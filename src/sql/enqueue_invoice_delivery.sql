@@ -0,0 +1,14 @@
+-- Add a recipient to a period's fan-out. Existing rows keep their status (so a re-run
+-- never resends), except a recipient skipped for a missing number who now has one.
+INSERT INTO public.invoice_deliveries (period, email_id, name, phone, amount, message, status, max_attempts, error)
+VALUES (%(period)s, %(email_id)s, %(name)s, %(phone)s, %(amount)s, %(message)s, %(status)s, %(max_attempts)s, %(error)s)
+ON CONFLICT (period, email_id) DO UPDATE
+SET 
+    phone = EXCLUDED.phone,
+    amount = EXCLUDED.amount,
+    message = EXCLUDED.message,
+    status = 'queued',
+    error = NULL,
+    run_after = CURRENT_TIMESTAMP
+WHERE invoice_deliveries.status = 'skipped'
+  AND EXCLUDED.status = 'queued';
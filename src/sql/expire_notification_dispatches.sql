@@ -0,0 +1,7 @@
+-- Drop queued messages whose session has started
+UPDATE public.notification_dispatches
+SET 
+    status = 'expired',
+    error = COALESCE(error, 'Session started before the message was sent')
+WHERE status = 'queued'
+  AND expires_at <= CURRENT_TIMESTAMP;
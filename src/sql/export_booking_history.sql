@@ -0,0 +1,17 @@
+-- Full booking history for export, oldest first (read through a server-side cursor)
+SELECT 
+    booking_id,
+    week,
+    session_date,
+    booking_time,
+    pitch_type,
+    booking_amount::FLOAT8 AS booking_amount,
+    cost_per_player::FLOAT8 AS cost_per_player,
+    number_of_players,
+    auto_booked,
+    booking_confirmation,
+    status
+FROM 
+    public.booking_references
+ORDER BY 
+    session_date, booking_time, booking_id;
@@ -0,0 +1,28 @@
+-- One line per player per confirmed pitch booking in [start_date, end_date), billed to the host for guests
+-- (a two-pitch week gives each player one line per booking, told apart by booking_id)
+SELECT 
+    to_char(b.session_date, 'YYYY-MM') AS period,
+    b.session_date,
+    s.week,
+    host.name AS billed_to,
+    host.email_id AS billed_email,
+    p.name AS player,
+    p.brought_by_player_id IS NOT NULL AS is_guest,
+    b.booking_id,
+    b.booking_confirmation,
+    b.pitch_type,
+    b.cost_per_player::FLOAT8 AS cost_per_player
+FROM 
+    public.signups s
+JOIN 
+    public.players p ON p.player_id = s.player_id
+JOIN 
+    public.players host ON host.player_id = COALESCE(p.brought_by_player_id, p.player_id)
+JOIN 
+    public.booking_references b ON b.week = s.week
+WHERE 
+    b.session_date >= %(start_date)s
+    AND b.session_date < %(end_date)s
+    AND COALESCE(b.status, 'confirmed') = 'confirmed'
+ORDER BY 
+    b.session_date, host.name, p.name, b.booking_id;
@@ -0,0 +1,7 @@
+-- A sender died mid-send: the message may already be out, so fail it rather than resend
+UPDATE public.invoice_deliveries
+SET 
+    status = 'failed',
+    error = 'Sender stopped mid-send; not resent to avoid a duplicate'
+WHERE status = 'sending'
+  AND started_at < CURRENT_TIMESTAMP - (%s * INTERVAL '1 minute');
@@ -0,0 +1,7 @@
+-- A dispatcher died mid-send: the message may already be out, so fail it rather than resend
+UPDATE public.notification_dispatches
+SET 
+    status = 'failed',
+    error = 'Dispatcher stopped mid-send; not resent to avoid a duplicate'
+WHERE status = 'sending'
+  AND started_at < CURRENT_TIMESTAMP - (%s * INTERVAL '1 minute');
@@ -0,0 +1,8 @@
+-- Record the outcome of a booking job
+UPDATE public.booking_jobs
+SET 
+    status = %s,
+    result = %s,
+    error = %s,
+    finished_at = CURRENT_TIMESTAMP
+WHERE job_id = %s;
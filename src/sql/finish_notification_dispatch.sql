@@ -0,0 +1,7 @@
+-- Record the outcome of a claimed message ('sent' or 'failed')
+UPDATE public.notification_dispatches
+SET 
+    status = %(status)s,
+    error = %(error)s,
+    sent_at = CASE WHEN %(status)s = 'sent' THEN CURRENT_TIMESTAMP END
+WHERE dispatch_id = %(dispatch_id)s;
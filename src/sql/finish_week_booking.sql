@@ -0,0 +1,8 @@
+-- Record the outcome of a booking attempt (only the attempt that claimed the week may)
+UPDATE public.week_booking_state
+SET 
+    status = %s,
+    result = %s,
+    finished_at = CURRENT_TIMESTAMP
+WHERE week = %s
+  AND owner = %s;
@@ -1,17 +1,20 @@
 -- Fetch available slots from cache
+-- scraped_at reflects the latest scrape of the pitch type, even for rows it didn't rewrite
 SELECT 
-    slot_id,
-    date,
-    time,
-    pitch_type,
-    price,
-    available,
-    scraped_at
+    c.slot_id,
+    c.date,
+    c.time,
+    c.pitch_type,
+    c.price,
+    c.available,
+    GREATEST(c.scraped_at, l.last_scraped_at) AS scraped_at
 FROM 
-    public.available_slots_cache
+    public.available_slots_cache c
+LEFT JOIN 
+    public.slot_scrape_log l ON l.pitch_type = c.pitch_type
 WHERE 
-    available = true
-    AND date >= CURRENT_DATE
-    AND (pitch_type = %s OR %s IS NULL)
+    c.available = true
+    AND c.date >= CURRENT_DATE
+    AND (c.pitch_type = %s OR %s IS NULL)
 ORDER BY 
-    date, time;
+    c.date, c.time;
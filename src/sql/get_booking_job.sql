@@ -0,0 +1,16 @@
+SELECT 
+    job_id,
+    week,
+    status,
+    trigger,
+    attempts,
+    max_attempts,
+    result,
+    error,
+    created_at,
+    started_at,
+    finished_at
+FROM 
+    public.booking_jobs
+WHERE 
+    job_id = %s;
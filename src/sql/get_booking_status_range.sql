@@ -0,0 +1,20 @@
+-- Signup count and booking state for a list of weeks in a single round trip
+WITH weeks AS (
+    SELECT week, ordinality
+    FROM unnest(%(weeks)s::text[]) WITH ORDINALITY AS w(week, ordinality)
+),
+bookings AS (
+    SELECT week, COUNT(*) AS booking_count
+    FROM public.booking_references
+    WHERE week = ANY(%(weeks)s::text[])
+      AND status != 'cancelled'
+    GROUP BY week
+)
+SELECT 
+    weeks.week,
+    COALESCE(counts.signup_count, 0) AS signup_count,
+    COALESCE(bookings.booking_count, 0) > 0 AS is_booked
+FROM weeks
+LEFT JOIN public.week_signup_counts counts ON counts.week = weeks.week
+LEFT JOIN bookings ON bookings.week = weeks.week
+ORDER BY weeks.ordinality;
@@ -1,4 +1,4 @@
--- Query to fetch all bookings for a specific month
+-- All bookings with a session in a date range (same columns as get_bookings_for_month)
 SELECT 
     booking_id,
     week,
@@ -14,7 +14,7 @@ SELECT
 FROM 
     public.booking_references
 WHERE 
-    EXTRACT(MONTH FROM session_date) = %s
-    AND EXTRACT(YEAR FROM session_date) = %s
+    session_date >= %(start_date)s
+    AND session_date < %(end_date)s
 ORDER BY 
     session_date, booking_time;
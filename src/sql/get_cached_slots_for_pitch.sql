@@ -0,0 +1,11 @@
+-- Current cache state for one pitch type (including unavailable rows) for diffing
+SELECT 
+    date,
+    time,
+    price,
+    available
+FROM 
+    public.available_slots_cache
+WHERE 
+    pitch_type = %s
+    AND date >= CURRENT_DATE;
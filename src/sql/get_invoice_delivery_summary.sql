@@ -0,0 +1,5 @@
+-- Fan-out progress for a period: recipients and last activity per status
+SELECT status, COUNT(*), MAX(COALESCE(sent_at, started_at, created_at))
+FROM public.invoice_deliveries
+WHERE period = %s
+GROUP BY status;
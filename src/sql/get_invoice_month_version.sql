@@ -0,0 +1,5 @@
+-- Current source version of a month's invoice (0 if nothing has changed since tracking began)
+SELECT COALESCE(
+    (SELECT version FROM public.invoice_month_versions WHERE period = %s),
+    0
+);
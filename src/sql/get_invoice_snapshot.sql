@@ -0,0 +1,14 @@
+-- A stored invoice snapshot with the month's current source version
+SELECT 
+    s.content_hash,
+    s.report,
+    s.report_text,
+    s.report_csv,
+    s.source_version,
+    s.closed,
+    s.created_at,
+    COALESCE(v.version, 0) AS current_version
+FROM public.invoice_snapshots s
+LEFT JOIN public.invoice_month_versions v ON v.period = s.period
+WHERE s.period = %s
+  AND s.format = %s;
@@ -0,0 +1,5 @@
+-- Recent and upcoming scheduled messages, newest session first
+SELECT kind, week, session_date, booking_time, status, attempts, due_at, sent_at, error
+FROM public.notification_dispatches
+ORDER BY session_date DESC NULLS LAST, due_at DESC
+LIMIT %s;
@@ -0,0 +1,43 @@
+-- Player costs per month over a date range in one pass (guests expensed to their host)
+-- A week with several pitch bookings (e.g. two thirds) is one session: its per-pitch
+-- costs are summed into one row per player and week before guests are collected
+WITH player_sessions AS (
+    SELECT 
+        p.player_id,
+        p.name,
+        p.brought_by_player_id,
+        s.week,
+        SUM(b.cost_per_player) AS cost_per_player,
+        to_char(b.session_date, 'YYYY-MM') AS period
+    FROM 
+        public.players p
+    JOIN 
+        public.signups s ON p.player_id = s.player_id
+    JOIN 
+        public.booking_references b ON s.week = b.week
+    WHERE 
+        b.session_date >= %(start_date)s
+        AND b.session_date < %(end_date)s
+        AND COALESCE(b.status, 'confirmed') = 'confirmed'
+    GROUP BY 
+        p.player_id, p.name, p.brought_by_player_id, s.week, to_char(b.session_date, 'YYYY-MM')
+)
+SELECT 
+    ps.period,
+    host.name,
+    host.email_id,
+    COUNT(DISTINCT ps.week) AS sessions_attended,
+    SUM(ps.cost_per_player) AS total_cost,
+    ARRAY_AGG(DISTINCT ps.week ORDER BY ps.week) AS weeks_attended,
+    COALESCE(
+        ARRAY_AGG(ps.name) FILTER (WHERE ps.brought_by_player_id IS NOT NULL),
+        ARRAY[]::text[]
+    ) AS guests
+FROM 
+    player_sessions ps
+JOIN 
+    public.players host ON host.player_id = COALESCE(ps.brought_by_player_id, ps.player_id)
+GROUP BY 
+    ps.period, host.player_id, host.name, host.email_id
+ORDER BY 
+    ps.period, host.name;
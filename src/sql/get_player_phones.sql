@@ -0,0 +1,4 @@
+-- Players with a WhatsApp number on file
+SELECT email_id, phone
+FROM public.players
+WHERE phone IS NOT NULL AND phone != '';
@@ -0,0 +1 @@
+SELECT scrape_requested_at FROM public.scraper_control WHERE control_id = 1
@@ -0,0 +1,17 @@
+-- Scraper workers seen recently, leader first
+-- Heartbeat age is computed by the database so app and worker clocks/timezones don't matter
+SELECT 
+    worker_id,
+    hostname,
+    pid,
+    role,
+    started_at,
+    last_heartbeat,
+    details,
+    EXTRACT(EPOCH FROM (LOCALTIMESTAMP - last_heartbeat))::FLOAT8 AS heartbeat_age_seconds
+FROM 
+    public.scraper_status
+WHERE 
+    last_heartbeat > LOCALTIMESTAMP - INTERVAL '1 day'
+ORDER BY 
+    (role = 'leader') DESC, last_heartbeat DESC;
@@ -0,0 +1,15 @@
+-- Recent slot events, newest first (optionally only one slot time)
+SELECT 
+    event_type,
+    pitch_type,
+    slot_date,
+    slot_time,
+    price,
+    recorded_at
+FROM 
+    public.slot_events
+WHERE 
+    %(slot_time)s::TIME IS NULL OR slot_time = %(slot_time)s::TIME
+ORDER BY 
+    recorded_at DESC, event_id DESC
+LIMIT %(limit)s;
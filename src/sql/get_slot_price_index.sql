@@ -0,0 +1,2 @@
+SELECT pitch_type, weekday, hour, sample_count, avg_price, min_price, max_price, last_price, updated_at
+FROM public.slot_price_index;
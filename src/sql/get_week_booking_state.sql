@@ -0,0 +1,3 @@
+SELECT week, status, owner, started_at, finished_at, result
+FROM public.week_booking_state
+WHERE week = %s;
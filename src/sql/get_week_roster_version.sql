@@ -0,0 +1,4 @@
+-- Cheap version of a week's roster: the trigger-maintained counter changes on every signup write
+SELECT signup_count, updated_at
+FROM public.week_signup_counts
+WHERE week = %s;
@@ -0,0 +1 @@
+SELECT signup_count FROM public.week_signup_counts WHERE week = %s
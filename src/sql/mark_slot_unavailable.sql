@@ -0,0 +1,9 @@
+-- Mark a cached slot as gone (no longer listed on Merky FC HQ)
+UPDATE public.available_slots_cache
+SET 
+    available = false,
+    scraped_at = CURRENT_TIMESTAMP
+WHERE 
+    pitch_type = %s
+    AND date = %s
+    AND time = %s;
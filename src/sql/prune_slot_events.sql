@@ -0,0 +1,3 @@
+-- Drop slot events older than a week
+DELETE FROM public.slot_events
+WHERE recorded_at < CURRENT_TIMESTAMP - INTERVAL '7 days';
@@ -0,0 +1,16 @@
+-- Upsert a scraper worker heartbeat
+INSERT INTO public.scraper_status (
+    worker_id,
+    hostname,
+    pid,
+    role,
+    last_heartbeat,
+    details
+) VALUES (
+    %s, %s, %s, %s, CURRENT_TIMESTAMP, %s
+)
+ON CONFLICT (worker_id) 
+DO UPDATE SET
+    role = EXCLUDED.role,
+    last_heartbeat = CURRENT_TIMESTAMP,
+    details = EXCLUDED.details;
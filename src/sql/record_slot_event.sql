@@ -0,0 +1,3 @@
+-- Record one slot added/removed event
+INSERT INTO public.slot_events (event_type, pitch_type, slot_date, slot_time, price)
+VALUES (%s, %s, %s, %s, %s);
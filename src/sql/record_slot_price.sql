@@ -0,0 +1,12 @@
+-- Fold one price observation into the (pitch type, weekday, hour) running stats
+INSERT INTO public.slot_price_index (pitch_type, weekday, hour, sample_count, avg_price, min_price, max_price, last_price)
+VALUES (%(pitch_type)s, %(weekday)s, %(hour)s, 1, %(price)s, %(price)s, %(price)s, %(price)s)
+ON CONFLICT (pitch_type, weekday, hour) DO UPDATE
+SET 
+    avg_price = (slot_price_index.avg_price * slot_price_index.sample_count + EXCLUDED.last_price)
+                / (slot_price_index.sample_count + 1),
+    sample_count = slot_price_index.sample_count + 1,
+    min_price = LEAST(slot_price_index.min_price, EXCLUDED.last_price),
+    max_price = GREATEST(slot_price_index.max_price, EXCLUDED.last_price),
+    last_price = EXCLUDED.last_price,
+    updated_at = CURRENT_TIMESTAMP;
@@ -0,0 +1,18 @@
+-- Record a completed scrape for a pitch type
+INSERT INTO public.slot_scrape_log (
+    pitch_type,
+    last_scraped_at,
+    slot_count,
+    added_count,
+    removed_count,
+    changed_count
+) VALUES (
+    %s, CURRENT_TIMESTAMP, %s, %s, %s, %s
+)
+ON CONFLICT (pitch_type) 
+DO UPDATE SET
+    last_scraped_at = CURRENT_TIMESTAMP,
+    slot_count = EXCLUDED.slot_count,
+    added_count = EXCLUDED.added_count,
+    removed_count = EXCLUDED.removed_count,
+    changed_count = EXCLUDED.changed_count;
@@ -0,0 +1,5 @@
+-- Reset a week's counter to the true signup count
+INSERT INTO public.week_signup_counts (week, signup_count)
+SELECT %(week)s, COUNT(*) FROM public.signups WHERE week = %(week)s
+ON CONFLICT (week) DO UPDATE
+SET signup_count = EXCLUDED.signup_count, updated_at = CURRENT_TIMESTAMP;
@@ -0,0 +1,5 @@
+-- Ask the scraper leader to scrape now
+INSERT INTO public.scraper_control (control_id, scrape_requested_at)
+VALUES (1, CURRENT_TIMESTAMP)
+ON CONFLICT (control_id) 
+DO UPDATE SET scrape_requested_at = CURRENT_TIMESTAMP;
@@ -0,0 +1,8 @@
+-- Give a period's failed messages a fresh set of attempts
+UPDATE public.invoice_deliveries
+SET 
+    status = 'queued',
+    attempts = 0,
+    run_after = CURRENT_TIMESTAMP
+WHERE period = %s
+  AND status = 'failed';
@@ -0,0 +1,7 @@
+-- Re-queue jobs left 'running' by a worker that died mid-booking
+UPDATE public.booking_jobs
+SET 
+    status = 'queued',
+    error = 'Worker stopped before finishing; re-queued'
+WHERE status = 'running'
+  AND started_at < CURRENT_TIMESTAMP - (%s * INTERVAL '1 minute');
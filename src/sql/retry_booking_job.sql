@@ -0,0 +1,9 @@
+-- Put a booking job back on the queue after a delay
+-- (refund_attempt = 1 when it only waited on another attempt, so the wait doesn't use up retries)
+UPDATE public.booking_jobs
+SET 
+    status = 'queued',
+    error = %s,
+    attempts = attempts - %s,
+    run_after = CURRENT_TIMESTAMP + (%s * INTERVAL '1 second')
+WHERE job_id = %s;
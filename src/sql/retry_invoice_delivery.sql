@@ -0,0 +1,7 @@
+-- Put a message whose send failed back on the queue after a delay
+UPDATE public.invoice_deliveries
+SET 
+    status = 'queued',
+    error = %s,
+    run_after = CURRENT_TIMESTAMP + (%s * INTERVAL '1 second')
+WHERE delivery_id = %s;
@@ -0,0 +1,7 @@
+-- Put a message whose send failed back on the queue after a delay
+UPDATE public.notification_dispatches
+SET 
+    status = 'queued',
+    error = %s,
+    due_at = CURRENT_TIMESTAMP + (%s * INTERVAL '1 second')
+WHERE dispatch_id = %s;
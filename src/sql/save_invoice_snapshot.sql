@@ -0,0 +1,17 @@
+-- Store a snapshot; a closed month's snapshot is never replaced
+INSERT INTO public.invoice_snapshots (
+    period, format, content_hash, report, report_text, report_csv, source_version, closed
+) VALUES (
+    %(period)s, %(format)s, %(content_hash)s, %(report)s, %(report_text)s, %(report_csv)s,
+    %(source_version)s, %(closed)s
+)
+ON CONFLICT (period, format) DO UPDATE
+SET 
+    content_hash = EXCLUDED.content_hash,
+    report = EXCLUDED.report,
+    report_text = EXCLUDED.report_text,
+    report_csv = EXCLUDED.report_csv,
+    source_version = EXCLUDED.source_version,
+    closed = EXCLUDED.closed,
+    created_at = CURRENT_TIMESTAMP
+WHERE NOT invoice_snapshots.closed;
@@ -0,0 +1,26 @@
+-- Queue a reminder and a weekly list for every upcoming session in one pass over booking_references.
+-- Two pitches booked for the same kick-off are one session; re-running is a no-op for known sessions.
+WITH upcoming AS (
+    SELECT DISTINCT ON (session_date, booking_time)
+        week,
+        session_date,
+        booking_time,
+        pitch_type,
+        session_date + COALESCE(booking_time, TIME '19:00') AS kick_off
+    FROM public.booking_references
+    WHERE session_date BETWEEN CURRENT_DATE AND CURRENT_DATE + %(lookahead_days)s
+      AND COALESCE(status, 'confirmed') != 'cancelled'
+      AND week NOT LIKE 'SIM-%%'  -- Simulated pipeline runs never message the group
+    ORDER BY session_date, booking_time, booking_id
+)
+INSERT INTO public.notification_dispatches (
+    kind, dispatch_key, week, session_date, booking_time, pitch_type, max_attempts, due_at, expires_at
+)
+SELECT 'reminder', session_date || ' ' || COALESCE(booking_time::TEXT, ''), week, session_date, booking_time, pitch_type,
+       %(max_attempts)s, kick_off - (%(reminder_hours)s * INTERVAL '1 hour'), kick_off
+FROM upcoming
+UNION ALL
+SELECT 'weekly_list', session_date || ' ' || COALESCE(booking_time::TEXT, ''), week, session_date, booking_time, pitch_type,
+       %(max_attempts)s, kick_off - (%(weekly_list_hours)s * INTERVAL '1 hour'), kick_off
+FROM upcoming
+ON CONFLICT (kind, dispatch_key) DO NOTHING;
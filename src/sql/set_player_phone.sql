@@ -0,0 +1,4 @@
+-- Set (or clear, with NULL) a player's WhatsApp number
+UPDATE public.players
+SET phone = %s
+WHERE email_id = %s;
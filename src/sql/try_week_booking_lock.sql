@@ -0,0 +1,2 @@
+-- Transaction-level advisory lock on (lock class, week); released on commit/rollback
+SELECT pg_try_advisory_xact_lock(%s, hashtext(%s));
@@ -0,0 +1,183 @@
+"""
+Phase-level tracing for booking bot operations
+Records how long each step of a scrape/booking takes to a local JSONL trace store
+"""
+
+import json
+import os
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+import pandas as pd
+from config import get_tracing_config
+
+
+TRACE_FILE = 'bot_traces.jsonl'
+SCREENSHOT_DIR = 'screenshots'
+MAX_TRACE_FILE_BYTES = 5 * 1024 * 1024  # Rotate the store beyond ~5MB
+
+
+class BotTrace:
+    """A single bot operation (scrape or booking) broken down into timed phases"""
+
+    def __init__(self, operation, context=None, capture_screenshot=None):
+        """
+        Start a new trace
+
+        Args:
+            operation (str): 'scrape' or 'book'
+            context (dict): Extra fields stored with the trace (pitch type, date, ...)
+            capture_screenshot (callable): Takes a file path, saves a browser screenshot
+        """
+        tracing_config = get_tracing_config()
+        self.enabled = tracing_config['enabled']
+        self.trace_dir = tracing_config['trace_dir']
+        self.screenshots_on_failure = tracing_config['screenshots_on_failure']
+        self.capture_screenshot = capture_screenshot
+
+        self.trace_id = uuid.uuid4().hex[:12]
+        self.operation = operation
+        self.context = context or {}
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        self.spans = []
+        self.status = 'running'
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time a phase of the operation
+
+        The yielded span dict can be updated by the caller: bump 'retries' on each
+        retry, or set 'status' to 'failed' when the phase fails without raising.
+
+        Args:
+            name (str): Phase name, e.g. 'page_load' or 'confirm'
+        """
+        span = {'phase': name, 'status': 'ok', 'retries': 0}
+        started = time.perf_counter()
+        try:
+            yield span
+        except Exception as e:
+            span['status'] = 'error'
+            span['error'] = str(e)[:500]
+            raise
+        finally:
+            span['duration_seconds'] = round(time.perf_counter() - started, 3)
+            if span['status'] != 'ok':
+                span['screenshot'] = self._screenshot(name)
+            self.spans.append(span)
+
+    def finish(self, status):
+        """
+        Close the trace and append it to the trace store
+
+        Args:
+            status (str): Overall outcome, e.g. 'ok' or 'failed'
+
+        Returns:
+            dict: The stored trace record
+        """
+        self.status = status
+        record = {
+            'trace_id': self.trace_id,
+            'operation': self.operation,
+            'status': status,
+            'started_at': self.started_at.isoformat(),
+            'duration_seconds': round(time.perf_counter() - self._started, 3),
+            'context': self.context,
+            'spans': self.spans
+        }
+
+        if self.enabled:
+            try:
+                os.makedirs(self.trace_dir, exist_ok=True)
+                trace_path = os.path.join(self.trace_dir, TRACE_FILE)
+                if os.path.exists(trace_path) and os.path.getsize(trace_path) > MAX_TRACE_FILE_BYTES:
+                    os.replace(trace_path, trace_path + '.1')
+                with open(trace_path, 'a') as file:
+                    file.write(json.dumps(record, default=str) + '\n')
+            except OSError:
+                pass  # Tracing must never break a booking
+
+        return record
+
+    def _screenshot(self, phase_name):
+        """Save a screenshot for a failed phase, returning its path or None"""
+        if not (self.enabled and self.screenshots_on_failure and self.capture_screenshot):
+            return None
+
+        try:
+            screenshot_dir = os.path.join(self.trace_dir, SCREENSHOT_DIR)
+            os.makedirs(screenshot_dir, exist_ok=True)
+            path = os.path.join(screenshot_dir, f"{self.trace_id}_{phase_name}.png")
+            if self.capture_screenshot(path):
+                return path
+        except Exception:
+            pass
+        return None
+
+
+def load_traces(limit=200, operation=None):
+    """
+    Load the most recent traces from the store
+
+    Args:
+        limit (int): Maximum number of traces to return
+        operation (str): Only return traces for this operation
+
+    Returns:
+        list: Trace dicts, newest last
+    """
+    trace_path = os.path.join(get_tracing_config()['trace_dir'], TRACE_FILE)
+    if not os.path.exists(trace_path):
+        return []
+
+    traces = deque(maxlen=limit)
+    with open(trace_path, 'r') as file:
+        for line in file:
+            try:
+                trace = json.loads(line)
+            except ValueError:
+                continue
+            if operation is None or trace.get('operation') == operation:
+                traces.append(trace)
+    return list(traces)
+
+
+def summarize_phases(traces):
+    """
+    Aggregate phase timings across traces
+
+    Args:
+        traces (list): Traces from load_traces
+
+    Returns:
+        pd.DataFrame: One row per (operation, phase) with counts and timing stats
+    """
+    rows = [
+        {
+            'operation': trace['operation'],
+            'phase': span['phase'],
+            'duration_seconds': span.get('duration_seconds', 0),
+            'retries': span.get('retries', 0),
+            'failed': span.get('status') != 'ok'
+        }
+        for trace in traces
+        for span in trace.get('spans', [])
+    ]
+    if not rows:
+        return pd.DataFrame()
+
+    spans_df = pd.DataFrame(rows)
+    summary = spans_df.groupby(['operation', 'phase'], sort=False).agg(
+        runs=('duration_seconds', 'size'),
+        failures=('failed', 'sum'),
+        retries=('retries', 'sum'),
+        avg_seconds=('duration_seconds', 'mean'),
+        p95_seconds=('duration_seconds', lambda d: d.quantile(0.95)),
+        max_seconds=('duration_seconds', 'max')
+    ).reset_index()
+    return summary.round(3)
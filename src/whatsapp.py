@@ -3,66 +3,56 @@ Enhanced WhatsApp integration for automated notifications
 Supports signup updates, booking confirmations, and monthly invoices
 """
 
-import pandas as pd
 import streamlit as st
+from collections import OrderedDict
 from datetime import datetime
 from config import get_whatsapp_config
-
-# Lazy import pywhatkit to avoid GUI/display issues at module load time
-_pywhatkit = None
-
-def _get_pywhatkit():
-    """Lazy import pywhatkit only when needed"""
-    global _pywhatkit
-    if _pywhatkit is None:
-        try:
-            import pywhatkit as pwk
-            _pywhatkit = pwk
-        except Exception as e:
-            st.warning(f"WhatsApp features disabled: {str(e)}")
-            _pywhatkit = False  # Mark as unavailable
-    return _pywhatkit if _pywhatkit is not False else None
-
+from notification_transports import PyWhatKitTransport, CaptureTransport, benchmark_transport, get_transport
 
 class WhatsAppNotifier:
     """Handle WhatsApp notifications for the football app"""
     
-    def __init__(self, db):
+    def __init__(self, db, transport=None):
         """
         Initialize WhatsApp notifier
         
         Args:
             db: DatabaseHandler instance
+            transport (NotificationTransport): Delivery transport (defaults to whatsapp.transport)
         """
         self.db = db
         
         # Get group ID from secrets or environment
         whatsapp_config = get_whatsapp_config()
         self.group_id = whatsapp_config['group_id']
+        self.transport = transport or get_transport()
+        
+        # Rendered message parts keyed by (kind, week, roster version)
+        self._render_cache = OrderedDict()
+        self._render_cache_size = 64
     
-    def send_message(self, message):
+    def send_message(self, message, recipient=None):
         """
         Send a message to WhatsApp group
         
         Args:
             message (str): Message to send
+            recipient (str): Group id or '+' phone number (defaults to the group)
             
         Returns:
             bool: True if successful
         """
-        pwk = _get_pywhatkit()
-        if pwk is None:
+        if not self.transport.is_available():
             st.warning("WhatsApp notifications are currently disabled")
             return False
             
         try:
-            pwk.sendwhatmsg_to_group_instantly(self.group_id, message)
-            return True
+            return self.transport.send(recipient or self.group_id, message)
         except Exception as e:
             st.error(f"Failed to send WhatsApp message: {e}")
             return False
     
-    def send_signup_update(self, name, action, week, current_count, threshold_half, threshold_full):
+    def send_signup_update(self, name, action, week, current_count, threshold_half, threshold_full, roster=None):
         """
         Send notification when player signs up or removes themselves
         
@@ -70,11 +60,38 @@ class WhatsAppNotifier:
             name (str): Player name
             action (str): "signed up" or "removed"
             week (str): Week identifier
-            current_count (int): Current number of players
+            current_count (int): Current number of players (unused - the roster is counted)
+            threshold_half (int): Half pitch threshold (14)
+            threshold_full (int): Two thirds threshold (18)
+            roster (list): Pre-fetched fetch_signups rows for the week (fetched if None)
+        """
+        message = self.build_signup_update([(name, action)], week, threshold_half, threshold_full, roster=roster)
+        return self.send_message(message)
+    
+    def build_signup_update(self, changes, week, threshold_half, threshold_full, roster=None):
+        """
+        Render one roster message covering one or more signup changes
+        
+        Args:
+            changes (list): (name, action) tuples in the order they happened
+            week (str): Week identifier
             threshold_half (int): Half pitch threshold (14)
             threshold_full (int): Two thirds threshold (18)
+            roster (list): Pre-fetched fetch_signups rows for the week (fetched if None)
+            
+        Returns:
+            str: Message text
         """
-        message = f"🔔 {name} just {action}!\n\n"
+        # Group names by action, keeping first-seen order
+        names_by_action = {}
+        for name, action in changes:
+            names_by_action.setdefault(action, []).append(name)
+        message = "".join(f"🔔 {', '.join(names)} just {action}!\n" for action, names in names_by_action.items())
+        message += "\n"
+        
+        # Current roster, rendered once per roster version (the count is taken from it, so it matches the list)
+        current_list, current_count = self._cached_render(
+            ('current_list', week), week, roster, self._render_current_list)
         
         # Add threshold status
         if current_count >= threshold_full:
@@ -82,25 +99,25 @@ class WhatsAppNotifier:
             message += "🤖 Auto-booking 2 third pitches...\n\n"
         elif current_count >= threshold_half:
             message += f"✅ 1 Third Pitch ready! ({threshold_half}+ players)\n"
-            if action == "signed up":
+            if "signed up" in names_by_action:
                 message += f"💡 {threshold_full - current_count} more for 2 third pitches\n\n"
         else:
             needed = threshold_half - current_count
             message += f"⏳ {needed} more needed for 1 third pitch\n\n"
         
-        # Get and display full player list
-        signups = self.db.fetch_signups(week)
-        if signups:
-            message += f"📋 CURRENT LIST ({len(signups)} players):\n"
-            message += "=" * 30 + "\n"
-            for idx, signup in enumerate(signups, 1):
-                player_name = signup[0]  # First column is name
-                message += f"{idx}. {player_name}\n"
-            message += "=" * 30 + "\n"
-        
+        # Display full player list
+        message += current_list
         message += f"\nWeek: {week}"
         
-        return self.send_message(message)
+        return message
+    
+    def _render_current_list(self, rows):
+        """Numbered CURRENT LIST block for a signup update"""
+        if not rows:
+            return ""
+        divider = "=" * 30 + "\n"
+        lines = "".join(f"{idx}. {row[0]}\n" for idx, row in enumerate(rows, 1))
+        return f"📋 CURRENT LIST ({len(rows)} players):\n" + divider + lines + divider
     
     def send_booking_confirmation(self, booking_details):
         """
@@ -109,6 +126,18 @@ class WhatsAppNotifier:
         Args:
             booking_details (dict): Booking information
         """
+        return self.send_message(self.build_booking_confirmation(booking_details))
+    
+    def build_booking_confirmation(self, booking_details):
+        """
+        Render the booking confirmation message
+        
+        Args:
+            booking_details (dict): Booking information
+            
+        Returns:
+            str: Message text
+        """
         pitch_type = booking_details.get('pitch_type')
         
         if pitch_type == 'two_thirds':
@@ -131,7 +160,7 @@ class WhatsAppNotifier:
         
         message += "See you there! ⚽"
         
-        return self.send_message(message)
+        return message
     
     def send_monthly_invoice(self, month, year):
         """
@@ -142,7 +171,7 @@ class WhatsAppNotifier:
             year (int): Year
         """
         # Get player costs for the month
-        player_costs = self.db.get_monthly_player_costs(month, year)
+        player_costs = self.db.get_player_costs_for_month(month, year)
         
         if not player_costs:
             st.info("No bookings found for this month")
@@ -191,6 +220,21 @@ class WhatsAppNotifier:
             time (str): Game time
             pitch_type (str): Type of pitch
         """
+        return self.send_message(self.build_reminder(week, date, time, pitch_type))
+    
+    def build_reminder(self, week, date, time, pitch_type):
+        """
+        Render the game reminder message
+        
+        Args:
+            week (str): Week identifier
+            date (str): Game date
+            time (str): Game time
+            pitch_type (str): Type of pitch
+            
+        Returns:
+            str: Message text
+        """
         message = "⏰ GAME REMINDER ⏰\n\n"
         message += f"📅 Tomorrow: {date}\n"
         message += f"⏰ Time: {time}\n"
@@ -198,30 +242,83 @@ class WhatsAppNotifier:
         message += f"📍 Merky FC HQ\n\n"
         message += "Don't forget! See you there! ⚽"
         
-        return self.send_message(message)
+        return message
     
-    def send_weekly_list(self, week):
+    def send_weekly_list(self, week, roster=None):
         """
         Send current weekly signup list
         
         Args:
             week (str): Week identifier
+            roster (list): Pre-fetched fetch_signups rows for the week (fetched if None)
+        """
+        return self.send_message(self.build_weekly_list(week, roster=roster))
+    
+    def build_weekly_list(self, week, roster=None):
         """
-        signups = self.db.fetch_signups(week)
-        signups_df = pd.DataFrame(signups, columns=["name", "email"]).dropna()
+        Render the weekly signup list message
         
-        if signups_df.empty:
-            message = f"📋 Week {week}\n\nNo signups yet. Be the first!"
-        else:
-            message = f"📋 Weekly Signup List - {week}\n"
-            message += "=" * 40 + "\n\n"
+        Args:
+            week (str): Week identifier
+            roster (list): Pre-fetched fetch_signups rows for the week (fetched if None)
             
-            for idx, row in signups_df.iterrows():
-                message += f"{idx + 1}. {row['name']}\n"
+        Returns:
+            str: Message text
+        """
+        # Rows with a missing name or email are left off the list
+        text, _ = self._cached_render(('weekly_list', week), week, roster,
+                                      lambda rows: self._render_weekly_list(week, rows),
+                                      row_filter=lambda row: None not in row)
+        return text
+    
+    def _render_weekly_list(self, week, rows):
+        """Weekly list message body"""
+        if not rows:
+            return f"📋 Week {week}\n\nNo signups yet. Be the first!"
+        
+        message = f"📋 Weekly Signup List - {week}\n"
+        message += "=" * 40 + "\n\n"
+        message += "".join(f"{idx}. {row[0]}\n" for idx, row in enumerate(rows, 1))
+        message += f"\n👥 Total: {len(rows)} players"
+        return message
+    
+    def _cached_render(self, key, week, roster, render, row_filter=None):
+        """
+        Render a roster-dependent part once per roster version
+        
+        A roster snapshot passed in is versioned by its hash. Otherwise the version
+        is the week's signup counter (one primary-key read), and the roster itself
+        is only fetched when that version hasn't been rendered yet.
+        
+        Args:
+            key (tuple): (kind, week)
+            week (str): Week identifier
+            roster (list): Pre-fetched fetch_signups rows, or None
+            render (callable): Takes rows, returns the rendered text
+            row_filter (callable): Keeps a row when it returns True
             
-            message += f"\n👥 Total: {len(signups_df)} players"
+        Returns:
+            tuple: (rendered text, number of rows rendered)
+        """
+        rows = None
+        if roster is not None:
+            rows = [tuple(row) for row in roster if row_filter is None or row_filter(row)]
+            cache_key = key + ('snapshot', hash(tuple(rows)))
+        else:
+            cache_key = key + ('version', self.db.get_roster_version(week))
         
-        return self.send_message(message)
+        cached = self._render_cache.get(cache_key)
+        if cached is not None:
+            self._render_cache.move_to_end(cache_key)
+            return cached
+        
+        if rows is None:
+            rows = [tuple(row) for row in self.db.fetch_signups(week) if row_filter is None or row_filter(row)]
+        cached = (render(rows), len(rows))
+        self._render_cache[cache_key] = cached
+        if len(self._render_cache) > self._render_cache_size:
+            self._render_cache.popitem(last=False)
+        return cached
     
     def _format_pitch_type(self, pitch_type):
         """Format pitch type for display"""
@@ -252,9 +349,47 @@ def format_signup_message(signups_df):
 def send_whatsapp_message(message, group_id='CHAjDSd8Tm14QZ4rGrqQxc'):
     """Legacy function - kept for compatibility"""
     try:
-        pwk.sendwhatmsg_to_group_instantly(group_id, message)
+        PyWhatKitTransport().send(group_id, message)
         print("Message scheduled successfully!")
         return True
     except Exception as e:
         print(f"Failed to send message: {e}")
         return False
+
+
+def benchmark_notifications(n_messages=200, transport=None):
+    """
+    Render and deliver confirmations, reminders and roster messages, offline by default
+    
+    Roster messages render from a fixed snapshot, so after the first one the
+    roster parts come from the render cache.
+    
+    Args:
+        n_messages (int): Messages of each kind
+        transport (NotificationTransport): Defaults to an in-memory CaptureTransport
+        
+    Returns:
+        dict: Render time plus benchmark_transport delivery stats
+    """
+    notifier = WhatsAppNotifier(db=None, transport=transport or CaptureTransport())
+    
+    roster = [(f"Player {i}", f"player{i}@example.com") for i in range(18)]
+    
+    started = datetime.now()
+    messages = []
+    for i in range(n_messages):
+        booking_details = {
+            'date': '2026-02-03', 'time': '19:00', 'pitch_type': 'third_pitch',
+            'player_count': 14, 'cost_per_player': 3.93, 'total_cost': 55.0,
+            'confirmation_number': f"BENCH-{i}"
+        }
+        messages.append(notifier.build_booking_confirmation(booking_details))
+        messages.append(notifier.build_reminder('2026-W06', '2026-02-03', '19:00', 'third_pitch'))
+        messages.append(notifier.build_signup_update(
+            [(f"Player {i % 18}", 'signed up')], '2026-W06', 14, 18, roster=roster))
+        messages.append(notifier.build_weekly_list('2026-W06', roster=roster))
+    render_seconds = (datetime.now() - started).total_seconds()
+    
+    result = benchmark_transport(notifier.transport, messages, recipient=notifier.group_id)
+    result['render_seconds'] = round(render_seconds, 4)
+    return result
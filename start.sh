@@ -1,4 +1,7 @@
 #!/bin/bash
+# Usage: ./start.sh [web|scraper|booking|notifications]  (defaults to $APP_ROLE, then web)
+ROLE="${1:-${APP_ROLE:-web}}"
+
 # Create Xauthority file to prevent X auth errors
 touch ~/.Xauthority
 xauth generate :99 . trusted 2>/dev/null || true
@@ -13,6 +16,24 @@ sleep 3
 export DISPLAY=:99
 xdpyinfo > /dev/null 2>&1 || echo "Warning: Xvfb may not be running properly"
 
+# Pin chromedriver if the image build couldn't (no-op when already cached)
+python src/booking_bot.py || echo "Warning: chromedriver could not be resolved"
+
+# Standalone scraper worker - elects a leader across replicas via a Postgres advisory lock
+if [ "$ROLE" = "scraper" ]; then
+    PYTHONPATH=src exec python -m scraper_service
+fi
+
+# Booking job worker - runs queued auto-bookings off the web request
+if [ "$ROLE" = "booking" ]; then
+    PYTHONPATH=src exec python -m booking_worker
+fi
+
+# Scheduled notification worker - game reminders and weekly lists
+if [ "$ROLE" = "notifications" ]; then
+    PYTHONPATH=src exec python -m notification_worker
+fi
+
 # Start Streamlit app
 exec python -m streamlit run src/app.py \
     --server.port=8501 \